@@ -0,0 +1,332 @@
+"""
+Генератор синтетических отчётов системы «Галактика» для измерения производительности.
+
+Генерируется пара отчётов: второй получен из первого изменением части записей
+(версии, размера), удалением и добавлением записей. Отчёты записываются
+в кодировке c.ENCODING_FILE, в том же виде, что и настоящие отчёты (см. svod_my.txt).
+
+Запуск:
+    python -m benchmarks.report_generator [параметры] ОТЧЁТ1 ОТЧЁТ2
+"""
+
+import argparse
+import random
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+from src.compare import PREFIX_COMPONENT, PREFIX_LOAD, VS
+from src.constants import Constant as c
+
+SEPARATOR = "_" * 110
+
+COMPONENT_TYPES = ("DLL", "RES", "RTL", "EXE")
+LOAD_EXTENSIONS = ("DLL", "RES")
+
+EXE_FOLDER = "C:\\GalaktikaCorp\\GAL91\\EXE\\"
+
+# Строки раздела информации о системе рабочей станции
+SYSTEM_LINES = (
+    "Информация по клиентской части системы",
+    "Система: ",
+    "   рабочая станция               : BENCHMARK-PC",
+    "   процессор                     : Intel(R) Core(TM) i7",
+    "   оперативная память (всего)    : 16 461 880 Кб",
+    "   операционная система          : Windows 10 Pro 10.0.19045",
+    "Пути на каталоги:",
+    f"   путь на EXE папку :   {EXE_FOLDER}",
+    "Информация по версиям библиотек и ресурсов:",
+    "   версия инструментария (Atlantis) : 5.5.41.0",
+    "   версия библиотеки компилятора ecc: 2.10(c).12-Мая-96",
+)
+
+
+class ReportKind(Enum):
+    """Вид отчёта."""
+
+    COMPONENTS = "components"  # Отчёт о компонентах системы
+    FULL_COMPONENTS = "full"  # Полный отчёт о компонентах (с требованиями)
+    WORKSTATION = "workstation"  # Информация о рабочей станции (загрузки)
+
+
+# Среднее число строк отчёта на запись без учёта повторов и ошибочных строк:
+# в полном отчёте у половины записей есть строка «требует:» и 1-3 требования
+LINES_PER_RECORD = {
+    ReportKind.COMPONENTS: 1.0,
+    ReportKind.FULL_COMPONENTS: 2.5,
+    ReportKind.WORKSTATION: 1.0,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ReportOptions:
+    """Параметры генерируемой пары отчётов."""
+
+    kind: ReportKind = ReportKind.COMPONENTS
+    lines: int = 10_000  # Примерное число строк каждого отчёта
+    diff_ratio: float = 0.01  # Доля записей, изменённых или удалённых во втором отчёте
+    duplicate_ratio: float = 0.01  # Доля записей, повторённых в отчёте
+    malformed_ratio: float = 0.001  # Доля ошибочных строк, похожих на записи
+    seed: int = 0
+
+    def get_file_stem(self) -> str:
+        """Имя файлов пары отчётов (без номера), однозначно задаваемое параметрами."""
+        return (
+            f"{self.kind.value}_{self.lines}_d{self.diff_ratio}"
+            f"_r{self.duplicate_ratio}_m{self.malformed_ratio}_s{self.seed}"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Record:
+    """Запись отчёта: тип компонента (расширение файла загрузки), название и VS."""
+
+    type: str
+    name: str
+    stamp: str
+    size: int
+
+
+def format_size(size: int) -> str:
+    """Размер в отчёте записывается группами цифр через пробел."""
+    return f"{size:,}".replace(",", " ")
+
+
+def make_stamp(kind: ReportKind, rng: random.Random) -> str:
+    """Версия компонента или дата и время создания загруженного файла."""
+    if kind is ReportKind.WORKSTATION:
+        return (
+            f"{rng.randint(1, 28):02}\\{rng.randint(1, 12):02}\\{rng.randint(2012, 2026)} "
+            f"{rng.randint(0, 23):02}:{rng.randint(0, 59):02}"
+        )
+    return f"{rng.choice((5, 9))}.{rng.randint(1, 5)}.{rng.randint(1, 400)}.0"
+
+
+def make_record(kind: ReportKind, number: int, rng: random.Random) -> Record:
+    if kind is ReportKind.WORKSTATION:
+        extension = rng.choice(LOAD_EXTENSIONS)
+        name = f"MOD{number:07}.{extension}"
+        return Record(extension, name, make_stamp(kind, rng), rng.randint(16, 10**7))
+    return Record(
+        rng.choice(COMPONENT_TYPES),
+        f"COMP{number:07}",
+        make_stamp(kind, rng),
+        rng.randint(16, 10**7),
+    )
+
+
+def make_records(options: ReportOptions, rng: random.Random) -> list[Record]:
+    """Записи первого отчёта: их число определяется заданным числом строк."""
+    lines_per_record = (
+        LINES_PER_RECORD[options.kind]
+        + options.duplicate_ratio
+        + options.malformed_ratio
+    )
+    count = max(1, int(options.lines / lines_per_record))
+    return [make_record(options.kind, number, rng) for number in range(count)]
+
+
+def change_records(
+    records: list[Record], options: ReportOptions, rng: random.Random
+) -> list[Record]:
+    """
+    Записи второго отчёта: доля options.diff_ratio записей первого отчёта
+    изменена (версия или размер) или удалена, и добавлены новые записи.
+    """
+    changed = []
+    for record in records:
+        if rng.random() >= options.diff_ratio:
+            changed.append(record)
+            continue
+        action = rng.random()
+        if action < 0.4:
+            stamp = make_stamp(options.kind, rng)
+            if stamp != record.stamp:
+                changed.append(Record(record.type, record.name, stamp, record.size))
+                continue
+        if action < 0.7:
+            changed.append(
+                Record(record.type, record.name, record.stamp, record.size + 1)
+            )
+        # Иначе запись удалена
+
+    added = int(len(records) * options.diff_ratio * 0.3)
+    changed.extend(
+        make_record(options.kind, number, rng)
+        for number in range(len(records), len(records) + added)
+    )
+    return changed
+
+
+def get_expected_records(kind: ReportKind, records: list[Record]) -> dict[str, VS]:
+    """Результат разбора отчёта parse_file (компоненты и загрузки)."""
+    prefix = PREFIX_LOAD if kind is ReportKind.WORKSTATION else PREFIX_COMPONENT
+    return {prefix + record.name: VS(record.stamp, record.size) for record in records}
+
+
+def format_record(kind: ReportKind, record: Record) -> str:
+    if kind is ReportKind.WORKSTATION:
+        return (
+            f"    {record.name:<22} {record.stamp}  {format_size(record.size):>12}  "
+            f"{EXE_FOLDER}{record.name}"
+        )
+    return (
+        f" {record.type:<5} {record.name:<22} {record.stamp:<16} "
+        f"{format_size(record.size):>12}   .\\{record.name}.{record.type}"
+    )
+
+
+def format_malformed(kind: ReportKind, record: Record, rng: random.Random) -> str:
+    """Строка, похожая на запись, но не являющаяся ею (обрезанная)."""
+    if kind is ReportKind.WORKSTATION:
+        return f"    {record.name:<22} ??\\??\\???? ??:??  {EXE_FOLDER}{record.name}"
+    if rng.random() < 0.5:
+        return f" {record.type:<5} {record.name}"
+    return f" {record.type:<5} {record.name:<22} {record.stamp}"
+
+
+def format_requirements(record: Record, rng: random.Random) -> list[str]:
+    """Строки требований записи полного отчёта о компонентах."""
+    lines = ["       требует:                       версии:            наличие:"]
+    for _ in range(rng.randint(1, 3)):
+        lines.append(
+            f"       + {rng.choice(COMPONENT_TYPES):<5} DEP{rng.randint(0, 999):04}"
+            f"                >= 5.5.{rng.randint(1, 40)}.0        5.5.41.0       "
+        )
+    return lines
+
+
+def format_title(title: str) -> list[str]:
+    return [f"{' ' * 40} {title}", f"{' ' * 40}{'_' * (len(title) + 1)}", ""]
+
+
+def format_report(
+    options: ReportOptions, records: list[Record], rng: random.Random
+) -> Iterator[str]:
+    """Строки отчёта с записями records (формируются по мере записи файла)."""
+    if options.kind is ReportKind.WORKSTATION:
+        yield from format_title("Информация о рабочей станции:")
+        yield from SYSTEM_LINES
+        middle = len(records) // 2
+        sections = (
+            ("Список загруженных библиотек (DLL):", records[:middle]),
+            ("Список загруженных ресурсных файлов:", records[middle:]),
+        )
+        header = (
+            "    Файл                   Дата создания     Размер файла  Путь к файлу"
+        )
+    else:
+        title = (
+            "Отчет о компонентах системы:"
+            if options.kind is ReportKind.COMPONENTS
+            else "Полный отчет о компонентах:"
+        )
+        yield from format_title(title)
+        yield from ("Путь запуска системы:", EXE_FOLDER, "")
+        sections = ((None, records),)
+        header = "Тип     Имя                    Версия           Размер(б)       Относительный путь"
+
+    for section_title, section_records in sections:
+        if section_title:
+            yield section_title
+        yield header
+        for record in section_records:
+            line = format_record(options.kind, record)
+            yield line
+            if options.kind is ReportKind.FULL_COMPONENTS and rng.random() < 0.5:
+                yield from format_requirements(record, rng)
+            if rng.random() < options.duplicate_ratio:
+                yield line
+            if rng.random() < options.malformed_ratio:
+                yield format_malformed(options.kind, record, rng)
+
+    yield SEPARATOR
+    yield " "
+
+
+def write_report(file_path: str | Path, lines: Iterable[str]) -> None:
+    with open(file_path, "w", encoding=c.ENCODING_FILE) as file:
+        file.writelines(f"{line}\n" for line in lines)
+
+
+def generate_report_pair(
+    file_path1: str | Path, file_path2: str | Path, options: ReportOptions
+) -> tuple[dict[str, VS], dict[str, VS]]:
+    """
+    Записывает пару отчётов.
+    :return: Ожидаемые результаты разбора первого и второго отчётов.
+    """
+    rng = random.Random(options.seed)
+    records1 = make_records(options, rng)
+    records2 = change_records(records1, options, rng)
+    write_report(file_path1, format_report(options, records1, rng))
+    write_report(file_path2, format_report(options, records2, rng))
+    return (
+        get_expected_records(options.kind, records1),
+        get_expected_records(options.kind, records2),
+    )
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    """Параметры генерируемых отчётов (общие с benchmarks.run)."""
+    defaults = ReportOptions()
+    parser.add_argument(
+        "--kind",
+        choices=[kind.value for kind in ReportKind],
+        default=defaults.kind.value,
+        help="вид отчёта",
+    )
+    parser.add_argument(
+        "--diff-ratio",
+        type=float,
+        default=defaults.diff_ratio,
+        help="доля записей, изменённых или удалённых во втором отчёте",
+    )
+    parser.add_argument(
+        "--duplicate-ratio",
+        type=float,
+        default=defaults.duplicate_ratio,
+        help="доля повторённых записей",
+    )
+    parser.add_argument(
+        "--malformed-ratio",
+        type=float,
+        default=defaults.malformed_ratio,
+        help="доля ошибочных строк",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def get_report_options(args: argparse.Namespace, lines: int) -> ReportOptions:
+    return ReportOptions(
+        ReportKind(args.kind),
+        lines,
+        args.diff_ratio,
+        args.duplicate_ratio,
+        args.malformed_ratio,
+        args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.report_generator",
+        description="Генерация пары синтетических отчётов системы «Галактика».",
+    )
+    parser.add_argument("report1")
+    parser.add_argument("report2")
+    parser.add_argument(
+        "-n", "--lines", type=int, default=ReportOptions().lines, help="число строк"
+    )
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    records1, records2 = generate_report_pair(
+        args.report1, args.report2, get_report_options(args, args.lines)
+    )
+    print(f"Записей: {len(records1)}, {len(records2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Измерение производительности этапов сравнения отчётов на синтетических отчётах
+разного размера (см. benchmarks.report_generator).
+
+Для каждого размера измеряются время каждого этапа, пиковый объём памяти,
+выделенной на этапе, и объём памяти, занимаемой его результатом (tracemalloc;
+измеряется отдельным повторным выполнением этапа, чтобы трассировка не искажала
+время). Этап records_dict переводит результаты разбора в словари, как их
+хранили прежде: его объём памяти сравнивается с объёмом памяти parse_lines.
+Результаты записываются в JSON файл, два таких файла (например, до и после
+изменения) можно сравнить.
+
+Запуск:
+    python -m benchmarks.run [параметры] [-o results.json]
+    python -m benchmarks.run --compare before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.report_generator import (
+    ReportKind,
+    ReportOptions,
+    add_report_arguments,
+    generate_report_pair,
+    get_report_options,
+)
+from src.compare import ParseEngine, merge_diff, parse_file
+from src.export import make_rows_from_diff, write_csv
+from src.xlsx import write_xlsx
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+
+# Этап: название и функция, получающая результаты предыдущих этапов
+Stage = tuple[str, Callable[[dict[str, object]], object]]
+
+
+@dataclass(slots=True)
+class StageResult:
+    """Результат измерения этапа для отчётов одного размера."""
+
+    kind: str
+    lines: int  # Заданное число строк каждого отчёта
+    stage: str
+    seconds: float
+    peak_bytes: int | None  # Пиковый объём выделенной на этапе памяти
+    retained_bytes: int | None  # Объём памяти, занимаемой результатом этапа
+    items: int | None  # Число записей (строк) результата этапа
+
+
+def populate_model(rows: list) -> object:
+    """Заполняет модель таблицы окна программы и сортирует её по размеру."""
+    from PyQt6.QtCore import Qt
+
+    from src.constants import Constant as c
+    from src.diff_model import DiffTableModel
+
+    model = DiffTableModel()
+    model.set_rows(rows, c.LIST_HEADER_COLUMNS)
+    model.sort(3, Qt.SortOrder.DescendingOrder)
+    return model
+
+
+def get_stages(
+    report1: Path, report2: Path, options: ReportOptions, output_dir: Path
+) -> list[Stage]:
+    compare_comps = options.kind is not ReportKind.WORKSTATION
+    compare_loads = not compare_comps
+
+    def parse(engine: ParseEngine) -> Callable[[dict[str, object]], object]:
+        return lambda results: tuple(
+            parse_file(str(report), compare_comps, compare_loads, engine)
+            for report in (report1, report2)
+        )
+
+    stages: list[Stage] = [
+        ("parse_lines", parse(ParseEngine.LINES)),
+        ("parse_mmap", parse(ParseEngine.MMAP)),
+        (
+            "records_dict",
+            lambda results: tuple(
+                dict(records.items()) for records in results["parse_lines"]
+            ),
+        ),
+        (
+            "diff_rows",
+            lambda results: make_rows_from_diff(merge_diff(*results["parse_lines"])),
+        ),
+    ]
+    try:
+        import PyQt6.QtCore  # noqa: F401
+    except ImportError:
+        pass  # Без PyQt6 заполнение модели таблицы не измеряется
+    else:
+        stages.append(("populate_model", lambda r: populate_model(r["diff_rows"])))
+    stages.append(
+        (
+            "write_xlsx",
+            lambda results: write_xlsx(
+                output_dir / "result.xlsx", results["diff_rows"]
+            ),
+        )
+    )
+    stages.append(
+        (
+            "write_csv",
+            lambda results: write_csv(output_dir / "result.csv", results["diff_rows"]),
+        )
+    )
+    return stages
+
+
+def get_items(result: object) -> int | None:
+    """Число записей результата этапа."""
+    if isinstance(result, tuple):
+        return sum(len(item) for item in result)
+    if isinstance(result, list):
+        return len(result)
+    if hasattr(result, "row_count"):
+        return result.row_count
+    return None
+
+
+def run_stage(
+    function: Callable[[dict[str, object]], object],
+    results: dict[str, object],
+    trace_memory: bool,
+) -> tuple[object, float, int | None, int | None]:
+    """
+    Выполняет этап.
+    :return: Результат этапа, время выполнения, пиковый объём выделенной памяти
+             и объём памяти, оставшейся занятой результатом этапа.
+    """
+    start = time.perf_counter()
+    result = function(results)
+    seconds = time.perf_counter() - start
+
+    peak_bytes = retained_bytes = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            traced_result = function(results)
+            retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            del traced_result
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak_bytes, retained_bytes
+
+
+def run_size(
+    options: ReportOptions, work_dir: Path, trace_memory: bool
+) -> list[StageResult]:
+    """Генерирует пару отчётов (если её ещё нет) и измеряет все этапы."""
+    stem = options.get_file_stem()
+    report1 = work_dir / f"{stem}_1.txt"
+    report2 = work_dir / f"{stem}_2.txt"
+    if not (report1.exists() and report2.exists()):
+        generate_report_pair(report1, report2, options)
+
+    stage_results = []
+    results: dict[str, object] = {}
+    for name, function in get_stages(report1, report2, options, work_dir):
+        result, seconds, peak_bytes, retained_bytes = run_stage(
+            function, results, trace_memory
+        )
+        results[name] = result
+        stage_result = StageResult(
+            options.kind.value,
+            options.lines,
+            name,
+            round(seconds, 4),
+            peak_bytes,
+            retained_bytes,
+            get_items(result),
+        )
+        stage_results.append(stage_result)
+        print(format_stage_result(stage_result), flush=True)
+    return stage_results
+
+
+def format_stage_result(result: StageResult) -> str:
+    memory = ""
+    if result.peak_bytes is not None:
+        memory = (
+            f"{result.peak_bytes / 2**20:10.1f} МБ"
+            f"{result.retained_bytes / 2**20:10.1f} МБ"
+        )
+    return (
+        f"{result.kind:<12} {result.lines:>10} {result.stage:<16} "
+        f"{result.seconds:10.3f} с{memory}"
+    )
+
+
+def get_commit() -> str | None:
+    """Текущий коммит репозитория, если программа запущена из него."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    sizes: list[int], args: argparse.Namespace, work_dir: Path
+) -> dict[str, object]:
+    results = []
+    for lines in sizes:
+        options = get_report_options(args, lines)
+        results.extend(run_size(options, work_dir, not args.no_memory))
+    return {
+        "commit": get_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "options": asdict(get_report_options(args, 0)) | {"kind": args.kind},
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare_results(file_path1: str, file_path2: str) -> None:
+    """Выводит время этапов двух запусков и их отношение."""
+    runs = []
+    for file_path in (file_path1, file_path2):
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        runs.append(
+            {
+                (result["kind"], result["lines"], result["stage"]): result
+                for result in data["results"]
+            }
+        )
+        print(f"{file_path}: коммит {data.get('commit')}, {data.get('date')}")
+
+    before, after = runs
+    for key in sorted(before.keys() & after.keys()):
+        seconds1 = before[key]["seconds"]
+        seconds2 = after[key]["seconds"]
+        ratio = f"{seconds2 / seconds1:8.2f}x" if seconds1 else ""
+        kind, lines, stage = key
+        print(
+            f"{kind:<12} {lines:>10} {stage:<16} {seconds1:10.3f} {seconds2:10.3f}{ratio}"
+        )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Измерение производительности сравнения отчётов.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="число строк отчётов",
+    )
+    add_report_arguments(parser)
+    parser.add_argument(
+        "--work-dir",
+        help="каталог сгенерированных отчётов; отчёты с теми же параметрами "
+        "используются повторно (по умолчанию временный каталог)",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="не измерять объём памяти"
+    )
+    parser.add_argument("-o", "--output", help="файл результатов JSON")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("ДО", "ПОСЛЕ"),
+        help="сравнить два файла результатов",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = create_parser().parse_args(argv)
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    if args.work_dir:
+        work_dir = Path(args.work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        data = run_benchmarks(args.sizes, args, work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data = run_benchmarks(args.sizes, args, Path(temp_dir))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
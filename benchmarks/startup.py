@@ -0,0 +1,147 @@
+"""
+Измерение времени холодного запуска окна программы: от запуска процесса
+интерпретатора до первой отрисовки окна.
+
+Каждый запуск выполняется в новом процессе, в собственном временном каталоге
+(без файла настроек) и с пустым кэшем разбора. Процесс замеряет этапы:
+    imports      — импорт PyQt6 и модулей окна;
+    window       — создание приложения Qt и окна;
+    first_paint  — от показа окна до первой отрисовки виджета;
+время от запуска процесса до первой отрисовки (total) замеряет вызывающий процесс.
+Интерфейс окна создаётся из скомпилированного модуля (python -m src.ui_loader),
+если он есть, а с параметром --load-ui — из файла .ui, что позволяет сравнить
+оба способа. Без дисплея задайте переменную окружения QT_QPA_PLATFORM=offscreen.
+
+Запуск:
+    python -m benchmarks.startup [--runs 20] [--load-ui] [-o startup.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.run import get_commit
+from src.constants import Constant as c
+
+PHASES = ("imports", "window", "first_paint", "total")
+
+# Программа процесса запуска; аргумент — время запуска процесса (time.time)
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+from src.compare_reports import MyWindow
+imported = time.perf_counter()
+app = QApplication(sys.argv[:1])
+window = MyWindow()
+created = time.perf_counter()
+times = {}
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint and not times:
+            times["imports"] = imported - start
+            times["window"] = created - imported
+            times["first_paint"] = time.perf_counter() - created
+            times["total"] = time.time() - float(sys.argv[1])
+            QTimer.singleShot(0, app.quit)
+        return False
+
+
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+window.show()
+app.exec()
+print(json.dumps(times))
+"""
+
+
+def run_startup(load_ui: bool) -> dict[str, float]:
+    """Запускает окно программы в новом процессе. :return: Время этапов (с)."""
+    root = Path(__file__).resolve().parents[1]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, (str(root), env.get("PYTHONPATH")))
+        )
+        env[c.CACHE_DIR_ENV] = str(Path(temp_dir) / "cache")
+        env[c.LOAD_UI_ENV] = "1" if load_ui else "0"
+        process = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT, repr(time.time())],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=temp_dir,
+            env=env,
+            timeout=120,
+        )
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def summarize(runs: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Медиана и наименьшее время каждого этапа."""
+    return {
+        phase: {
+            "median": round(statistics.median(run[phase] for run in runs), 4),
+            "min": round(min(run[phase] for run in runs), 4),
+        }
+        for phase in PHASES
+    }
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Измерение времени запуска окна программы до первой отрисовки.",
+    )
+    parser.add_argument("--runs", type=int, default=20, help="число запусков")
+    parser.add_argument(
+        "--load-ui",
+        action="store_true",
+        help="загружать интерфейс из файла .ui, а не из скомпилированного модуля",
+    )
+    parser.add_argument("-o", "--output", help="файл результатов JSON")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = create_parser().parse_args(argv)
+    if args.runs < 1:
+        create_parser().error("--runs: нужен хотя бы один запуск")
+
+    # Первый запуск прогревает файловый кэш ОС и кэш байт-кода и не учитывается
+    run_startup(args.load_ui)
+    runs = [run_startup(args.load_ui) for _ in range(args.runs)]
+    summary = summarize(runs)
+    for phase, times in summary.items():
+        print(
+            f"{phase:<12} {times['median'] * 1000:10.1f} мс"
+            f" (наименьшее {times['min'] * 1000:.1f} мс)"
+        )
+
+    if args.output:
+        data = {
+            "commit": get_commit(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "load_ui": args.load_ui,
+            "summary": summary,
+            "runs": runs,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
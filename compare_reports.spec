@@ -1,18 +1,68 @@
 # -*- mode: python ; coding: utf-8 -*-
+import sys
+
+# Интерфейс окна компилируется в модуль Python (см. src/ui_loader.py):
+# собранной программе не нужны файл .ui и PyQt6.uic
+sys.path.insert(0, SPECPATH)
+from src.ui_loader import compile_ui
+
+compile_ui()
+
+# Модули Qt и библиотеки, которые программа не использует
+EXCLUDES = [
+    'PyQt6.uic',
+    'PyQt6.Qt3DAnimation',
+    'PyQt6.Qt3DCore',
+    'PyQt6.Qt3DExtras',
+    'PyQt6.Qt3DInput',
+    'PyQt6.Qt3DLogic',
+    'PyQt6.Qt3DRender',
+    'PyQt6.QtBluetooth',
+    'PyQt6.QtDBus',
+    'PyQt6.QtDesigner',
+    'PyQt6.QtHelp',
+    'PyQt6.QtMultimedia',
+    'PyQt6.QtMultimediaWidgets',
+    'PyQt6.QtNetwork',
+    'PyQt6.QtNfc',
+    'PyQt6.QtOpenGL',
+    'PyQt6.QtOpenGLWidgets',
+    'PyQt6.QtPdf',
+    'PyQt6.QtPdfWidgets',
+    'PyQt6.QtPositioning',
+    'PyQt6.QtPrintSupport',
+    'PyQt6.QtQml',
+    'PyQt6.QtQuick',
+    'PyQt6.QtQuick3D',
+    'PyQt6.QtQuickWidgets',
+    'PyQt6.QtRemoteObjects',
+    'PyQt6.QtSensors',
+    'PyQt6.QtSerialPort',
+    'PyQt6.QtSpatialAudio',
+    'PyQt6.QtSql',
+    'PyQt6.QtStateMachine',
+    'PyQt6.QtSvg',
+    'PyQt6.QtSvgWidgets',
+    'PyQt6.QtTest',
+    'PyQt6.QtTextToSpeech',
+    'PyQt6.QtWebChannel',
+    'PyQt6.QtWebSockets',
+    'PyQt6.QtXml',
+    'tkinter',
+]
 
 
 a = Analysis(
     ['compare_reports.py'],
     pathex=[],
     binaries=[],
-    datas=[
-	('_internal\\compare_reports.ui', '.'),
-],
-    hiddenimports=[],
+    datas=[],
+    # Модуль интерфейса загружается по имени (см. src/ui_loader.py)
+    hiddenimports=['src.compare_reports_ui'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,499 @@
+"""
+Пакетное сравнение отчётов без графического интерфейса.
+Модуль не импортирует PyQt6 и может запускаться на сервере без графической среды.
+
+Запуск:
+    python -m src.cli [параметры] ОТЧЁТ1 ОТЧЁТ2 [ОТЧЁТ1 ОТЧЁТ2 ...]
+    python -m src.cli [параметры] --manifest ФАЙЛ
+    python -m src.cli [параметры] --matrix ОТЧЁТ ОТЧЁТ [ОТЧЁТ ...]
+    python -m src.cli [параметры] --verify КАТАЛОГ ОТЧЁТ
+    python -m src.cli [параметры] --fleet КАТАЛОГ
+    python -m src.cli [параметры] --digest ОТЧЁТ [ОТЧЁТ ...]
+    python -m src.cli --db БАЗА [--host СТАНЦИЯ] ОТЧЁТ [ОТЧЁТ ...]
+    python -m src.cli --db БАЗА --snapshots СНИМОК СНИМОК
+    python -m src.cli --db БАЗА --history КЛЮЧ --host СТАНЦИЯ
+    python -m src.cli --db БАЗА --hosts-with ВЕРСИЯ [--key КЛЮЧ]
+
+Код завершения: 0 — отличий нет, 1 — найдены отличия, 2 — ошибка сравнения
+хотя бы одной пары отчётов или неверные параметры.
+"""
+
+import argparse
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.compare import VS, ParseStats, RecordStore, parse_file
+from src.constants import Constant as c
+from src.digest import diff_reports, digest_report
+from src.export import (
+    make_fleet_host_rows,
+    make_fleet_summary_rows,
+    make_matrix_header,
+    make_matrix_rows,
+    format_value,
+    make_rows_from_diff,
+    write_csv,
+)
+from src.fleet import analyze_fleet
+from src.metrics import StageTimer, append_log
+from src.parse_cache import parse_file_cached
+from src.report_matrix import build_report_matrix
+from src.snapshots import SnapshotStore
+from src.verify import verify_report
+
+EXIT_NO_DIFFERENCES = 0
+EXIT_DIFFERENCES = 1
+EXIT_ERROR = 2
+
+
+@dataclass(frozen=True, slots=True)
+class ReportPair:
+    """Пара сравниваемых отчётов и файл результата их сравнения."""
+
+    report1: str
+    report2: str
+    output: str
+
+
+def read_manifest(manifest_path: str) -> list[tuple[str, str]]:
+    """
+    Читает файл со списком пар отчётов: в каждой строке два пути, разделённых
+    символом «;». Пустые строки и строки, начинающиеся с «#», пропускаются.
+    """
+    pairs = []
+    with open(manifest_path, "r", encoding="utf-8-sig") as file:
+        for number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            paths = [path.strip() for path in line.split(c.CLI_MANIFEST_DELIMITER)]
+            if len(paths) != 2 or not all(paths):
+                raise ValueError(
+                    f"{manifest_path}, строка {number}: ожидаются два пути через "
+                    f"«{c.CLI_MANIFEST_DELIMITER}»"
+                )
+            pairs.append((paths[0], paths[1]))
+    return pairs
+
+
+def make_report_pairs(
+    pairs: list[tuple[str, str]], output_dir: Path
+) -> list[ReportPair]:
+    """Назначает каждой паре отчётов файл результата в каталоге output_dir."""
+    width = len(str(len(pairs)))
+    return [
+        ReportPair(
+            report1,
+            report2,
+            str(
+                output_dir
+                / f"compare_{index:0{width}}_{Path(report1).stem}_{Path(report2).stem}.csv"
+            ),
+        )
+        for index, (report1, report2) in enumerate(pairs, start=1)
+    ]
+
+
+def compare_pair(
+    pair: ReportPair, compare_comps: bool, compare_loads: bool, use_cache: bool
+) -> int:
+    """
+    Сравнивает пару отчётов и записывает результат в CSV файл
+    в том же виде, что и сохранение результата в окне программы.
+    Разбор отчётов и запись результата замеряются и дописываются в журнал
+    замеров (см. src.metrics); при заданной переменной окружения c.PROFILE_ENV
+    профиль сравнения записывается рядом с CSV файлом.
+    :return: Число отличий.
+    """
+    parse_function = parse_file_cached if use_cache else parse_file
+    timer = StageTimer()
+    stats: list[ParseStats] = []
+
+    def parse_report(
+        file_path: str, compare_comps: bool, compare_loads: bool
+    ) -> RecordStore:
+        report_stats = ParseStats()
+        stats.append(report_stats)
+        with timer.span("parse"):
+            return parse_function(
+                file_path, compare_comps, compare_loads, stats=report_stats
+            )
+
+    timer.start_profile()
+    try:
+        rows = make_rows_from_diff(
+            diff_reports(
+                pair.report1, pair.report2, compare_comps, compare_loads, parse_report
+            )
+        )
+        with timer.span("write_csv"):
+            write_csv(pair.output, rows)
+    finally:
+        timer.stop_profile()
+    timer.add_parse_stats(stats)
+    timer.dump_profile(pair.output)
+    append_log(
+        timer.to_record(
+            "cli_pair", reports=[pair.report1, pair.report2], rows=len(rows)
+        )
+    )
+    return len(rows)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Пакетное сравнение пар отчётов системы «Галактика».",
+    )
+    parser.add_argument(
+        "reports",
+        nargs="*",
+        metavar="ОТЧЁТ",
+        help="пути к отчётам: первый и второй отчёт каждой пары",
+    )
+    parser.add_argument(
+        "-m",
+        "--manifest",
+        help=f"файл со списком пар отчётов (два пути через «{c.CLI_MANIFEST_DELIMITER}» в строке)",
+    )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help="сравнить все заданные отчёты между собой и записать один файл результата",
+    )
+    parser.add_argument(
+        "--verify",
+        metavar="КАТАЛОГ",
+        help="сверить отчёт с файлами каталога установки системы на диске",
+    )
+    parser.add_argument(
+        "--fleet",
+        metavar="КАТАЛОГ",
+        help="найти отклонения отчётов станций каталога от большинства станций",
+    )
+    parser.add_argument(
+        "--digest",
+        action="store_true",
+        help=f"записать дайджесты отчётов в файлы *{c.DIGEST_SUFFIX} рядом с ними",
+    )
+    parser.add_argument(
+        "--report-root",
+        metavar="КАТАЛОГ",
+        help="каталог установки в путях отчёта для --verify "
+        "(по умолчанию общий каталог файлов компонентов)",
+    )
+    snapshots = parser.add_argument_group(
+        "база снимков",
+        "отчёты, заданные вместе с --db, загружаются в базу снимков",
+    )
+    snapshots.add_argument("--db", metavar="БАЗА", help="файл базы снимков SQLite")
+    snapshots.add_argument(
+        "--host",
+        help="станция: снимков загружаемых отчётов (по умолчанию имя файла) "
+        "или для --history",
+    )
+    snapshots.add_argument(
+        "--snapshots",
+        nargs=2,
+        type=int,
+        metavar="СНИМОК",
+        help="сравнить два снимка базы по их номерам",
+    )
+    snapshots.add_argument(
+        "--history", metavar="КЛЮЧ", help="изменения записи на станции --host"
+    )
+    snapshots.add_argument(
+        "--hosts-with",
+        metavar="ВЕРСИЯ",
+        help="станции, последний снимок которых содержит записи с версией",
+    )
+    snapshots.add_argument("--key", help="запись для --hosts-with")
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        default=".",
+        help="каталог для файлов результатов (по умолчанию текущий)",
+    )
+    parser.add_argument(
+        "--comps",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="сравнивать компоненты (по умолчанию да)",
+    )
+    parser.add_argument(
+        "--loads",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="сравнивать загрузки (по умолчанию нет)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="число процессов сравнения (по умолчанию по числу процессоров)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="не использовать кэш результатов разбора отчётов",
+    )
+    return parser
+
+
+def compare_matrix(args: argparse.Namespace) -> int:
+    """Сравнивает все отчёты между собой (параметр --matrix)."""
+    parse_function = parse_file if args.no_cache else parse_file_cached
+    output = Path(args.output_dir) / c.CLI_MATRIX_FILE
+    try:
+        matrix = build_report_matrix(
+            args.reports, args.comps, args.loads, parse_function=parse_function
+        )
+        rows = make_matrix_rows(matrix)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        write_csv(output, rows, make_matrix_header(matrix.report_names))
+    except Exception as e:
+        print(f"{c.TEXT_ERROR_FILE} {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    print(f"Отчётов {len(args.reports)}: отличий {len(rows)}, результат {output}")
+    return EXIT_DIFFERENCES if rows else EXIT_NO_DIFFERENCES
+
+
+def verify_installation(args: argparse.Namespace) -> int:
+    """Сверяет отчёт с каталогом установки (параметр --verify)."""
+    (report,) = args.reports
+    output = Path(args.output_dir) / c.CLI_VERIFY_FILE
+    try:
+        result = verify_report(
+            report, args.verify, args.comps, args.loads, args.report_root
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        write_csv(output, result.rows, c.LIST_VERIFY_HEADER_COLUMNS)
+    except Exception as e:
+        print(f"{c.TEXT_ERROR_FILE} {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    print(
+        f"{report} — {args.verify}: файлов {len(result.records)}, "
+        f"отличий {len(result.rows)}, вне каталога установки {result.skipped}, "
+        f"результат {output}"
+    )
+    return EXIT_DIFFERENCES if result.rows else EXIT_NO_DIFFERENCES
+
+
+def analyze_fleet_reports(args: argparse.Namespace) -> int:
+    """Анализирует отчёты парка станций (параметр --fleet)."""
+    file_paths = sorted(
+        str(path) for path in Path(args.fleet).glob(c.FLEET_REPORT_PATTERN)
+    )
+    if not file_paths:
+        print(f"{args.fleet}: нет отчётов {c.FLEET_REPORT_PATTERN}", file=sys.stderr)
+        return EXIT_ERROR
+
+    output_dir = Path(args.output_dir)
+    parse_function = parse_file if args.no_cache else parse_file_cached
+    try:
+        result = analyze_fleet(
+            file_paths, args.comps, args.loads, args.jobs, parse_function
+        )
+        output_dir.mkdir(parents=True, exist_ok=True)
+        summary_rows = make_fleet_summary_rows(result)
+        write_csv(
+            output_dir / c.CLI_FLEET_SUMMARY_FILE,
+            summary_rows,
+            c.LIST_FLEET_SUMMARY_COLUMNS,
+        )
+        write_csv(
+            output_dir / c.CLI_FLEET_HOSTS_FILE,
+            make_fleet_host_rows(result),
+            c.LIST_FLEET_HOST_COLUMNS,
+        )
+    except Exception as e:
+        print(f"{c.TEXT_ERROR_FILE} {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    deviating_hosts = sum(
+        len(group.file_paths) for group in result.groups if group.deviations
+    )
+    print(
+        f"Станций {result.counters.hosts}, групп одинаковых отчётов "
+        f"{len(result.groups)}: записей с отклонениями {len(summary_rows)}, "
+        f"станций с отклонениями {deviating_hosts}, результат {output_dir}"
+    )
+    return EXIT_DIFFERENCES if summary_rows else EXIT_NO_DIFFERENCES
+
+
+def write_digests(args: argparse.Namespace) -> int:
+    """Записывает дайджесты отчётов (параметр --digest)."""
+    parse_function = parse_file if args.no_cache else parse_file_cached
+    exit_code = EXIT_NO_DIFFERENCES
+    for report in args.reports:
+        try:
+            digest = digest_report(report, args.comps, args.loads, parse_function)
+        except Exception as e:
+            print(f"{c.TEXT_ERROR_FILE} {report}: {e}", file=sys.stderr)
+            exit_code = EXIT_ERROR
+            continue
+        print(f"{report}: {digest.root.hex()}")
+    return exit_code
+
+
+def format_state(state: VS | None) -> str:
+    """Представление версии и размера записи в выводе запросов к базе снимков."""
+    if state is None:
+        return "нет"
+    return f"{state.stamp} {format_value(state.size)}"
+
+
+def run_snapshots(args: argparse.Namespace) -> int:
+    """
+    Загружает отчёты в базу снимков, сравнивает снимки или отвечает
+    на запросы об истории (параметр --db). Без других параметров
+    выводит список снимков.
+    """
+    exit_code = EXIT_NO_DIFFERENCES
+    try:
+        with SnapshotStore(args.db) as store:
+            if args.snapshots:
+                return compare_snapshots(args, store)
+            if args.history:
+                for entry in store.get_history(args.history, args.host):
+                    print(
+                        f"{entry.snapshot.taken_at} снимок {entry.snapshot.id}: "
+                        f"{entry.key} {format_state(entry.state)}"
+                    )
+            elif args.hosts_with:
+                for host, taken_at, key in store.find_hosts(args.hosts_with, args.key):
+                    print(f"{host} {taken_at}: {key}")
+            elif args.reports:
+                for report in args.reports:
+                    try:
+                        snapshot, added = store.ingest(report, args.host)
+                    except Exception as e:
+                        print(f"{report}: {c.TEXT_ERROR_FILE} {e}", file=sys.stderr)
+                        exit_code = EXIT_ERROR
+                        continue
+                    status = "загружен" if added else "уже в базе"
+                    print(f"{report}: снимок {snapshot.id} ({snapshot.host}), {status}")
+            else:
+                for snapshot in store.get_snapshots(args.host):
+                    print(
+                        f"{snapshot.id}: {snapshot.host} {snapshot.taken_at} "
+                        f"{snapshot.source_path}"
+                    )
+    except Exception as e:
+        print(f"{c.TEXT_ERROR_FILE} {e}", file=sys.stderr)
+        return EXIT_ERROR
+    return exit_code
+
+
+def compare_snapshots(args: argparse.Namespace, store: SnapshotStore) -> int:
+    """Сравнивает два снимка базы (параметр --snapshots)."""
+    snapshot_id1, snapshot_id2 = args.snapshots
+    output = Path(args.output_dir) / c.CLI_SNAPSHOTS_FILE.format(
+        snapshot_id1, snapshot_id2
+    )
+    rows = make_rows_from_diff(
+        store.diff(snapshot_id1, snapshot_id2, args.comps, args.loads)
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_csv(output, rows)
+    print(
+        f"Снимки {snapshot_id1} — {snapshot_id2}: отличий {len(rows)}, "
+        f"результат {output}"
+    )
+    return EXIT_DIFFERENCES if rows else EXIT_NO_DIFFERENCES
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    if not args.comps and not args.loads:
+        parser.error(c.TEXT_NO_COMP.strip())
+    if args.db:
+        if args.manifest or args.matrix or args.verify:
+            parser.error("--db: задайте отчёты без --manifest, --matrix и --verify")
+        if args.history and not args.host:
+            parser.error("--history: задайте станцию параметром --host")
+        if args.reports and (args.snapshots or args.history or args.hosts_with):
+            parser.error("--db: отчёты загружаются в базу отдельно от запросов")
+        return run_snapshots(args)
+    if args.snapshots or args.history or args.hosts_with or args.key:
+        parser.error("запросы к базе снимков задаются вместе с --db")
+    if args.matrix:
+        if args.manifest or len(args.reports) < 2:
+            parser.error("--matrix: задайте не менее двух отчётов без --manifest")
+        return compare_matrix(args)
+    if args.fleet:
+        if args.manifest or args.reports:
+            parser.error("--fleet: отчёты берутся из каталога")
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("число процессов должно быть положительным")
+        return analyze_fleet_reports(args)
+    if args.digest:
+        if args.manifest or not args.reports:
+            parser.error("--digest: задайте отчёты без --manifest")
+        return write_digests(args)
+    if args.verify:
+        if args.manifest or len(args.reports) != 1:
+            parser.error("--verify: задайте один отчёт без --manifest")
+        return verify_installation(args)
+    if args.report_root:
+        parser.error("--report-root задаётся только вместе с --verify")
+
+    if len(args.reports) % 2:
+        parser.error("отчёты задаются парами")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("число процессов должно быть положительным")
+
+    pairs = list(zip(args.reports[::2], args.reports[1::2]))
+    if args.manifest:
+        try:
+            pairs.extend(read_manifest(args.manifest))
+        except (OSError, ValueError) as e:
+            print(f"{c.TEXT_ERROR_FILE} {e}", file=sys.stderr)
+            return EXIT_ERROR
+    if not pairs:
+        parser.error("не заданы отчёты для сравнения")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_pairs = make_report_pairs(pairs, output_dir)
+
+    exit_code = EXIT_NO_DIFFERENCES
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [
+            executor.submit(
+                compare_pair, pair, args.comps, args.loads, not args.no_cache
+            )
+            for pair in report_pairs
+        ]
+        for pair, future in zip(report_pairs, futures):
+            try:
+                differences = future.result()
+            except Exception as e:
+                print(
+                    f"{pair.report1} — {pair.report2}: {c.TEXT_ERROR_FILE} {e}",
+                    file=sys.stderr,
+                )
+                exit_code = EXIT_ERROR
+                continue
+
+            print(
+                f"{pair.report1} — {pair.report2}: отличий {differences}, "
+                f"результат {pair.output}"
+            )
+            if differences and exit_code == EXIT_NO_DIFFERENCES:
+                exit_code = EXIT_DIFFERENCES
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
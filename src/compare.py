@@ -3,21 +3,51 @@
 Содержит функции для обработки файлов и сравнения записей.
 """
 
+import functools
+import hashlib
+import io
+import itertools
+import mmap
+import os
 import re
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
+from enum import Enum, auto
+from typing import TypeVar
 
 from src.constants import Constant as c
 
-PREFIX_COMPONENT = "C: "
-PREFIX_LOAD = "L: "
+# Префиксы ключей записей используются вместе с результатами разбора
+from src.record_store import (  # noqa: F401
+    PREFIX_COMPONENT,
+    PREFIX_LOAD,
+    VS,
+    RecordKind,
+    RecordStore,
+)
+
+# Версия правил разбора. Увеличивается при любом изменении результата parse_file,
+# чтобы не использовать сохранённые ранее результаты разбора (см. parse_cache)
+PARSER_VERSION = 3
 
 
-@dataclass(frozen=True, slots=True)
-class VS:
-    """Класс для хранения версии и размера компонента."""
+@dataclass(slots=True)
+class ParseStats:
+    """Счётчики разбора файла отчёта."""
 
-    stamp: str
-    size: int
+    lines: int = 0  # Всего строк в файле
+    skipped: int = 0  # Заголовки и строки разделов, не требующих разбора
+    fast: int = 0  # Строки, классифицированные без регулярных выражений
+    fallback: int = 0  # Строки, переданные регулярным выражениям
+    matched: int = 0  # Найденные записи о компонентах и загрузках
 
 
 # Регулярное выражение для разбора строк информации о компонентах
@@ -54,65 +84,767 @@ RE_PATTERN_LOADS = re.compile(
 )
 
 
+# Результат разбора строки без регулярных выражений: название, версия/дата, размер
+ParsedLine = tuple[str, str, int]
+
+# Функция, получающая число прочитанных байт файла отчёта
+ProgressCallback = Callable[[int], None]
+
+
+class LineClass(Enum):
+    """Итог классификации строки, если она не разобрана."""
+
+    NO_MATCH = auto()  # Строка заведомо не соответствует выражению
+    UNCLASSIFIED = auto()  # Разбор неоднозначен, нужна проверка выражением
+
+
+def tokenize_size_and_path(tokens: list[str], start: int) -> int | LineClass:
+    """
+    Разбирает размер, записанный группами цифр, за которым следует путь.
+    :param tokens: Лексемы строки.
+    :param start: Индекс первой лексемы после версии/даты.
+    :return: Размер или LineClass.UNCLASSIFIED, если результат разбора
+             выражением зависит от количества пробелов (нет групп цифр или пути).
+    """
+    end = start
+    while end < len(tokens) and tokens[end].isdecimal():
+        end += 1
+    if end == start or end == len(tokens):
+        return LineClass.UNCLASSIFIED
+    return int("".join(tokens[start:end]))
+
+
+def tokenize_component_line(tokens: list[str], line: str) -> ParsedLine | LineClass:
+    """
+    Разбирает строку о компоненте (тип, название, версия, размер, путь)
+    так же, как RE_PATTERN_COMPONENTS, но за линейное время.
+    Перебираются те же положения типа компонента, что и при откате выражения:
+    после незначащей первой лексемы (например, символа \\a) и на ней самой.
+    Проверки записаны без вызова вспомогательных функций: функция вызывается
+    для каждой строки отчёта.
+    :param tokens: Лексемы строки (line.split()).
+    :param line: Исходная строка.
+    :return: Разобранная строка или итог её классификации.
+    """
+    count = len(tokens)
+    if not count:
+        return LineClass.NO_MATCH
+
+    # Символ \w регулярных выражений — буква, цифра или подчёркивание
+    char = tokens[0][0]
+    if char.isalnum() or char == "_":
+        position = 0
+    elif len(tokens[0]) == 1 and count > 1:
+        char = tokens[1][0]
+        if not (char.isalnum() or char == "_"):
+            return LineClass.UNCLASSIFIED
+        position = 1
+    else:
+        return LineClass.UNCLASSIFIED
+
+    while position >= 0:
+        if position + 2 < count:
+            # Версия целиком соответствует [\d.]+
+            stamp = tokens[position + 2]
+            if stamp.replace(".", "").isdecimal() or not stamp.strip("."):
+                size = tokenize_size_and_path(tokens, position + 3)
+                if isinstance(size, LineClass):
+                    return size
+                return tokens[position + 1], stamp, size
+        position -= 1
+
+    return LineClass.NO_MATCH
+
+
+def is_date(token: str) -> bool:
+    """Проверяет, что лексема — дата ДД\\ММ\\ГГГГ."""
+    return (
+        len(token) == 10
+        and token[2] == token[5] == "\\"
+        and (token[:2] + token[3:5] + token[6:]).isdecimal()
+    )
+
+
+def is_time(token: str) -> bool:
+    """Проверяет, что лексема — время ЧЧ:ММ."""
+    return len(token) == 5 and token[2] == ":" and (token[:2] + token[3:]).isdecimal()
+
+
+def tokenize_load_line(tokens: list[str], line: str) -> ParsedLine | LineClass:
+    """
+    Разбирает строку о загруженном модуле (название, дата и время, размер, путь)
+    так же, как RE_PATTERN_LOADS, но за линейное время.
+    :param tokens: Лексемы строки (line.split()).
+    :param line: Исходная строка.
+    :return: Разобранная строка или итог её классификации.
+    """
+    if len(tokens) < 3 or not is_date(tokens[1]) or not is_time(tokens[2]):
+        return LineClass.NO_MATCH
+
+    # Дата и время должны разделяться ровно одним пробельным символом
+    date_pos = line.find(tokens[1], line.find(tokens[0]) + len(tokens[0]))
+    if line[date_pos + 11] != tokens[2][0]:
+        return LineClass.NO_MATCH
+
+    size = tokenize_size_and_path(tokens, 3)
+    if isinstance(size, LineClass):
+        return size
+    return tokens[0], line[date_pos : date_pos + 16], size
+
+
+# Разбор строк без регулярных выражений для каждого выражения
+TOKENIZERS = {
+    RE_PATTERN_COMPONENTS: tokenize_component_line,
+    RE_PATTERN_LOADS: tokenize_load_line,
+}
+
+# Вид записей, находимых каждым выражением
+PATTERN_KINDS = {
+    RE_PATTERN_COMPONENTS: RecordKind.COMPONENT,
+    RE_PATTERN_LOADS: RecordKind.LOAD,
+}
+
+
+class ReportSection(Enum):
+    """Раздел отчёта. Определяет, какие выражения применяются к его строкам."""
+
+    UNKNOWN = auto()  # Раздел не распознан: строки проверяются всеми выражениями
+    SYSTEM = auto()  # Информация о системе: строки пропускаются без проверки
+    LOADS = auto()  # Списки загруженных библиотек и ресурсов
+    COMPONENTS = auto()  # Таблицы компонентов
+
+
+# Заголовки разделов отчётов (без окружающих пробелов) и соответствующие им разделы
+SECTION_TITLES: dict[str, ReportSection] = {
+    "Информация о рабочей станции:": ReportSection.SYSTEM,
+    "Информация по клиентской части системы": ReportSection.SYSTEM,
+    "Система:": ReportSection.SYSTEM,
+    "Пути на каталоги:": ReportSection.SYSTEM,
+    "Информация по версиям библиотек и ресурсов:": ReportSection.SYSTEM,
+    "Список загруженных библиотек (DLL):": ReportSection.LOADS,
+    "Список загруженных ресурсных файлов:": ReportSection.LOADS,
+    "Отчет о компонентах системы:": ReportSection.COMPONENTS,
+    "Полный отчет о компонентах:": ReportSection.COMPONENTS,
+    "Информация о различиях версий компонентов:": ReportSection.COMPONENTS,
+    "Информация о различиях с репозитарием:": ReportSection.UNKNOWN,
+}
+
+# Разделитель разделов — строка подчёркиваний, начинающаяся с первой позиции.
+# Подчёркивания под заголовками имеют отступ и разделителями не считаются.
+# После разделителя и до следующего известного заголовка раздел не распознан.
+SECTION_SEPARATOR = "____"
+
+PatternT = TypeVar("PatternT")
+
+
+def get_section_patterns(
+    compare_comps: bool,
+    compare_loads: bool,
+    loads_pattern: PatternT,
+    comps_pattern: PatternT,
+) -> dict[ReportSection, tuple[PatternT, ...]]:
+    """
+    Возвращает для каждого раздела отчёта выражения, которые применяются к его строкам.
+    :param compare_comps: Признак того, что надо сравнивать компоненты
+    :param compare_loads: Признак того, что надо сравнивать загрузки
+    :param loads_pattern: Выражение (или набор выражений) для загрузок
+    :param comps_pattern: Выражение (или набор выражений) для компонентов
+    """
+    loads = (loads_pattern,) if compare_loads else ()
+    comps = (comps_pattern,) if compare_comps else ()
+    return {
+        ReportSection.UNKNOWN: loads + comps,
+        ReportSection.SYSTEM: (),
+        ReportSection.LOADS: loads,
+        ReportSection.COMPONENTS: comps,
+    }
+
+
+# Байтовые варианты регулярных выражений для поиска по всему файлу сразу.
+# Группы те же, что и у текстовых вариантов, и находят те же строки, что
+# и разбор декодированного текста (кодировка OEM, cp866). Поиск идёт
+# в отображённом в память файле, поэтому пробельный символ (как \s в тексте,
+# включая 0x1C-0x1F и неразрывный пробел 0xFF) не выходит за пределы строки,
+# а вместо .+ используется [^\r\n]+.
+# Байты букв (0x80-0xAF, 0xE0-0xF7) считаются значащими символами, как \w
+# в тексте; остальные байты 0x80-0xFF (псевдографика, знаки) — незначащими, как \W.
+SPACE_BYTES = b" \t\x0b\x0c\x1c\x1d\x1e\x1f\xff"
+RE_SPACE_BYTES = rb"[ \t\x0b\x0c\x1c-\x1f\xff]"
+RE_NOT_SPACE_BYTES = rb"[^\s\x1c-\x1f\xff]"
+RE_SIZE_BYTES = rb"[\d \t\x0b\x0c\x1c-\x1f\xff]"
+# Классы байтов, подставляемые в выражения: S — пробел, N — не пробел, D — размер
+BYTES_CLASSES = {b"S": RE_SPACE_BYTES, b"N": RE_NOT_SPACE_BYTES, b"D": RE_SIZE_BYTES}
+
+RE_PATTERN_COMPONENTS_BYTES = re.compile(
+    rb"""
+    [^\w\x80-\xaf\xe0-\xf7\r\n]*
+    (?P<type>%(N)s+)
+    %(S)s+
+    (?P<name>%(N)s+)
+    %(S)s+
+    (?P<stamp>[\d.]+)
+    %(S)s+
+    (?P<size>%(D)s+)
+    %(S)s+
+    (?P<path>[^\r\n]+)
+    """ % BYTES_CLASSES,
+    re.VERBOSE,
+)
+
+RE_PATTERN_LOADS_BYTES = re.compile(
+    rb"""
+    %(S)s*
+    (?P<name>%(N)s+)
+    %(S)s+
+    (?P<stamp>\d{2}\\\d{2}\\\d{4}%(S)s\d{2}:\d{2})
+    %(S)s+
+    (?P<size>%(D)s+)
+    %(S)s+
+    (?P<path>[^\r\n]+)
+    """ % BYTES_CLASSES,
+    re.VERBOSE,
+)
+
+
+def compile_line_scanner(re_pattern: re.Pattern) -> re.Pattern:
+    """
+    Строит из байтового выражения для одной строки выражение поиска строк по буферу.
+    Выражение начинается с символа перевода строки: поиск литерала выполняется
+    значительно быстрее, чем проверка привязки ^ в каждой позиции буфера.
+    Первая строка буфера перевода строки перед собой не имеет и проверяется отдельно.
+    """
+    return re.compile(rb"\n" + re_pattern.pattern, re_pattern.flags)
+
+
+SCAN_PATTERN_COMPONENTS_BYTES = compile_line_scanner(RE_PATTERN_COMPONENTS_BYTES)
+SCAN_PATTERN_LOADS_BYTES = compile_line_scanner(RE_PATTERN_LOADS_BYTES)
+
+COMPONENTS_BYTES_PATTERNS = (
+    RE_PATTERN_COMPONENTS_BYTES,
+    SCAN_PATTERN_COMPONENTS_BYTES,
+    RecordKind.COMPONENT,
+)
+LOADS_BYTES_PATTERNS = (
+    RE_PATTERN_LOADS_BYTES,
+    SCAN_PATTERN_LOADS_BYTES,
+    RecordKind.LOAD,
+)
+
+
+@functools.cache
+def get_section_titles_bytes() -> dict[bytes, ReportSection]:
+    """
+    Возвращает заголовки разделов в кодировке файлов отчётов.
+    Словарь строится при первом вызове, так как кодировка известна только во время работы.
+    """
+    return {
+        title.encode(c.ENCODING_FILE): section
+        for title, section in SECTION_TITLES.items()
+    }
+
+
+@functools.cache
+def get_section_candidate_patterns() -> tuple[re.Pattern, re.Pattern]:
+    """
+    Возвращает байтовые выражения поиска строк, которые могут быть заголовками
+    разделов или разделителями: для первой строки буфера и для остальных строк
+    (см. compile_line_scanner). Выражения проверяют только первый значащий байт строки,
+    поэтому поиск почти так же быстр, как поиск переводов строк.
+    Является ли строка-кандидат заголовком, проверяется отдельно.
+    """
+    first_bytes = {title[:1] for title in get_section_titles_bytes()}
+    first_bytes.add(SECTION_SEPARATOR.encode(c.ENCODING_FILE)[:1])
+    re_pattern = re.compile(
+        rb"[^\S\r\n]*["
+        + b"".join(re.escape(byte) for byte in sorted(first_bytes))
+        + rb"]"
+    )
+    return re_pattern, compile_line_scanner(re_pattern)
+
+
+class ParseEngine(Enum):
+    """Способ разбора файла отчёта."""
+
+    LINES = "lines"  # Построчное чтение декодированного текста
+    MMAP = "mmap"  # Поиск по байтам отображённого в память файла
+
+
 def parse_file(
-    file_path: str, compare_comps: bool, compare_loads: bool
-) -> dict[str, VS]:
+    file_path: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    engine: ParseEngine = ParseEngine.LINES,
+    stats: ParseStats | None = None,
+    progress: ProgressCallback | None = None,
+    digest: hashlib.blake2b | None = None,
+) -> RecordStore:
     """
-    Разбирает текстовый файл отчета и возвращает словарь компонентов и/или загруженных модулей.
+    Разбирает текстовый файл отчета и возвращает записи компонентов и/или загруженных модулей.
 
     Args:
         file_path (str): Путь к файлу
         compare_comps (bool): Признак того, что надо сравнивать компоненты
         compare_loads (bool): Признак того, что надо сравнивать загрузки
+        engine (ParseEngine): Способ разбора файла. Результаты способов совпадают,
+            параметр позволяет сравнивать их производительность.
+        stats (ParseStats | None): Счётчики разбора, заполняются при передаче объекта.
+            Построчный разбор классифицирует строки без регулярных выражений и
+            передаёт выражениям только неоднозначные строки; их число — stats.fallback.
+        progress (ProgressCallback | None): Получает число прочитанных байт файла
+            по ходу разбора. Исключение, возбуждённое в функции, прерывает разбор.
+        digest (hashlib.blake2b | None): Хэш, дополняемый прочитанными байтами файла,
+            чтобы не читать файл повторно для его вычисления (см. parse_cache).
 
     Returns:
-        dict[str, VS]: Ключ — название компонента/модуля, значение — объект VS.
+        RecordStore: Отображение «название компонента/модуля с префиксом вида → VS».
 
     Raises:
         Exception: Если возникает ошибка при чтении файла.
     """
-    result: dict[str, VS] = {}
-    with open(file_path, "r", encoding=c.ENCODING_FILE) as file:
+    if stats is None:
+        stats = ParseStats()
+
+    if engine is ParseEngine.MMAP:
+        return parse_file_mmap(
+            file_path, compare_comps, compare_loads, stats, progress, digest=digest
+        )
+
+    section_patterns = get_section_patterns(
+        compare_comps, compare_loads, RE_PATTERN_LOADS, RE_PATTERN_COMPONENTS
+    )
+    patterns = section_patterns[ReportSection.UNKNOWN]
+
+    result = RecordStore()
+    lines = skipped = fallback = matched = 0
+    # Номер строки, после которой сообщается о прочитанных байтах
+    progress_line = c.PARSE_PROGRESS_LINES if progress is not None else -1
+    with open_report(file_path, digest) as file:
         for line in file:
-            if compare_loads:
-                add_parsed_line_to_result(RE_PATTERN_LOADS, line, result)
+            lines += 1
+            if lines == progress_line:
+                progress(file.buffer.tell())
+                progress_line += c.PARSE_PROGRESS_LINES
+
+            # Заголовки и разделители переключают раздел, сами не разбираются
+            if line.startswith(SECTION_SEPARATOR):
+                patterns = section_patterns[ReportSection.UNKNOWN]
+                skipped += 1
+                continue
+            section = SECTION_TITLES.get(line.strip())
+            if section is not None:
+                patterns = section_patterns[section]
+                skipped += 1
+                continue
+            if not patterns:
+                skipped += 1
+                continue
+
+            tokens = line.split()
+            line_fallback = False
+            for re_pattern in patterns:
+                parsed = TOKENIZERS[re_pattern](tokens, line)
+                if parsed is LineClass.NO_MATCH:
+                    continue
+                if parsed is LineClass.UNCLASSIFIED:
+                    line_fallback = True
+                    matched += add_parsed_line_to_result(re_pattern, line, result)
+                    continue
+
+                name, stamp, size = parsed
+                result.add(PATTERN_KINDS[re_pattern], name, stamp, size)
+                matched += 1
+            fallback += line_fallback
 
-            if compare_comps:
-                add_parsed_line_to_result(RE_PATTERN_COMPONENTS, line, result)
+        if progress is not None:
+            progress(file.buffer.tell())
 
+    stats.lines = lines
+    stats.skipped = skipped
+    stats.fallback = fallback
+    stats.fast = lines - skipped - fallback
+    stats.matched = matched
+
+    result.release_index()
     return result
 
 
+class DigestReader(io.RawIOBase):
+    """Читает байты файла, дополняя ими хэш."""
+
+    def __init__(self, raw: io.RawIOBase, digest: hashlib.blake2b):
+        super().__init__()
+        self.raw = raw
+        self.digest = digest
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int | None:
+        size = self.raw.readinto(buffer)
+        if size:
+            self.digest.update(memoryview(buffer)[:size])
+        return size
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
+
+
+def open_report(file_path: str, digest: hashlib.blake2b | None) -> io.TextIOWrapper:
+    """
+    Открывает файл отчёта для чтения строк. При передаче digest прочитанные
+    байты файла дополняют хэш.
+    """
+    if digest is None:
+        return open(file_path, "r", encoding=c.ENCODING_FILE)
+    raw = DigestReader(open(file_path, "rb", buffering=0), digest)
+    return io.TextIOWrapper(io.BufferedReader(raw), encoding=c.ENCODING_FILE)
+
+
 def add_parsed_line_to_result(
     re_pattern: re.Pattern,
     line: str,
-    result: dict[str, VS],
-) -> None:
+    result: RecordStore,
+) -> bool:
+    """
+    Разбирает строку выражением и добавляет найденную запись в результат.
+    :return: Признак того, что строка соответствует выражению.
+    """
     match_result = re_pattern.match(line)
     if not match_result:
-        return
+        return False
 
     data = match_result.groupdict()
+    size = int("".join(data["size"].split()))
+    result.add(PATTERN_KINDS[re_pattern], data["name"], data["stamp"], size)
+    return True
 
-    prefix = PREFIX_LOAD if re_pattern is RE_PATTERN_LOADS else PREFIX_COMPONENT
 
-    name = prefix + data["name"]
-    stamp = data["stamp"]
-    size = int("".join(data["size"].split()))
-    parsed_state = VS(stamp=stamp, size=size)
-
-    if name not in result:
-        result[name] = parsed_state
-    elif result[name] != parsed_state:
-        raise ValueError(
-            f"{name} присутствует в исходном отчете с разными характеристиками: "
-            f"версия/дата: {result[name].stamp}, размер: {result[name].size}; "
-            f"версия/дата: {parsed_state.stamp}, размер: {parsed_state.size}"
+def parse_file_mmap(
+    file_path: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    stats: ParseStats | None = None,
+    progress: ProgressCallback | None = None,
+    paths: list[str] | None = None,
+    digest: hashlib.blake2b | None = None,
+) -> RecordStore:
+    """
+    Разбирает файл отчёта, отображая его в память и выполняя поиск
+    байтовыми регулярными выражениями по всему содержимому сразу.
+    Декодируются только найденные название и версия/дата (и путь, если он нужен).
+
+    Args:
+        file_path (str): Путь к файлу
+        compare_comps (bool): Признак того, что надо сравнивать компоненты
+        compare_loads (bool): Признак того, что надо сравнивать загрузки
+        stats (ParseStats | None): Счётчики разбора. Строки по отдельности
+            не просматриваются, поэтому заполняется только число найденных записей.
+        progress (ProgressCallback | None): Получает позицию конца каждого
+            разобранного раздела отчёта.
+        paths (list[str] | None): Пути к файлам записей в порядке строк результата,
+            заполняются при передаче списка (см. verify).
+        digest (hashlib.blake2b | None): Хэш, дополняемый содержимым файла.
+
+    Returns:
+        RecordStore: Записи, как и у parse_file.
+    """
+    result = RecordStore()
+    matched = 0
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return result  # Пустой файл нельзя отобразить в память
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if digest is not None:
+                digest.update(buffer)
+            section_patterns = get_section_patterns(
+                compare_comps,
+                compare_loads,
+                LOADS_BYTES_PATTERNS,
+                COMPONENTS_BYTES_PATTERNS,
+            )
+            for section, start, end in find_buffer_sections(buffer):
+                for re_pattern, scan_pattern, kind in section_patterns[section]:
+                    matched += add_buffer_matches_to_result(
+                        re_pattern,
+                        scan_pattern,
+                        kind,
+                        buffer,
+                        start,
+                        end,
+                        result,
+                        paths,
+                    )
+                if progress is not None:
+                    progress(end)
+
+    if stats is not None:
+        stats.matched = matched
+
+    result.release_index()
+    return result
+
+
+def find_buffer_sections(buffer: mmap.mmap) -> list[tuple[ReportSection, int, int]]:
+    """
+    Делит буфер на разделы по заголовкам и разделителям.
+    :param buffer: Содержимое файла отчёта.
+    :return: Список (раздел, начало, конец) в порядке следования разделов.
+             Началом раздела считается перевод строки, за которым идёт его первая строка.
+    """
+    titles = get_section_titles_bytes()
+    separator = SECTION_SEPARATOR.encode(c.ENCODING_FILE)
+    re_pattern, scan_pattern = get_section_candidate_patterns()
+
+    first_line = re_pattern.match(buffer)
+    candidates = [0] if first_line else []
+    candidates.extend(
+        match_result.start() + 1 for match_result in scan_pattern.finditer(buffer)
+    )
+    first_line = None  # Объект совпадения ссылается на буфер
+
+    sections = []
+    section, start = ReportSection.UNKNOWN, 0
+    for line_start in candidates:
+        line_end = buffer.find(b"\n", line_start)
+        if line_end == -1:
+            line_end = len(buffer)
+        line = buffer[line_start:line_end]
+
+        if line.startswith(separator):
+            next_section = ReportSection.UNKNOWN
+        else:
+            next_section = titles.get(line.strip())
+            if next_section is None:
+                continue
+
+        sections.append((section, start, line_start))
+        section, start = next_section, line_end
+    sections.append((section, start, len(buffer)))
+
+    return sections
+
+
+def add_buffer_matches_to_result(
+    re_pattern: re.Pattern,
+    scan_pattern: re.Pattern,
+    kind: RecordKind,
+    buffer: mmap.mmap,
+    start: int,
+    end: int,
+    result: RecordStore,
+    paths: list[str] | None = None,
+) -> int:
+    """
+    Добавляет в результат все строки участка буфера, соответствующие выражению.
+    :param re_pattern: Выражение для первой строки буфера.
+    :param scan_pattern: Выражение для поиска остальных строк (см. compile_line_scanner).
+    :param kind: Вид находимых записей.
+    :param start: Начало участка (см. find_buffer_sections).
+    :param end: Конец участка.
+    :param paths: Пути к файлам записей результата; дополняется путями добавленных записей.
+    :return: Число найденных строк.
+    """
+    encoding = c.ENCODING_FILE
+    matched = 0
+    first_line = re_pattern.match(buffer, 0, end) if start == 0 else None
+    matches = scan_pattern.finditer(buffer, start, end)
+    try:
+        for match_result in itertools.chain(
+            (first_line,) if first_line else (), matches
+        ):
+            name, stamp, size = match_result.group("name", "stamp", "size")
+            result.add(
+                kind,
+                name.decode(encoding),
+                stamp.decode(encoding),
+                int(size.translate(None, SPACE_BYTES)),
+            )
+            # Повтор записи в результат не добавляется, его путь тоже
+            if paths is not None and len(paths) < len(result):
+                paths.append(match_result.group("path").decode(encoding).rstrip())
+            matched += 1
+    finally:
+        # Объекты совпадений ссылаются на буфер. При исключении кадр функции
+        # остаётся в трассировке, и без очистки буфер нельзя было бы закрыть.
+        first_line = matches = match_result = None
+
+    return matched
+
+
+def get_file_size(file_path: str) -> int:
+    """Возвращает размер файла или 0, если его не удалось определить.
+    Ошибку доступа к файлу сообщит его разбор.
+    """
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def get_parse_executor_class(file_paths: Sequence[str]) -> type[Executor]:
+    """
+    Выбирает пул для одновременного разбора отчётов.
+    Разбор небольших файлов упирается в чтение (часто с сетевых дисков),
+    для него достаточно потоков. Разбор больших файлов упирается в процессор,
+    и потоки не выполняются одновременно из-за GIL: нужны процессы.
+    Запуск процессов дорог, поэтому они используются, только если
+    каждый из файлов не меньше c.PARSE_PROCESS_MIN_SIZE.
+    """
+    if min(map(get_file_size, file_paths)) >= c.PARSE_PROCESS_MIN_SIZE:
+        return ProcessPoolExecutor
+    return ThreadPoolExecutor
+
+
+def parse_reports(
+    file_paths: Sequence[str],
+    compare_comps: bool,
+    compare_loads: bool,
+    engine: ParseEngine = ParseEngine.LINES,
+    progress: Callable[[int, int], None] | None = None,
+    parse_function: Callable[..., RecordStore] = parse_file,
+    stats: list[ParseStats] | None = None,
+    parallel: bool = True,
+) -> list[RecordStore]:
+    """
+    Разбирает файлы отчётов одновременно.
+
+    Args:
+        file_paths (Sequence[str]): Пути к файлам отчётов
+        compare_comps (bool): Признак того, что надо сравнивать компоненты
+        compare_loads (bool): Признак того, что надо сравнивать загрузки
+        engine (ParseEngine): Способ разбора файлов
+        progress (Callable[[int, int], None] | None): Получает номер отчёта и число
+            прочитанных байт его файла. Исключение, возбуждённое в функции,
+            прерывает разбор. Отчёты, разбираемые в отдельных процессах, сообщают
+            о прочитанных байтах только по завершении разбора, до него функция
+            периодически получает прежнее значение.
+        parse_function (Callable[..., RecordStore]): Функция разбора отчёта
+            с параметрами parse_file, например parse_cache.parse_file_cached.
+        stats (list[ParseStats] | None): Счётчики разбора отчётов в порядке
+            file_paths. Счётчики отчётов, разобранных в отдельных процессах,
+            заменяются полученными из этих процессов.
+        parallel (bool): Признак одновременного разбора. Без него отчёты
+            разбираются по очереди в вызывающем потоке, например, чтобы разбор
+            попал в профиль cProfile этого потока.
+
+    Returns:
+        list[RecordStore]: Результаты parse_file в порядке file_paths.
+
+    Raises:
+        Exception: Ошибка разбора первого по порядку отчёта, разбор которого не удался.
+    """
+
+    def get_report_progress(index: int) -> ProgressCallback | None:
+        if progress is None:
+            return None
+        return functools.partial(progress, index)
+
+    def get_report_stats(index: int) -> ParseStats | None:
+        return None if stats is None else stats[index]
+
+    if len(file_paths) < 2 or not parallel:
+        return [
+            parse_function(
+                file_path,
+                compare_comps,
+                compare_loads,
+                engine,
+                stats=get_report_stats(index),
+                progress=get_report_progress(index),
+            )
+            for index, file_path in enumerate(file_paths)
+        ]
+
+    executor_class = get_parse_executor_class(file_paths)
+    executor = executor_class(max_workers=len(file_paths))
+    try:
+        if executor_class is ProcessPoolExecutor:
+            # Функции progress нельзя передать в другой процесс, а счётчики
+            # разбора возвращаются из процесса вместе с результатом
+            futures = [
+                executor.submit(
+                    parse_file_with_stats,
+                    parse_function,
+                    file_path,
+                    compare_comps,
+                    compare_loads,
+                    engine,
+                )
+                for file_path in file_paths
+            ]
+            if progress is not None:
+                wait_reports_progress(futures, file_paths, progress)
+            results = []
+            for index, future in enumerate(futures):
+                records, report_stats = future.result()
+                if stats is not None:
+                    stats[index] = report_stats
+                results.append(records)
+            return results
+        else:
+            futures = [
+                executor.submit(
+                    parse_function,
+                    file_path,
+                    compare_comps,
+                    compare_loads,
+                    engine,
+                    stats=get_report_stats(index),
+                    progress=get_report_progress(index),
+                )
+                for index, file_path in enumerate(file_paths)
+            ]
+        # Результаты и ошибки забираются по порядку отчётов, как при
+        # последовательном разборе
+        return [future.result() for future in futures]
+    finally:
+        # После ошибки или прерывания разбор остальных отчётов не дожидаемся
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_file_with_stats(
+    parse_function: Callable[..., RecordStore],
+    file_path: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    engine: ParseEngine,
+) -> tuple[RecordStore, ParseStats]:
+    """Выполняет parse_function и возвращает результат вместе со счётчиками разбора
+    (задание процесса разбора: объект счётчиков нельзя передать в другой процесс)."""
+    stats = ParseStats()
+    records = parse_function(file_path, compare_comps, compare_loads, engine, stats)
+    return records, stats
+
+
+def wait_reports_progress(
+    futures: list[Future],
+    file_paths: Sequence[str],
+    progress: Callable[[int, int], None],
+) -> None:
+    """
+    Дожидается разбора отчётов в отдельных процессах, сообщая о нём функции progress.
+    Функция вызывается не реже раза в c.PARSE_PROGRESS_INTERVAL секунд,
+    чтобы могла прервать ожидание.
+    """
+    positions = [0] * len(futures)
+    pending = set(futures)
+    while pending:
+        _, pending = wait(
+            pending, timeout=c.PARSE_PROGRESS_INTERVAL, return_when=FIRST_COMPLETED
         )
+        for index, future in enumerate(futures):
+            if future not in pending:
+                positions[index] = get_file_size(file_paths[index])
+            progress(index, positions[index])
 
 
 def compare(
-    records1: dict[str, VS], records2: dict[str, VS]
+    records1: Mapping[str, VS], records2: Mapping[str, VS]
 ) -> tuple[set[str], set[str], set[str]]:
     """
     Сравнивает два набора записей и возвращает различия.
@@ -130,3 +862,157 @@ def compare(
         k for k in records1.keys() & records2.keys() if records1[k] != records2[k]
     )
     return only_in_1, only_in_2, differences
+
+
+class DiffKind(Enum):
+    """Вид отличия записи отчётов. Порядок значений — порядок групп в таблице."""
+
+    ONLY_IN_1 = auto()  # Запись есть только в первом отчёте
+    ONLY_IN_2 = auto()  # Запись есть только во втором отчёте
+    DIFFERENT = auto()  # Запись есть в обоих отчётах, но её характеристики отличаются
+
+
+# Отличие: вид, название записи, её характеристики в первом и во втором отчёте
+DiffEntry = tuple[DiffKind, str, VS | None, VS | None]
+
+
+def merge_diff(
+    records1: Mapping[str, VS],
+    records2: Mapping[str, VS],
+    keys1: Sequence[str] | None = None,
+    keys2: Sequence[str] | None = None,
+) -> Iterator[DiffEntry]:
+    """
+    Сравнивает два набора записей за один проход по их отсортированным ключам.
+    Отличия выдаются в порядке отображения: записи только первого отчёта,
+    только второго и отличающиеся, каждая группа — по возрастанию названия.
+    Записи первой группы выдаются по ходу прохода, ключи двух других
+    накапливаются: отличий обычно намного меньше, чем записей.
+    В отличие от compare, не строятся множества ключей.
+    Результаты разбора (RecordStore) сравниваются по столбцам, см. merge_record_stores.
+
+    Args:
+        records1 (Mapping): Данные первого отчета.
+        records2 (Mapping): Данные второго отчета.
+        keys1 (Sequence[str] | None): Ключи records1 по возрастанию, если они уже
+            отсортированы; иначе сортируются здесь.
+        keys2 (Sequence[str] | None): То же для records2.
+
+    Yields:
+        DiffEntry: (вид, название, VS первого отчёта или None, VS второго или None).
+    """
+    if (
+        keys1 is None
+        and keys2 is None
+        and isinstance(records1, RecordStore)
+        and isinstance(records2, RecordStore)
+    ):
+        yield from merge_record_stores(records1, records2)
+        return
+
+    if keys1 is None:
+        keys1 = sorted(records1)
+    if keys2 is None:
+        keys2 = sorted(records2)
+
+    only_in_2: list[str] = []
+    differences: list[str] = []
+    count1, count2 = len(keys1), len(keys2)
+    index1 = index2 = 0
+    while index1 < count1 and index2 < count2:
+        key1 = keys1[index1]
+        key2 = keys2[index2]
+        if key1 == key2:
+            # Поля сравниваются напрямую: это быстрее сравнения объектов VS
+            state1 = records1[key1]
+            state2 = records2[key2]
+            if state1.size != state2.size or state1.stamp != state2.stamp:
+                differences.append(key1)
+            index1 += 1
+            index2 += 1
+        elif key1 < key2:
+            yield DiffKind.ONLY_IN_1, key1, records1[key1], None
+            index1 += 1
+        else:
+            only_in_2.append(key2)
+            index2 += 1
+
+    for key1 in itertools.islice(keys1, index1, None):
+        yield DiffKind.ONLY_IN_1, key1, records1[key1], None
+    only_in_2.extend(itertools.islice(keys2, index2, None))
+
+    for key2 in only_in_2:
+        yield DiffKind.ONLY_IN_2, key2, None, records2[key2]
+    for key in differences:
+        yield DiffKind.DIFFERENT, key, records1[key], records2[key]
+
+
+def merge_record_stores(
+    store1: RecordStore, store2: RecordStore
+) -> Iterator[DiffEntry]:
+    """
+    То же, что merge_diff, для результатов разбора: проход идёт по номерам строк
+    в порядке ключей (см. RecordStore.get_sorted_rows), записи сравниваются
+    по столбцам. Ключи и объекты VS создаются только для отличий.
+    """
+    rows1 = store1.get_sorted_rows()
+    rows2 = store2.get_sorted_rows()
+    kinds1, names1, stamp_ids1, sizes1 = (
+        store1.kinds,
+        store1.names,
+        store1.stamp_ids,
+        store1.sizes,
+    )
+    kinds2, names2, stamp_ids2, sizes2 = (
+        store2.kinds,
+        store2.names,
+        store2.stamp_ids,
+        store2.sizes,
+    )
+    stamps1, stamps2 = store1.stamps, store2.stamps
+
+    only_in_2: list[int] = []
+    differences: list[tuple[int, int]] = []
+    count1, count2 = len(rows1), len(rows2)
+    index1 = index2 = 0
+    while index1 < count1 and index2 < count2:
+        row1 = rows1[index1]
+        row2 = rows2[index2]
+        kind1 = kinds1[row1]
+        kind2 = kinds2[row2]
+        if kind1 == kind2:
+            name1 = names1[row1]
+            name2 = names2[row2]
+            is_less = name1 < name2
+            is_equal = name1 == name2
+        else:
+            is_less = kind1 < kind2
+            is_equal = False
+        if is_equal:
+            if (
+                sizes1[row1] != sizes2[row2]
+                or stamps1[stamp_ids1[row1]] != stamps2[stamp_ids2[row2]]
+            ):
+                differences.append((row1, row2))
+            index1 += 1
+            index2 += 1
+        elif is_less:
+            yield DiffKind.ONLY_IN_1, store1.get_key(row1), store1.get_state(row1), None
+            index1 += 1
+        else:
+            only_in_2.append(row2)
+            index2 += 1
+
+    for row1 in itertools.islice(rows1, index1, None):
+        yield DiffKind.ONLY_IN_1, store1.get_key(row1), store1.get_state(row1), None
+    only_in_2.extend(itertools.islice(rows2, index2, None))
+
+    for row2 in only_in_2:
+        yield DiffKind.ONLY_IN_2, store2.get_key(row2), None, store2.get_state(row2)
+    for row1, row2 in differences:
+        yield (
+            DiffKind.DIFFERENT,
+            store1.get_key(row1),
+            store1.get_state(row1),
+            store2.get_state(row2),
+        )
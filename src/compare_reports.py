@@ -5,14 +5,16 @@
 
 from datetime import datetime
 import sys
-import csv
+import multiprocessing
 from pathlib import Path
 from enum import Enum, auto
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
-from PyQt6 import QtWidgets, uic
+from PyQt6 import QtWidgets
 from PyQt6 import QtCore
-from PyQt6.QtCore import QSortFilterProxyModel, Qt
-from PyQt6.QtGui import QStandardItemModel, QStandardItem, QAction
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QAction, QCloseEvent
 from PyQt6.QtWidgets import (
     QFileDialog,
     QLabel,
@@ -23,13 +25,37 @@ from PyQt6.QtWidgets import (
     QTableView,
     QCheckBox,
     QToolButton,
+    QProgressBar,
 )
 
-from src.compare import parse_file, compare, VS
+from src.compare_worker import (
+    CompareResult,
+    CompareWorker,
+    ExportWorker,
+    MatrixWorker,
+    UpdateWorker,
+    VerifyWorker,
+)
+from src.compare import DiffKind
+from src.diff_model import DiffFilterProxyModel, DiffTableModel
+from src.export import (
+    DiffRow,
+    format_value,
+    make_matrix_header,
+    make_matrix_rows,
+)
+from src.filter_index import RowFilter
+from src.metrics import StageTimer, append_log
+from src.record_store import RecordKind
 from src.constants import Constant as c
 import src.functions as f
-from src.tunes import Tunes, DESCRIPTION_TUNES
+from src.tunes import CheckStateValue, Tunes, DESCRIPTION_TUNES
 from src.customtextbrowser import CustomTextBrowser
+from src.ui_loader import load_ui
+
+if TYPE_CHECKING:
+    from src.report_matrix import ReportMatrix
+    from src.verify import FileVersionCache, VerifyResult
 
 
 class DialogueState(Enum):
@@ -43,6 +69,10 @@ class MyWindow(QtWidgets.QMainWindow):
 
     # Явные аннотации типов для виджетов из .ui-файла
     actionAbout: QAction
+    actionCompareMany: QAction
+    actionVerifyInstall: QAction
+    actionWatchReports: QAction
+    actionSaveXlsx: QAction
     btnBox: QDialogButtonBox
     btnFile1: QPushButton
     btnFile2: QPushButton
@@ -55,11 +85,13 @@ class MyWindow(QtWidgets.QMainWindow):
     tblResult: QTableView
     btnOutputFolder: QToolButton
     txtOutputFolder: CustomTextBrowser
+    progressBar: QProgressBar
+    btnCancelCompare: QPushButton
 
     # 1. init
     def __init__(self) -> None:
         super().__init__()
-        uic.loadUi(f.get_file_ui_name(), self)  # Загрузка интерфейса из .ui файла
+        load_ui(self)  # Создание виджетов интерфейса (см. src.ui_loader)
 
         # Переменные объекта
         self.dialogue_state: DialogueState = DialogueState.NORMAL
@@ -70,11 +102,35 @@ class MyWindow(QtWidgets.QMainWindow):
         # Инициализация стилей и состояния
         self.btn_file_default_style = self.btnFile1.styleSheet()
         self.was_comparison = False  # Флаг завершения выполнения сравнения отчётов
+        # Результат выполняемого сравнения сохраняется по его завершении
+        self.save_after_comparison = False
+        self.worker: CompareWorker | None = None  # Выполняемое сравнение отчётов
+        self.export_worker: ExportWorker | None = None  # Выполняемое сохранение
+        # Шапка таблицы и ширины столбцов (кроме первого) результата сравнения
+        self.header_columns: list[str] = c.LIST_HEADER_COLUMNS
+        self.column_widths: list[int] = c.LIST_COLUMN_WIDTHS
+        self.message_shown = False  # В таблице сообщение, а не строки результата
+        # Замеры этапов последнего сравнения (см. src.metrics)
+        self.timer = StageTimer()
+
+        # Слежение за изменением сравненных отчётов
+        self.compared_paths: list[str] = []  # Пути к сравненным отчётам
+        self.last_result: CompareResult | None = None  # Результат их сравнения
+        self.changed_paths: set[str] = set()  # Изменённые с тех пор отчёты
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        # Повторное сравнение откладывается, пока отчёт записывается
+        self.watch_timer = QtCore.QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.setInterval(c.WATCH_DELAY_MS)
+
+        # Версии файлов установки, прочитанные при сверке с ней отчётов
+        # (создаётся при первой сверке)
+        self.version_cache: "FileVersionCache | None" = None
 
         # Настройка модели таблицы
-        self.model = QStandardItemModel()
-        # Настраиваем прокси-модель для числовой сортировки
-        self.proxy = QSortFilterProxyModel()
+        self.model = DiffTableModel()
+        # Прокси-модель фильтра; сортировку по значениям выполняет модель
+        self.proxy = DiffFilterProxyModel()
         self.setup_model()
 
         # Настройка соединений и интерфейса
@@ -87,8 +143,6 @@ class MyWindow(QtWidgets.QMainWindow):
     # 2. Настройка окна
     def setup_model(self) -> None:
         self.proxy.setSourceModel(self.model)
-        # Сортируем по данным, имеющим UserRole
-        self.proxy.setSortRole(Qt.ItemDataRole.UserRole)
         self.tblResult.setModel(self.proxy)
 
     def setup_table_view(self) -> None:
@@ -103,15 +157,16 @@ class MyWindow(QtWidgets.QMainWindow):
         header.setMinimumSectionSize(55)
         header.setStretchLastSection(False)
 
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        if len(self.header_columns) > len(c.LIST_HEADER_COLUMNS):
+            # При сравнении нескольких отчётов таблица шире окна
+            header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+            self.tblResult.setColumnWidth(0, c.MATRIX_NAME_COLUMN_WIDTH)
+        else:
+            header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
 
-        for col in (1, 2, 3, 4):
+        for col, width in enumerate(self.column_widths, start=1):
             header.setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
-
-        self.tblResult.setColumnWidth(1, 105)
-        self.tblResult.setColumnWidth(2, 105)
-        self.tblResult.setColumnWidth(3, 80)
-        self.tblResult.setColumnWidth(4, 80)
+            self.tblResult.setColumnWidth(col, width)
 
         f.set_bold(header)
 
@@ -136,6 +191,7 @@ class MyWindow(QtWidgets.QMainWindow):
 
         # Инициализируем значения виджетов
         self.init_widgets()
+        self.init_filter_widgets()
 
     def setup_connections(self) -> None:
         """
@@ -155,8 +211,19 @@ class MyWindow(QtWidgets.QMainWindow):
         self.txtOutputFolder.connect(self.set_saver_folder)
 
         self.btnBox.clicked.connect(self.handle_button_click)
+        self.actionCompareMany.triggered.connect(self.compare_many_reports)
+        self.actionVerifyInstall.triggered.connect(self.verify_installation)
+        self.actionWatchReports.toggled.connect(self.set_watching)
+        self.actionSaveXlsx.toggled.connect(self.on_save_xlsx_toggled)
+        self.watcher.fileChanged.connect(self.on_report_file_changed)
+        self.watch_timer.timeout.connect(self.update_changed_reports)
+        self.btnCancelCompare.clicked.connect(self.cancel_comparison)
         self.actionAbout.triggered.connect(self.show_about_dialog)
 
+        self.editFilter.textChanged.connect(self.apply_filter)
+        self.comboFilterKind.currentIndexChanged.connect(self.apply_filter)
+        self.comboFilterDiff.currentIndexChanged.connect(self.apply_filter)
+
     def init_widgets(self) -> None:
         """Устанавливает значения видимых частей виджетов"""
         self.lblFilePath1.setText("")
@@ -167,6 +234,7 @@ class MyWindow(QtWidgets.QMainWindow):
         self.init_checkbox(self.checkBoxSuperFast, c.CHECK_BOX_SUPER_FAST)
         self.init_checkbox(self.checkBoxComps, c.CHECK_BOX_COMPS)
         self.init_checkbox(self.checkBoxLoads, c.CHECK_BOX_LOADS)
+        self.actionSaveXlsx.setChecked(self.tunes.is_checked(c.ACTION_SAVE_XLSX))
 
     def init_checkbox(self, checkbox, name_value):
         checkbox.setCheckState(
@@ -256,15 +324,27 @@ class MyWindow(QtWidgets.QMainWindow):
         match self.btnBox.standardButton(button):
             case QDialogButtonBox.StandardButton.Ok:
                 self.compare_reports()
-                f.set_focus(self.btnBox.button(QDialogButtonBox.StandardButton.Save))
             case QDialogButtonBox.StandardButton.Save:
                 self.save_results()
                 f.set_focus(self.btnBox.button(QDialogButtonBox.StandardButton.Cancel))
             case QDialogButtonBox.StandardButton.Cancel:
+                self.stop_comparison()
+                self.tunes.flush()
                 QtWidgets.QApplication.quit()
 
-    def compare_reports(self) -> None:
-        """Разбор и сравнение файлов отчётов."""
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """Перед закрытием окна дожидается прерывания выполняемого сравнения
+        и записывает отложенные изменения настроек."""
+        self.stop_comparison()
+        self.tunes.flush()
+        super().closeEvent(event)
+
+    def compare_reports(self) -> CompareWorker | None:
+        """Разбор и сравнение файлов отчётов.
+        Сравнение выполняется в отдельном потоке, по его завершении
+        заселяется модель.
+        :return: Поток сравнения или None, если сравнение не запущено.
+        """
         self.model.clear()
 
         # Проверка. Выбраны ли файлы отчётов.
@@ -274,8 +354,9 @@ class MyWindow(QtWidgets.QMainWindow):
         if not self.lblFilePath2.text():
             files_selected = f.highlight_button_if_no_file(self.btnFile2)
 
-        if files_selected:
-            self.sync_model_with_report_diffs()
+        if not files_selected:
+            return None
+        return self.sync_model_with_report_diffs()
 
     def on_checkbox_fast_state_change(self):
         """
@@ -329,35 +410,141 @@ class MyWindow(QtWidgets.QMainWindow):
             write,
         )
 
-    def save_results(self) -> None:
-        """Обработчик кнопки 'Сохранить'. Записывает модель в CSV файл и выдаёт
-        предупреждение, если сравнение отчётов не выполнено.
+    def on_save_xlsx_toggled(self, checked: bool) -> None:
+        """Обработчик пункта меню 'Сохранять результат в книгу Excel (XLSX)'."""
+        state = CheckStateValue.CHECKED if checked else CheckStateValue.UNCHECKED
+        self.tunes.put_tune(c.ACTION_SAVE_XLSX, state.value, write=True)
+
+    def save_results(self) -> ExportWorker | None:
+        """Обработчик кнопки 'Сохранить'. Запускает запись результата сравнения
+        в CSV файл или книгу Excel в отдельном потоке и выдаёт предупреждение,
+        если сравнение отчётов не выполнено.
+        :return: Поток записи или None, если сохранять нечего.
         """
         if not self.was_comparison:
             QMessageBox.warning(self, c.TITLE_RESAVE, c.TEXT_RESAVE)
-            return
+            return None
+
+        # Строки пишутся в порядке, в котором они отсортированы в таблице,
+        # при заданном фильтре — только показываемые
+        self.export_worker = ExportWorker(
+            self.get_result_file_path(),
+            self.model.get_rows(self.proxy.get_source_rows()),
+            self.header_columns,
+            self,
+            timer=self.timer,
+        )
+        self.export_worker.exported.connect(self.on_results_saved)
+        self.export_worker.failed.connect(self.on_save_failed)
+        self.export_worker.finished.connect(self.export_worker.deleteLater)
+
+        self.was_comparison = False  # Повторно этот результат не сохраняется
+        self.export_worker.start()
+        return self.export_worker
+
+    def on_results_saved(self, file_path: str, size: int, seconds: float) -> None:
+        if self.export_worker is not None:
+            self.show_metrics(
+                self.export_worker.timer, "save", file=file_path, size=size
+            )
+        self.export_worker = None
+        wait = self.get_wait_ms()
+        f.show_message(
+            self,
+            f"Отчёт сохранён по пути\n{file_path}\n"
+            f"{format_value(size)} байт за {seconds:.2f} с",
+            wait=wait,
+        )
 
-        try:
-            # Запись данных модели в csv филе
-            file_path = self.get_result_file_path()
+    def on_save_failed(self, error: str) -> None:
+        self.export_worker = None
+        self.was_comparison = True  # Результат не сохранён, его можно сохранить снова
+        QMessageBox.critical(self, c.TITLE_ERROR_FILE, f"{c.TEXT_ERROR_FILE}\n{error}")
 
-            with open(file_path, "w", newline="", encoding="utf-8-sig") as csv_file:
-                writer = csv.writer(csv_file, delimiter=";")
-                writer.writerow(c.LIST_HEADER_COLUMNS)
-                self.write_model_to_csv(writer)
+    # 5. Сравнение и заполнение таблицы
+    def sync_model_with_report_diffs(self) -> CompareWorker | None:
+        """Запускает поток, получающий нужные записи из отчётов и сравнивающий их.
+        Модель заселяется отличиями в отчётах по сигналу потока о завершении.
+        :return: Запущенный поток или None, если сравнивать нечего.
+        """
+        self.compared_paths = [self.lblFilePath1.text(), self.lblFilePath2.text()]
+        self.forget_compared_reports()
+        return self.start_comparison(
+            CompareWorker, self.compared_paths, self.on_comparison_finished
+        )
 
-        except Exception as e:
-            QMessageBox.critical(self, c.TITLE_ERROR_FILE, f"{c.TEXT_ERROR_FILE}\n{e}")
-            return
+    def compare_many_reports(self) -> CompareWorker | None:
+        """Обработчик пункта меню 'Сравнить несколько отчётов'.
+        Запрашивает файлы отчётов и запускает их сравнение.
+        :return: Запущенный поток или None, если сравнение не запущено.
+        """
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            c.TITLE_OPEN_MANY_FILES,
+            self.tunes.get_str_tune(c.SAVER_FOLDER),
+            c.TYPES_FILES_OPEN,
+            options=QFileDialog.Option.DontUseNativeDialog,
+        )
+        if not file_paths:
+            return None
+        if len(file_paths) < 2:
+            QMessageBox.warning(self, c.TITLE_NO_COMP, c.TEXT_FEW_FILES)
+            return None
 
-        self.was_comparison = False
-        wait = self.get_wait_ms()
-        f.show_message(self, f"Отчёт сохранён по пути\n{file_path}", wait=wait)
+        self.model.clear()
+        self.forget_compared_reports()
+        return self.start_comparison(
+            MatrixWorker, file_paths, self.on_matrix_comparison_finished
+        )
 
-    # 5. Сравнение и заполнение таблицы
-    def sync_model_with_report_diffs(self) -> None:
-        """Получает нужные записи из отчётов, инициирует их
-        сравнение и заселение модели отличиями в отчётах
+    def verify_installation(self) -> CompareWorker | None:
+        """Обработчик пункта меню 'Сверить отчёт с каталогом установки'.
+        Запрашивает файл отчёта и каталог установки и запускает их сверку.
+        :return: Запущенный поток или None, если сверка не запущена.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            c.TITLE_OPEN_VERIFY_REPORT,
+            self.tunes.get_str_tune(c.SAVER_FOLDER),
+            c.TYPES_FILES_OPEN,
+            options=QFileDialog.Option.DontUseNativeDialog,
+        )
+        if not file_path:
+            return None
+        install_root = QFileDialog.getExistingDirectory(
+            self, c.TITLE_SET_INSTALL_ROOT, str(Path(file_path).parent)
+        )
+        if not install_root:
+            return None
+
+        if self.version_cache is None:
+            from src.verify import FileVersionCache
+
+            self.version_cache = FileVersionCache()
+        self.model.clear()
+        self.forget_compared_reports()
+        return self.start_comparison(
+            VerifyWorker,
+            [file_path],
+            self.on_verify_finished,
+            install_root=install_root,
+            version_cache=self.version_cache,
+        )
+
+    def start_comparison(
+        self,
+        worker_class: type[CompareWorker],
+        file_paths: list[str],
+        on_finished,
+        **worker_options,
+    ) -> CompareWorker | None:
+        """
+        Запускает поток сравнения отчётов.
+        :param worker_class: Класс потока.
+        :param file_paths: Пути к файлам отчётов.
+        :param on_finished: Обработчик результата сравнения.
+        :param worker_options: Дополнительные параметры потока (см. UpdateWorker).
+        :return: Запущенный поток или None, если не выбрано, что сравнивать.
         """
         compare_comps = self.tunes.is_checked(c.CHECK_BOX_COMPS)
         compare_loads = self.tunes.is_checked(c.CHECK_BOX_LOADS)
@@ -365,144 +552,255 @@ class MyWindow(QtWidgets.QMainWindow):
         if not compare_comps and not compare_loads:
             # Не выбран ни один из вариантов сравнения
             QMessageBox.warning(self, c.TITLE_NO_COMP, c.TEXT_NO_COMP)
-            return
+            return None
 
-        try:
-            records1 = parse_file(
-                self.lblFilePath1.text(),
-                compare_comps,
-                compare_loads,
-            )
-            records2 = parse_file(
-                self.lblFilePath2.text(),
-                compare_comps,
-                compare_loads,
+        self.worker = worker_class(
+            file_paths, compare_comps, compare_loads, self, **worker_options
+        )
+        self.worker.progress.connect(self.progressBar.setValue)
+        self.worker.compared.connect(on_finished)
+        self.worker.failed.connect(self.on_comparison_failed)
+        self.worker.cancelled.connect(self.end_comparison)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.timer = self.worker.timer
+
+        self.set_comparison_running(True)
+        self.worker.start()
+        return self.worker
+
+    def set_comparison_running(self, running: bool) -> None:
+        """Показывает ход сравнения и блокирует кнопки на время его выполнения."""
+        self.progressBar.setValue(0)
+        self.progressBar.setVisible(running)
+        self.btnCancelCompare.setVisible(running)
+        self.actionCompareMany.setEnabled(not running)
+        self.actionVerifyInstall.setEnabled(not running)
+        for btn_type in (
+            QDialogButtonBox.StandardButton.Ok,
+            QDialogButtonBox.StandardButton.Save,
+        ):
+            button = self.btnBox.button(btn_type)
+            if button:
+                button.setEnabled(not running)
+
+    def cancel_comparison(self) -> None:
+        """Обработчик кнопки 'Прервать'."""
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def stop_comparison(self) -> None:
+        """Прерывает выполняемое сравнение и дожидается завершения его потока
+        и потока сохранения результата."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        if self.export_worker is not None:
+            self.export_worker.wait()
+
+    def end_comparison(self) -> None:
+        """Возвращает интерфейс в исходное состояние после завершения сравнения."""
+        self.worker = None
+        self.save_after_comparison = False
+        self.set_comparison_running(False)
+
+    def on_comparison_finished(self, result: CompareResult) -> None:
+        """Заселяет модель результатом сравнения, полученным от потока."""
+        save_results = self.save_after_comparison
+        self.end_comparison()
+        self.populate_model(result.rows)
+        self.show_metrics(
+            self.timer, "compare", reports=self.compared_paths, rows=len(result.rows)
+        )
+        self.last_result = result
+        self.watch_reports()
+        self.was_comparison = True
+        f.set_focus(self.btnBox.button(QDialogButtonBox.StandardButton.Save))
+        if save_results:
+            self.finish_super_fast_dialogue()
+
+    def on_matrix_comparison_finished(self, matrix: "ReportMatrix") -> None:
+        """Заселяет модель результатом сравнения нескольких отчётов."""
+        self.end_comparison()
+        self.header_columns = make_matrix_header(matrix.report_names)
+        self.column_widths = c.LIST_MATRIX_COLUMN_WIDTHS * len(matrix.report_names)
+        # Столбцы версий — первые в паре столбцов каждого отчёта
+        self.show_rows(make_matrix_rows(matrix), range(1, len(self.header_columns), 2))
+        self.show_metrics(self.timer, "matrix", reports=matrix.report_names)
+        self.was_comparison = True
+        f.set_focus(self.btnBox.button(QDialogButtonBox.StandardButton.Save))
+
+    def on_verify_finished(self, result: "VerifyResult") -> None:
+        """Заселяет модель результатом сверки отчёта с каталогом установки."""
+        self.end_comparison()
+        self.header_columns = c.LIST_VERIFY_HEADER_COLUMNS
+        self.column_widths = c.LIST_COLUMN_WIDTHS
+        self.show_rows(result.rows, c.STAMP_COLUMNS, c.STAMP_COLUMNS)
+        self.show_metrics(self.timer, "verify", rows=len(result.rows))
+        self.was_comparison = True
+        if result.skipped:
+            f.show_message(
+                self,
+                f"{c.TEXT_VERIFY_SKIPPED} {format_value(result.skipped)}",
+                wait=self.get_wait_ms(),
             )
-            only_in_1, only_in_2, differences = compare(records1, records2)
-
-            self.populate_model(records1, records2, only_in_1, only_in_2, differences)
-            self.was_comparison = True
-        except Exception as e:
-            QMessageBox.critical(self, c.TITLE_ERROR_FILE, f"{c.TEXT_ERROR_FILE}\n{e}")
-
-    def make_only_in_first_row(
-        self, item: str, records1: dict[str, VS]
-    ) -> list[str | int]:
-        record = records1[item]
-        return [item, record.stamp, "", record.size, ""]
-
-    def make_only_in_second_row(
-        self, item: str, records2: dict[str, VS]
-    ) -> list[str | int]:
-        record = records2[item]
-        return [item, "", record.stamp, "", record.size]
-
-    def make_difference_row(
-        self,
-        item: str,
-        records1: dict[str, VS],
-        records2: dict[str, VS],
-    ) -> list[str | int]:
-        record1 = records1[item]
-        record2 = records2[item]
-        return [item, record1.stamp, record2.stamp, record1.size, record2.size]
-
-    def populate_model(
-        self,
-        records1: dict[str, VS],
-        records2: dict[str, VS],
-        only_in_1: set[str],
-        only_in_2: set[str],
-        differences: set[str],
-    ) -> None:
+        f.set_focus(self.btnBox.button(QDialogButtonBox.StandardButton.Save))
+
+    def on_comparison_failed(self, error: str) -> None:
+        self.end_comparison()
+        QMessageBox.critical(self, c.TITLE_ERROR_FILE, f"{c.TEXT_ERROR_FILE}\n{error}")
+
+    def populate_model(self, rows: list[DiffRow]) -> None:
         """
-        Заселяет модель результатами сравнения отчётов.
-        Records 1 и 2 - Словари, содержащие информацию о компонентах.
-                        Ключ — имя компонента. Значение — характеристики компонента.
-        :param records1: Словарь первого отчёта.
-        :param records2: Словарь второго отчёта.
-        Остальные параметры — множества, в которых находятся ключи словарей с рассогласованиями между отчётами.
-        :param only_in_1: Компоненты есть только в первом отчёте.
-        :param only_in_2: Компоненты есть только во втором отчёте.
-        :param differences: Компоненты есть в обоих отчётах, но их характеристики отличаются.
+        Заселяет модель результатами сравнения двух отчётов.
+        :param rows: Строки таблицы отличий в порядке отображения: компоненты
+                     только первого отчёта, только второго, с отличающимися
+                     характеристиками (см. merge_diff).
         :return: None
         """
-        # Добавление данных в модель
-        for item in sorted(only_in_1):
-            self.add_data_to_model(self.make_only_in_first_row(item, records1))
-
-        for item in sorted(only_in_2):
-            self.add_data_to_model(self.make_only_in_second_row(item, records2))
-
-        for item in sorted(differences):
-            self.add_data_to_model(self.make_difference_row(item, records1, records2))
+        self.header_columns = c.LIST_HEADER_COLUMNS
+        self.column_widths = c.LIST_COLUMN_WIDTHS
+        self.show_rows(rows, c.STAMP_COLUMNS, c.STAMP_COLUMNS)
 
-        self.check_empty_data()
-
-    def add_data_to_model(self, items: list[str | int]) -> None:
+    def show_rows(
+        self,
+        rows: list[DiffRow],
+        stamp_columns: Sequence[int] = (),
+        newer_columns: tuple[int, int] | None = None,
+    ) -> None:
         """
-        Добавляет строку данных в модель таблицы
-        :param items: Список элементов столбцов новой строки.
-                      Элементами могут быть как строки, так и целые числа.
+        Заселяет модель строками результата сравнения с шапкой self.header_columns.
+        Если строк нет, выдаёт в модель информационное сообщение.
+        :param rows: Строки таблицы. Элементами могут быть как строки, так и целые числа.
+        :param stamp_columns: Столбцы версий и дат (см. DiffTableModel.set_rows).
+        :param newer_columns: Сравниваемые столбцы версий двух отчётов.
         :return: None
         """
-        row_items = []
-        for value in items:
-            item = QStandardItem()
-            item.setData(value, Qt.ItemDataRole.UserRole)
-
-            if isinstance(value, int):
-                item.setTextAlignment(
-                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        self.tblResult.clearSpans()
+        self.message_shown = not rows
+        with self.timer.span("populate_model"):
+            if rows:
+                self.model.set_rows(
+                    rows, self.header_columns, stamp_columns, newer_columns
                 )
-                display_value = f"{value:,}".replace(",", "'")
             else:
-                item.setTextAlignment(
-                    Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+                self.model.set_rows(
+                    [[c.TEXT_SUCCESSFUL_COMPARISON]], self.header_columns
                 )
-                display_value = str(value)
+            self.update_filter_widgets(newer_columns is not None)
+        if not rows:
+            self.tblResult.setSpan(0, 0, 1, len(self.header_columns))
+        with self.timer.span("header"):
+            self.setup_table_view()
+
+    def show_metrics(self, timer: StageTimer, event: str, **fields: object) -> None:
+        """Показывает замеры этапов в строке состояния и дописывает их в журнал."""
+        self.statusBar().showMessage(timer.format_summary())
+        append_log(timer.to_record(event, **fields))
+
+    # 6. Файл результата (CSV или XLSX)
+    def get_result_file_path(self) -> Path:
+        output_folder = Path(self.tunes.get_str_tune(c.SAVER_FOLDER))
+        time_stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        suffix = ".csv"
+        if self.tunes.is_checked(c.ACTION_SAVE_XLSX):
+            suffix = c.XLSX_SUFFIX
+        file_name = f"compare_{time_stamp}{suffix}"
 
-            item.setData(display_value, Qt.ItemDataRole.DisplayRole)
-            row_items.append(item)
-        self.model.appendRow(row_items)
+        return output_folder / file_name
+
+    # 7. Слежение за изменением отчётов
+    def set_watching(self, watching: bool) -> None:
+        """Обработчик пункта меню 'Следить за изменением отчётов'."""
+        self.changed_paths.clear()
+        self.watch_timer.stop()
+        self.watch_reports()
 
-    def check_empty_data(self) -> None:
+    def watch_reports(self) -> None:
         """
-        Проверяет заселена ли модель и если не заселена, выдаёт информационное сообщение в модель.
-        :return: None
+        Следит за файлами сравненных отчётов, если слежение включено
+        и результат их сравнения есть в таблице.
+        Файл, записанный заново (удалён и создан), исключается из слежения
+        QFileSystemWatcher, поэтому список файлов устанавливается заново.
         """
-        if not self.model.rowCount():
-            self.add_data_to_model([c.TEXT_SUCCESSFUL_COMPARISON])
-            self.tblResult.setSpan(0, 0, 1, len(c.LIST_HEADER_COLUMNS))
-        self.setup_model_headers()  # Обновление заголовков
+        watched = self.watcher.files()
+        if watched:
+            self.watcher.removePaths(watched)
+        if self.actionWatchReports.isChecked() and self.last_result is not None:
+            self.watcher.addPaths(self.compared_paths)
 
-    def setup_model_headers(self) -> None:
-        """Устанавливает шапки в таблице модели"""
-        self.model.setHorizontalHeaderLabels(c.LIST_HEADER_COLUMNS)
-        self.setup_table_view()
+    def forget_compared_reports(self) -> None:
+        """Прекращает слежение за отчётами: их результат заменяется другим."""
+        self.last_result = None
+        self.changed_paths.clear()
+        self.watch_timer.stop()
+        self.watch_reports()
 
-    # 6. CSV
-    def get_result_file_path(self) -> Path:
-        output_folder = Path(self.tunes.get_str_tune(c.SAVER_FOLDER))
-        time_stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        file_name = f"compare_{time_stamp}.csv"
-
-        return output_folder / file_name
+    def on_report_file_changed(self, file_path: str) -> None:
+        """
+        Запоминает изменённый отчёт. Сравнение откладывается, пока файл
+        изменяется: отчёт записывается частями.
+        """
+        self.changed_paths.add(file_path)
+        self.watch_timer.start()
 
-    def write_model_to_csv(self, writer) -> None:
+    def update_changed_reports(self) -> CompareWorker | None:
         """
-        Извлекает данные из модели и с помощью объекта writer записывает их в csv файл.
-        :param writer:
-        :return: None
+        Повторно сравнивает отчёты после изменения одного или обоих.
+        Если изменился один отчёт, разбирается только он.
+        :return: Запущенный поток или None, если сравнение отложено или не нужно.
         """
-        for row in range(self.model.rowCount()):
-            csv_row = []
-            for col in range(self.model.columnCount()):
-                index = self.model.index(row, col)
-                csv_row.append(self.model.data(index))
-            writer.writerow(csv_row)
+        if self.last_result is None or not self.changed_paths:
+            return None
+        if self.worker is not None or not all(
+            Path(file_path).exists() for file_path in self.changed_paths
+        ):
+            # Выполняется другое сравнение или отчёт ещё не записан заново
+            self.watch_timer.start()
+            return None
+
+        self.watch_reports()
+        changed = [
+            index
+            for index, file_path in enumerate(self.compared_paths)
+            if file_path in self.changed_paths
+        ]
+        self.changed_paths.clear()
+        # Признаки сравнения могли измениться после прежнего сравнения:
+        # тогда записи неизменённого отчёта разобраны с другими признаками
+        if len(changed) == 1 and self.is_same_compare_options(self.last_result):
+            return self.start_comparison(
+                UpdateWorker,
+                [self.compared_paths[changed[0]]],
+                self.on_update_finished,
+                previous=self.last_result,
+                changed_index=changed[0],
+            )
+        return self.start_comparison(
+            CompareWorker, self.compared_paths, self.on_update_finished
+        )
+
+    def is_same_compare_options(self, result: CompareResult) -> bool:
+        """Признак того, что результат получен с текущими признаками сравнения."""
+        return (result.compare_comps, result.compare_loads) == (
+            self.tunes.is_checked(c.CHECK_BOX_COMPS),
+            self.tunes.is_checked(c.CHECK_BOX_LOADS),
+        )
+
+    def on_update_finished(self, result: CompareResult) -> None:
+        """Обновляет в таблице только строки, изменившиеся после повторного сравнения."""
+        self.end_comparison()
+        self.last_result = result
+        if result.rows and not self.message_shown:
+            with self.timer.span("populate_model"):
+                self.model.update_rows(result.rows)
+        else:
+            self.populate_model(result.rows)
+        self.show_metrics(
+            self.timer, "update", reports=self.compared_paths, rows=len(result.rows)
+        )
+        self.was_comparison = True
 
-    # 7. Быстрые режимы
+    # 8. Быстрые режимы
     def run_fast_dialogue(self) -> None:
         """
         Анализирует запрошен ли сокращённый диалог
@@ -528,9 +826,17 @@ class MyWindow(QtWidgets.QMainWindow):
 
             self.lblFilePath1.setText(files[0])
             self.lblFilePath2.setText(files[1])
-            self.compare_reports()
-            self.save_results()
-            f.set_focus(self.btnBox.button(QDialogButtonBox.StandardButton.Cancel))
+            # Результат сохраняется после заселения модели. Признак задаётся
+            # до запуска потока: сигнал о завершении быстрого сравнения может
+            # быть послан раньше, чем к нему подключился бы обработчик
+            self.save_after_comparison = True
+            if self.compare_reports() is None:
+                self.save_after_comparison = False
+
+    def finish_super_fast_dialogue(self) -> None:
+        """Сохраняет результат сравнения, выполненного в очень быстром диалоге."""
+        self.save_results()
+        f.set_focus(self.btnBox.button(QDialogButtonBox.StandardButton.Cancel))
 
     def get_wait_ms(self) -> int:
         match self.dialogue_state:
@@ -576,8 +882,8 @@ class MyWindow(QtWidgets.QMainWindow):
             <ul>
                 <li>сравнение версий, дат и размеров компонентов;</li>
                 <li>быстрый и сверхбыстрый режимы выбора отчётов;</li>
-                <li>сохранение результатов сравнения в CSV-файл,
-                открываемый в Microsoft Excel.</li>
+                <li>сохранение результатов сравнения в CSV-файл
+                или книгу Microsoft Excel (XLSX).</li>
             </ul>
 
             <p>Автор: Большаков Л.А.</p>
@@ -585,8 +891,52 @@ class MyWindow(QtWidgets.QMainWindow):
             """,
         )
 
+    # 9. Фильтр таблицы результатов
+    def init_filter_widgets(self) -> None:
+        """Заполняет списки вида записи и вида отличия фильтра."""
+        kinds = (None, RecordKind.COMPONENT, RecordKind.LOAD)
+        for text, kind in zip(c.LIST_FILTER_KINDS, kinds):
+            self.comboFilterKind.addItem(text, kind)
+        diff_kinds = (None, DiffKind.ONLY_IN_1, DiffKind.ONLY_IN_2, DiffKind.DIFFERENT)
+        for text, diff_kind in zip(c.LIST_FILTER_DIFF_KINDS, diff_kinds):
+            self.comboFilterDiff.addItem(text, diff_kind)
+        self.update_filter_widgets(False)
+
+    def update_filter_widgets(self, diff_kinds_enabled: bool) -> None:
+        """
+        Разрешает фильтр, если в таблице строки результата, а не сообщение,
+        и применяет его к новому содержимому таблицы.
+        :param diff_kinds_enabled: Признак того, что строки можно отбирать
+                                   по виду отличия (сравнение двух отчётов).
+        """
+        enabled = not self.message_shown and self.model.row_count > 0
+        self.editFilter.setEnabled(enabled)
+        self.comboFilterKind.setEnabled(enabled)
+        self.comboFilterDiff.setEnabled(enabled and diff_kinds_enabled)
+        self.apply_filter()
+
+    def apply_filter(self) -> None:
+        """Обработчик изменения поля и списков фильтра: отбирает строки таблицы."""
+        self.proxy.set_filter(self.get_row_filter())
+
+    def get_row_filter(self) -> RowFilter:
+        """Фильтр, заданный виджетами (пустой, если фильтр не разрешён)."""
+        if not self.editFilter.isEnabled():
+            return RowFilter()
+        return RowFilter(
+            self.editFilter.text().strip(),
+            self.comboFilterKind.currentData(),
+            (
+                self.comboFilterDiff.currentData()
+                if self.comboFilterDiff.isEnabled()
+                else None
+            ),
+        )
+
 
 if __name__ == "__main__":
+    # Пул процессов разбора отчётов в собранном приложении
+    multiprocessing.freeze_support()
     app = QtWidgets.QApplication(sys.argv)
     window = MyWindow()
     window.show()
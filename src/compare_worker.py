@@ -0,0 +1,312 @@
+"""
+Модуль содержит потоки, выполняющие разбор и сравнение отчётов
+и сохранение результата вне потока интерфейса.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from src.compare import (
+    ParseStats,
+    RecordStore,
+    get_file_size,
+    merge_diff,
+    parse_reports,
+)
+from src.export import DiffRow, is_xlsx_path, make_rows_from_diff, write_table
+from src.metrics import StageTimer
+from src.parse_cache import parse_file_cached
+
+if TYPE_CHECKING:
+    from src.verify import FileVersionCache
+
+
+class CompareCancelled(Exception):
+    """Сравнение отчётов прервано пользователем."""
+
+
+@dataclass(frozen=True, slots=True)
+class CompareResult:
+    """
+    Результат сравнения отчётов: записи отчётов, строки таблицы отличий
+    и признаки сравнения, с которыми отчёты разобраны.
+    """
+
+    records1: RecordStore
+    records2: RecordStore
+    rows: list[DiffRow]
+    compare_comps: bool
+    compare_loads: bool
+
+
+def make_compare_result(
+    records1: RecordStore,
+    records2: RecordStore,
+    compare_comps: bool,
+    compare_loads: bool,
+) -> CompareResult:
+    """Сравнивает записи отчётов. Строки таблицы формируются в потоке сравнения."""
+    return CompareResult(
+        records1,
+        records2,
+        make_rows_from_diff(merge_diff(records1, records2)),
+        compare_comps,
+        compare_loads,
+    )
+
+
+class CompareWorker(QThread):
+    """
+    Поток разбора и сравнения двух отчётов (CompareResult).
+    О ходе работы сообщает сигналом progress (процент прочитанных байт отчётов),
+    о завершении — ровно одним из сигналов compared, failed или cancelled.
+    Этапы сравнения замеряются в self.timer; при заданной переменной окружения
+    c.PROFILE_ENV сравнение профилируется (отчёты тогда разбираются по очереди
+    в потоке сравнения, чтобы разбор попал в профиль).
+    """
+
+    progress = pyqtSignal(int)
+    compared = pyqtSignal(object)  # Результат work()
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(
+        self,
+        file_paths: list[str],
+        compare_comps: bool,
+        compare_loads: bool,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.file_paths = file_paths
+        self.compare_comps = compare_comps
+        self.compare_loads = compare_loads
+
+        self.positions = [0] * len(file_paths)
+        self.total_size = 0
+        self.percent = -1
+        self.timer = StageTimer()
+
+    def cancel(self) -> None:
+        """Просит поток прервать сравнение. Поток сообщит об этом сигналом cancelled."""
+        self.requestInterruption()
+
+    def run(self) -> None:
+        self.timer.start_profile()
+        try:
+            self.total_size = sum(map(get_file_size, self.file_paths))
+            result = self.work()
+            self.check_cancelled()
+        except CompareCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.compared.emit(result)
+        finally:
+            self.timer.stop_profile()
+
+    def work(self) -> object:
+        """Выполняет сравнение в потоке. Результат передаётся сигналом compared."""
+        records1, records2 = self.parse_reports()
+        self.check_cancelled()
+        with self.timer.span("diff"):
+            return make_compare_result(
+                records1, records2, self.compare_comps, self.compare_loads
+            )
+
+    def parse_reports(self) -> list[RecordStore]:
+        """Разбирает отчёты, замеряя разбор и собирая его счётчики."""
+        stats = [ParseStats() for _ in self.file_paths]
+        with self.timer.span("parse"):
+            records = parse_reports(
+                self.file_paths,
+                self.compare_comps,
+                self.compare_loads,
+                progress=self.report_progress,
+                parse_function=parse_file_cached,
+                stats=stats,
+                parallel=self.timer.profile is None,
+            )
+        self.timer.add_parse_stats(stats)
+        return records
+
+    def check_cancelled(self) -> None:
+        if self.isInterruptionRequested():
+            raise CompareCancelled
+
+    def report_progress(self, index: int, position: int) -> None:
+        """
+        Получает ход разбора отчётов (вызывается из потоков разбора).
+        Сигнал посылается только при изменении процента, чтобы не загружать
+        очередь событий интерфейса.
+        :param index: Номер отчёта.
+        :param position: Число прочитанных байт файла отчёта.
+        """
+        self.check_cancelled()
+
+        self.positions[index] = position
+        if self.total_size:
+            self.report_percent(sum(self.positions) * 100 // self.total_size)
+
+    def report_percent(self, percent: int) -> None:
+        """Посылает сигнал progress, если процент выполнения изменился."""
+        percent = min(100, percent)
+        if percent != self.percent:
+            self.percent = percent
+            self.progress.emit(percent)
+
+
+class UpdateWorker(CompareWorker):
+    """
+    Поток повторного сравнения после изменения одного из отчётов.
+    Разбирается только изменённый отчёт, записи другого берутся
+    из прежнего результата сравнения, поэтому изменённый отчёт разбирается
+    с признаками сравнения прежнего результата. Результат — CompareResult.
+    """
+
+    def __init__(
+        self,
+        file_paths: list[str],
+        compare_comps: bool,
+        compare_loads: bool,
+        parent=None,
+        *,
+        previous: CompareResult,
+        changed_index: int,
+    ) -> None:
+        """
+        :param file_paths: Путь к файлу изменённого отчёта (один).
+        :param previous: Прежний результат сравнения тех же отчётов.
+        :param changed_index: Номер изменённого отчёта в паре (0 или 1).
+        :raises ValueError: Если признаки сравнения отличаются от признаков
+                            прежнего результата: нужно полное сравнение.
+        """
+        if (compare_comps, compare_loads) != (
+            previous.compare_comps,
+            previous.compare_loads,
+        ):
+            raise ValueError("Признаки сравнения отличаются от прежнего результата")
+        super().__init__(file_paths, compare_comps, compare_loads, parent)
+        self.previous = previous
+        self.changed_index = changed_index
+
+    def work(self) -> object:
+        (records,) = self.parse_reports()
+        self.check_cancelled()
+        if self.changed_index == 0:
+            records1, records2 = records, self.previous.records2
+        else:
+            records1, records2 = self.previous.records1, records
+        with self.timer.span("diff"):
+            return make_compare_result(
+                records1, records2, self.compare_comps, self.compare_loads
+            )
+
+
+class MatrixWorker(CompareWorker):
+    """Поток сравнения нескольких отчётов. Результат — ReportMatrix."""
+
+    def work(self) -> object:
+        from src.report_matrix import build_report_matrix
+
+        return build_report_matrix(
+            self.file_paths,
+            self.compare_comps,
+            self.compare_loads,
+            progress=self.report_progress,
+            parse_function=parse_file_cached,
+        )
+
+
+class VerifyWorker(CompareWorker):
+    """
+    Поток сверки отчёта с каталогом установки на диске. Результат — VerifyResult.
+    Ход работы — процент проверенных файлов.
+    """
+
+    def __init__(
+        self,
+        file_paths: list[str],
+        compare_comps: bool,
+        compare_loads: bool,
+        parent=None,
+        *,
+        install_root: str,
+        version_cache: "FileVersionCache",
+    ) -> None:
+        """
+        :param file_paths: Путь к файлу отчёта (один).
+        :param install_root: Каталог установки на диске.
+        :param version_cache: Версии файлов, прочитанные при прежних сверках.
+        """
+        super().__init__(file_paths, compare_comps, compare_loads, parent)
+        self.install_root = install_root
+        self.version_cache = version_cache
+
+    def work(self) -> object:
+        from src.verify import verify_report
+
+        return verify_report(
+            self.file_paths[0],
+            self.install_root,
+            self.compare_comps,
+            self.compare_loads,
+            cache=self.version_cache,
+            progress=self.report_files_progress,
+        )
+
+    def report_files_progress(self, checked: int, total: int) -> None:
+        """Получает число проверенных и общее число файлов установки."""
+        self.check_cancelled()
+        self.report_percent(checked * 100 // total if total else 100)
+
+
+class ExportWorker(QThread):
+    """
+    Поток записи результата сравнения в CSV файл или книгу Excel (см. write_table).
+    О завершении сообщает одним из сигналов exported или failed.
+    Запись замеряется в self.timer, туда же, где замеры сравнения; профиль
+    сравнения, если он есть, записывается рядом с файлом результата.
+    """
+
+    exported = pyqtSignal(str, int, float)  # Путь, размер (байт), время (сек)
+    failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        file_path: Path,
+        rows: Iterable[Sequence[str | int]],
+        header: list[str],
+        parent=None,
+        *,
+        timer: StageTimer | None = None,
+    ) -> None:
+        """
+        :param file_path: Путь к файлу результата.
+        :param rows: Строки результата. Читаются в потоке записи, поэтому не должны
+                     изменяться до её завершения (см. DiffTableModel.get_rows).
+        :param header: Шапка таблицы.
+        :param timer: Замеры сравнения, результат которого записывается.
+        """
+        super().__init__(parent)
+        self.file_path = file_path
+        self.rows = rows
+        self.header = header
+        self.timer = timer if timer is not None else StageTimer()
+
+    def run(self) -> None:
+        try:
+            span = "write_xlsx" if is_xlsx_path(self.file_path) else "write_csv"
+            with self.timer.span(span):
+                size = write_table(self.file_path, self.rows, self.header)
+            self.timer.dump_profile(self.file_path)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            seconds = self.timer.spans[-1].seconds
+            self.exported.emit(str(self.file_path), size, seconds)
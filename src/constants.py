@@ -18,6 +18,10 @@ class Constant:
 
     # Путь к файлу интерфейса Qt
     FILE_UI_NAME = "compare_reports.ui"
+    # Модуль, в который файл интерфейса компилируется при сборке (см. src.ui_loader),
+    # и переменная окружения, включающая загрузку интерфейса из файла .ui
+    UI_MODULE_NAME = "src.compare_reports_ui"
+    LOAD_UI_ENV = "COMPARE_REPORTS_LOAD_UI"
 
     # Тексты кнопок
     TEXT_BUTTON_COMPARE = "Сравнить"
@@ -32,12 +36,52 @@ class Constant:
         "Отчёт 1\nразмер",
         "Отчёт 2\nразмер",
     ]
+    # Ширины столбцов таблицы (кроме первого)
+    LIST_COLUMN_WIDTHS = [105, 105, 80, 80]
+
+    # Заголовки столбцов таблицы сверки отчёта с каталогом установки
+    LIST_VERIFY_HEADER_COLUMNS = [
+        "Компонент",
+        "Отчёт\nверсия",
+        "Диск\nверсия",
+        "Отчёт\nразмер",
+        "Диск\nразмер",
+    ]
+
+    # Заголовки столбцов таблиц анализа парка станций: сводной и отклонений станций
+    LIST_FLEET_SUMMARY_COLUMNS = [
+        "Компонент",
+        "Большинство\nверсия",
+        "Большинство\nразмер",
+        "Станций\nс этим значением",
+        "Станций\nс отклонением",
+        "Различных\nзначений",
+    ]
+    LIST_FLEET_HOST_COLUMNS = [
+        "Станция",
+        "Группа\nстанций",
+        "Компонент",
+        "Большинство\nверсия",
+        "Станция\nверсия",
+        "Большинство\nразмер",
+        "Станция\nразмер",
+    ]
+
+    # Подписи и ширины пары столбцов отчёта при сравнении нескольких отчётов,
+    # ширина столбца названий
+    TEXT_HEADER_STAMP = "версия"
+    TEXT_HEADER_SIZE = "размер"
+    LIST_MATRIX_COLUMN_WIDTHS = [105, 80]
+    MATRIX_NAME_COLUMN_WIDTH = 250
 
     # Заголовки диалогов открытия файлов и директорий
     TITLE_OPEN_FIRST_REPORT = "Первый отчёт"
     TITLE_OPEN_SECOND_REPORT = "Второй отчёт"
     TITLE_SET_SAVER_FOLDER = "Выбор директории сохранения результата"
     TITLE_OPEN_TWO_FILES = "Выберите два файла отчётов"
+    TITLE_OPEN_MANY_FILES = "Выберите файлы отчётов (первый — эталонный)"
+    TITLE_OPEN_VERIFY_REPORT = "Отчёт для сверки с каталогом установки"
+    TITLE_SET_INSTALL_ROOT = "Выбор каталога установки системы"
 
     # Уточняющая информация о файлах отчётов
     TYPES_FILES_OPEN = "Текстовые файлы(*.txt);;Все файлы (*)"
@@ -49,6 +93,8 @@ class Constant:
     TEXT_ERROR_FILE = "Произошла ошибка:"
     TITLE_NO_COMP = "Предупреждение"
     TEXT_NO_COMP = " Выберите что надо сравнивать компоненты и/или загрузки"
+    TEXT_FEW_FILES = "Необходимо выбрать не менее двух файлов отчётов"
+    TEXT_VERIFY_SKIPPED = "Записей с файлами вне каталога установки (не сверялись):"
     TEXT_NO_TUNES = "Ошибка в программе. Запрошена несуществующая настройка"
     TITLE_ERROR_READ = "Ошибка"
     TITLE_ERROR_WRITE = "Ошибка"
@@ -67,8 +113,126 @@ class Constant:
     # Сообщение об удачном сравнении
     TEXT_SUCCESSFUL_COMPARISON = "Различия в компонентах отчётов не обнаружены"
 
+    # Столбцы версий первого и второго отчёта в таблице сравнения двух отчётов.
+    # Версия второго отчёта выделяется цветом и подсказкой, если она новее
+    # или старше версии первого
+    STAMP_COLUMNS = (1, 2)
+    COLOR_STAMP_NEWER = "#1b7f2a"
+    COLOR_STAMP_OLDER = "#b3261e"
+    TEXT_STAMP_NEWER = "Новее, чем в отчёте 1"
+    TEXT_STAMP_OLDER = "Старше, чем в отчёте 1"
+
+    # Пункты списков фильтра таблицы результатов: вид записи и вид отличия
+    LIST_FILTER_KINDS = ["Все записи", "Компоненты", "Загрузки"]
+    LIST_FILTER_DIFF_KINDS = [
+        "Все отличия",
+        "Только в отчёте 1",
+        "Только в отчёте 2",
+        "Различающиеся",
+    ]
+
+    # Число запоминаемых ключей сортировки версий и дат (см. get_stamp_key)
+    STAMP_KEY_CACHE_SIZE = 65536
+
+    # Минимальный размер каждого из отчётов (байт), начиная с которого они
+    # разбираются в отдельных процессах, а не в потоках
+    PARSE_PROCESS_MIN_SIZE = 32 * 1024 * 1024
+
+    # Через сколько строк отчёта сообщается о ходе его разбора
+    PARSE_PROGRESS_LINES = 16384
+
+    # Наибольший интервал (сек) между сообщениями о ходе разбора отчётов в процессах
+    PARSE_PROGRESS_INTERVAL = 0.1
+
+    # Задержка (мс) повторного сравнения после изменения файла отчёта:
+    # сравнение выполняется, когда файл не изменяется в течение этого времени
+    WATCH_DELAY_MS = 500
+    # Наибольшее число диапазонов удалённых строк, которые удаляются из таблицы
+    # по отдельности при повторном сравнении: каждый диапазон копирует столбцы,
+    # поэтому при большем числе таблица заполняется заново (см. update_rows)
+    UPDATE_MAX_REMOVED_RANGES = 16
+
+    # Сверка отчёта с каталогом установки: число потоков проверки файлов,
+    # число файлов в задании потока, наибольшее число запоминаемых версий файлов
+    VERIFY_THREADS = 16
+    VERIFY_CHUNK_FILES = 64
+    VERIFY_CACHE_SIZE = 65536
+
+    # Анализ парка станций: число отчётов, разбираемых одновременно,
+    # на процесс разбора (результаты остальных не накапливаются в памяти)
+    FLEET_PENDING_PER_WORKER = 2
+
+    # Сравнение нескольких отчётов: число отчётов, разбираемых одновременно,
+    # на поток или процесс разбора (см. build_report_matrix)
+    MATRIX_PENDING_PER_WORKER = 2
+
+    # Дайджест отчёта: расширение файла дайджеста рядом с отчётом,
+    # число групп записей каждого вида (см. src.digest)
+    DIGEST_SUFFIX = ".digest"
+    DIGEST_BUCKETS = 128
+
+    # Замеры этапов сравнения (см. src.metrics): переменные окружения, включающие
+    # отслеживание памяти и профилирование, имя журнала замеров в каталоге кэша
+    # и его наибольший размер (байт), названия этапов и счётчиков разбора
+    TRACE_MEMORY_ENV = "COMPARE_REPORTS_TRACE_MEMORY"
+    PROFILE_ENV = "COMPARE_REPORTS_PROFILE"
+    METRICS_LOG_FILE = "metrics.jsonl"
+    METRICS_LOG_MAX_SIZE = 4 * 1024 * 1024
+    METRICS_SPAN_TITLES = {
+        "parse": "разбор",
+        "diff": "сравнение",
+        "populate_model": "заполнение таблицы",
+        "header": "настройка шапки",
+        "write_csv": "запись CSV",
+        "write_xlsx": "запись XLSX",
+    }
+    METRICS_COUNTER_TITLES = {
+        "lines": "строк",
+        "skipped": "пропущено",
+        "fallback": "по выражениям",
+        "matched": "записей",
+    }
+
+    # Книга Excel с результатом сравнения (см. src.xlsx): расширение файла, имя
+    # листа, наибольшее число строк листа Excel, ширины столбца названий и остальных
+    # столбцов (в символах), степень сжатия архива (1 — быстрее, 9 — меньше)
+    XLSX_SUFFIX = ".xlsx"
+    XLSX_SHEET_NAME = "Результат"
+    XLSX_MAX_ROWS = 1_048_576
+    XLSX_NAME_COLUMN_WIDTH = 60
+    XLSX_COLUMN_WIDTH = 16
+    XLSX_COMPRESS_LEVEL = 1
+    TEXT_ERROR_XLSX_ROWS = "Результат не помещается в лист Excel: строк больше"
+
+    # Кэш результатов разбора отчётов: переменная окружения с путём к каталогу кэша,
+    # имя каталога в каталоге кэшей пользователя, наибольший размер кэша (байт;
+    # 0 отключает кэш), размер блока чтения файла при вычислении хэша, возраст (сек),
+    # после которого временный файл записи считается брошенным и удаляется
+    CACHE_DIR_ENV = "COMPARE_REPORTS_CACHE_DIR"
+    CACHE_FOLDER = "compare_reports"
+    CACHE_MAX_SIZE = 256 * 1024 * 1024
+    CACHE_HASH_CHUNK = 1024 * 1024
+    CACHE_TEMP_MAX_AGE = 10 * 60
+
+    # Разделитель путей к отчётам пары в файле списка пакетного сравнения
+    CLI_MANIFEST_DELIMITER = ";"
+    # Имя файла результата сравнения нескольких отчётов в пакетном режиме
+    CLI_MATRIX_FILE = "compare_matrix.csv"
+    # Имя файла результата сверки отчёта с каталогом установки в пакетном режиме
+    CLI_VERIFY_FILE = "compare_verify.csv"
+    # Шаблон имён отчётов в каталоге парка станций и имена файлов результата
+    # анализа парка: сводной таблицы и отклонений станций
+    FLEET_REPORT_PATTERN = "*.txt"
+    CLI_FLEET_SUMMARY_FILE = "fleet_summary.csv"
+    CLI_FLEET_HOSTS_FILE = "fleet_hosts.csv"
+    # Шаблон имени файла результата сравнения снимков (номера снимков)
+    CLI_SNAPSHOTS_FILE = "compare_snapshots_{}_{}.csv"
+
     # Имя файла настроек
     FILE_TUNES = "tunes.txt"
+    # Задержка (мс) записи изменённых настроек: изменения за это время
+    # записываются в файл один раз
+    TUNES_WRITE_DELAY_MS = 500
 
     # Имя папки Downloads
     DOWNLOADS = "Downloads"
@@ -79,6 +243,7 @@ class Constant:
     CHECK_BOX_COMPS = "checkBoxComps"
     CHECK_BOX_LOADS = "checkBoxLoads"
     SAVER_FOLDER = "saver_folder"
+    ACTION_SAVE_XLSX = "actionSaveXlsx"
 
     # Типы контроля
     CHECK_BOX = "CheckBox"
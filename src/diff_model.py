@@ -0,0 +1,596 @@
+"""
+Модуль содержит модель таблицы результатов сравнения отчётов.
+
+Модель только для чтения и хранит данные по столбцам. Текст ячеек формируется
+в data() при запросе, то есть только для отображаемых строк.
+Модель сортируется сама: QSortFilterProxyModel сравнивал бы строки, вызывая
+data() для каждого сравнения, что на больших таблицах занимает секунды.
+Версии и даты сортируются по целочисленным ключам (get_stamp_key), а не по тексту.
+При повторном сравнении изменённого отчёта модель обновляет только
+изменившиеся строки (update_rows), сохраняя выделение и положение прокрутки.
+Строки фильтруются прокси-моделью DiffFilterProxyModel по индексу (FilterIndex),
+который модель изменяет вместе со своими строками.
+"""
+
+import bisect
+from collections.abc import Iterator, Sequence
+
+from PyQt6.QtCore import (
+    QAbstractProxyModel,
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+)
+from PyQt6.QtGui import QColor
+
+from src.constants import Constant as c
+from src.export import DiffRow, format_value
+from src.filter_index import FilterIndex, RowFilter
+from src.record_store import get_stamp_key
+
+# Выравнивание текста ячеек: размеры — по правому краю, остальное — по левому
+ALIGN_NUMBER = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+ALIGN_TEXT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+# Роль ключа сортировки ячейки: для версий и дат — get_stamp_key, иначе значение
+SORT_KEY_ROLE = Qt.ItemDataRole.UserRole.value + 1
+
+
+class DiffTableModel(QAbstractTableModel):
+    """
+    Модель таблицы результатов сравнения.
+    Роль DisplayRole — текст ячейки, UserRole — исходное значение,
+    SORT_KEY_ROLE — ключ сортировки, как в sort (для версий и дат — get_stamp_key):
+    окно сортирует саму модель, роль нужна прокси-моделям с setSortRole,
+    TextAlignmentRole — выравнивание. Версия второго отчёта, новее или старше
+    версии первого, выделяется цветом (ForegroundRole) и подсказкой (ToolTipRole).
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.header: list[str] = []
+        self.columns: list[list[str | int]] = []
+        self.row_count = 0
+        # Столбцы версий и дат, пара сравниваемых столбцов версий (см. set_rows)
+        self.stamp_columns: frozenset[int] = frozenset()
+        self.newer_columns: tuple[int, int] | None = None
+        # Названия и признаки строк для фильтрации, в порядке строк модели
+        self.filter_index = FilterIndex()
+        # Столбец и порядок последней сортировки (-1 — порядок строк set_rows)
+        self.sort_column = -1
+        self.sort_order = Qt.SortOrder.AscendingOrder
+
+    def set_rows(
+        self,
+        rows: list[DiffRow],
+        header: list[str],
+        stamp_columns: Sequence[int] = (),
+        newer_columns: tuple[int, int] | None = None,
+    ) -> None:
+        """
+        Заменяет содержимое модели.
+        :param rows: Строки таблицы. Недостающие в конце строки ячейки
+                     (например, в строке сообщения) считаются пустыми.
+        :param header: Шапка таблицы.
+        :param stamp_columns: Столбцы версий и дат, сортируемые по get_stamp_key.
+        :param newer_columns: Столбцы версий первого и второго отчёта: версия
+                              второго отмечается как более новая или старая.
+        """
+        self.beginResetModel()
+        self.header = list(header)
+        self.stamp_columns = frozenset(stamp_columns)
+        self.newer_columns = newer_columns
+        column_count = len(header)
+        if rows and all(len(row) == column_count for row in rows):
+            self.columns = [list(column) for column in zip(*rows)]
+        else:
+            self.columns = [[] for _ in range(column_count)]
+            for row in rows:
+                for column, value in zip(self.columns, row):
+                    column.append(value)
+                for column in self.columns[len(row) :]:
+                    column.append("")
+        self.row_count = len(rows)
+        self.filter_index = FilterIndex(rows, newer_columns)
+        self.sort_column = -1
+        self.endResetModel()
+
+    def update_rows(self, rows: list[DiffRow]) -> int:
+        """
+        Приводит содержимое модели к строкам rows, изменяя только отличающиеся
+        строки: удалённые строки удаляются, изменившиеся обновляются на месте,
+        новые добавляются, после чего восстанавливается порядок строк
+        (последняя сортировка или порядок rows).
+        Удаление каждого диапазона подряд идущих строк копирует столбцы, поэтому
+        при числе диапазонов больше c.UPDATE_MAX_REMOVED_RANGES модель заполняется
+        заново (reset_rows): выделение тогда не сохраняется.
+        Строки различаются по значению первого столбца, оно должно быть уникальным.
+        :param rows: Строки таблицы той же шапки.
+        :return: Число удалённых, изменённых и добавленных строк.
+        """
+        new_rows = {row[0]: row for row in rows}
+        column_count = len(self.columns)
+
+        removed = [
+            row for row, key in enumerate(self.get_keys()) if key not in new_rows
+        ]
+        removed_ranges = get_ranges(removed)
+        if len(removed_ranges) > c.UPDATE_MAX_REMOVED_RANGES:
+            kept = self.row_count - len(removed)
+            return len(removed) + self.reset_rows(rows, new_rows, kept)
+
+        for first, last in reversed(removed_ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self.columns = [
+                column[:first] + column[last + 1 :] for column in self.columns
+            ]
+            self.row_count -= last - first + 1
+            self.filter_index.delete(first, last)
+            self.endRemoveRows()
+
+        positions = {key: row for row, key in enumerate(self.get_keys())}
+        changed = [
+            (row, new_rows[key])
+            for key, row in positions.items()
+            if list(new_rows[key]) != [column[row] for column in self.columns]
+        ]
+        if changed:
+            columns = [list(column) for column in self.columns]
+            for row, values in changed:
+                for column, value in zip(columns, values):
+                    column[row] = value
+                self.filter_index.set_row(row, values)
+            self.columns = columns
+            self.dataChanged.emit(
+                self.index(min(row for row, _ in changed), 0),
+                self.index(max(row for row, _ in changed), column_count - 1),
+            )
+
+        added = [row for key, row in new_rows.items() if key not in positions]
+        if added:
+            self.beginInsertRows(
+                QModelIndex(), self.row_count, self.row_count + len(added) - 1
+            )
+            self.columns = [
+                column + list(values)
+                for column, values in zip(self.columns, zip(*added))
+            ]
+            self.row_count += len(added)
+            self.filter_index.extend(added)
+            self.endInsertRows()
+
+        # Порядок строк rows, а при сортировке — он же для равных значений,
+        # как если бы таблица была заполнена заново и отсортирована
+        ranks = {key: rank for rank, key in enumerate(new_rows)}
+        keys = self.get_keys()
+        order_rows = sorted(range(self.row_count), key=lambda row: ranks[keys[row]])
+        if self.sort_column >= 0:
+            order_rows = self.get_sorted_rows(
+                self.sort_column, self.sort_order, order_rows
+            )
+        if order_rows != list(range(self.row_count)):
+            self.set_order(order_rows)
+
+        return len(removed) + len(changed) + len(added)
+
+    def reset_rows(
+        self, rows: list[DiffRow], new_rows: dict[str | int, DiffRow], kept: int
+    ) -> int:
+        """
+        Заполняет модель строками rows заново, сохраняя сортировку (см. update_rows).
+        Столбцы и индекс фильтра строятся одним проходом по rows.
+        :param new_rows: Строки rows по значению первого столбца.
+        :param kept: Число строк модели, которые есть в rows.
+        :return: Число изменённых и добавленных строк.
+        """
+        changed = 0
+        for values in zip(*self.columns):
+            row = new_rows.get(values[0])
+            changed += row is not None and tuple(row) != values
+        sort_column, sort_order = self.sort_column, self.sort_order
+        self.set_rows(rows, self.header, self.stamp_columns, self.newer_columns)
+        if sort_column >= 0:
+            self.sort(sort_column, sort_order)
+        return changed + len(new_rows) - kept
+
+    def get_keys(self) -> list[str | int]:
+        """Значения первого столбца, различающие строки."""
+        return self.columns[0] if self.columns else []
+
+    def get_rows(
+        self, rows: Sequence[int] | None = None
+    ) -> Iterator[tuple[str | int, ...]]:
+        """
+        Возвращает строки таблицы с исходными значениями в текущем порядке.
+        Модель не изменяет списки столбцов, а заменяет их, поэтому строки можно
+        читать в другом потоке, пока модель заселяется или сортируется заново.
+        :param rows: Номера возвращаемых строк (по умолчанию все),
+                     например строки, показываемые DiffFilterProxyModel.
+        """
+        columns = self.columns
+        if rows is None:
+            return zip(*columns)
+        return (tuple(column[row] for column in columns) for row in rows)
+
+    def clear(self) -> None:
+        """Удаляет все данные и шапку."""
+        self.set_rows([], [])
+
+    def sort(
+        self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ) -> None:
+        """
+        Сортирует строки по исходным значениям столбца (устойчиво), версии
+        и даты — по их ключам (см. set_rows). Пустые ячейки считаются меньше
+        любого размера, версии и даты.
+        """
+        if not 0 <= column < len(self.columns):
+            return
+        self.sort_column = column
+        self.sort_order = order
+        if self.row_count > 1:
+            self.set_order(self.get_sorted_rows(column, order))
+
+    def get_sorted_rows(
+        self, column: int, order: Qt.SortOrder, rows: Sequence[int] | None = None
+    ) -> list[int]:
+        """
+        Номера строк в порядке сортировки по столбцу column (см. sort).
+        :param rows: Исходный порядок строк, сохраняемый для равных значений
+                     (по умолчанию текущий).
+        """
+        values = self.columns[column]
+        if column in self.stamp_columns:
+            keys = list(map(get_stamp_key, values))
+        else:
+            keys = [(isinstance(value, int), value) for value in values]
+        return sorted(
+            range(self.row_count) if rows is None else rows,
+            key=keys.__getitem__,
+            reverse=order == Qt.SortOrder.DescendingOrder,
+        )
+
+    def set_order(self, order_rows: list[int]) -> None:
+        """
+        Переставляет строки: новая строка i — прежняя строка order_rows[i].
+        Индексы, сохранённые представлением, переносятся вместе со строками.
+        """
+        self.layoutAboutToBeChanged.emit(
+            [], QAbstractTableModel.LayoutChangeHint.VerticalSortHint
+        )
+        self.columns = [[column[row] for row in order_rows] for column in self.columns]
+        self.filter_index.reorder(order_rows)
+
+        # Индексы, сохранённые представлением (выделение, текущая ячейка)
+        new_rows = [0] * self.row_count
+        for new_row, old_row in enumerate(order_rows):
+            new_rows[old_row] = new_row
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            old_indexes,
+            [
+                self.index(new_rows[index.row()], index.column())
+                for index in old_indexes
+            ],
+        )
+        self.layoutChanged.emit(
+            [], QAbstractTableModel.LayoutChangeHint.VerticalSortHint
+        )
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(
+        self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> object:
+        if not index.isValid():
+            return None
+
+        column = index.column()
+        value = self.columns[column][index.row()]
+        if role == SORT_KEY_ROLE:
+            if column in self.stamp_columns:
+                return get_stamp_key(value)
+            return value
+        match role:
+            case Qt.ItemDataRole.DisplayRole:
+                return format_value(value)
+            case Qt.ItemDataRole.UserRole:
+                return value
+            case Qt.ItemDataRole.TextAlignmentRole:
+                return ALIGN_NUMBER if isinstance(value, int) else ALIGN_TEXT
+            case Qt.ItemDataRole.ForegroundRole | Qt.ItemDataRole.ToolTipRole:
+                return self.get_newer_data(index, role)
+        return None
+
+    def get_newer_data(self, index: QModelIndex, role: int) -> object:
+        """
+        Цвет и подсказка версии второго отчёта, отличающейся от версии первого:
+        ключи версий сравниваются так же, как при сортировке.
+        """
+        if self.newer_columns is None or index.column() != self.newer_columns[1]:
+            return None
+        column1, column2 = self.newer_columns
+        key1 = get_stamp_key(self.columns[column1][index.row()])
+        key2 = get_stamp_key(self.columns[column2][index.row()])
+        if key1 < 0 or key2 < 0 or key1 == key2:
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return c.TEXT_STAMP_NEWER if key2 > key1 else c.TEXT_STAMP_OLDER
+        return QColor(c.COLOR_STAMP_NEWER if key2 > key1 else c.COLOR_STAMP_OLDER)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> object:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and 0 <= section < len(self.header)
+        ):
+            return self.header[section]
+        return super().headerData(section, orientation, role)
+
+
+class DiffFilterProxyModel(QAbstractProxyModel):
+    """
+    Прокси-модель таблицы результатов, показывающая строки исходной модели
+    DiffTableModel, подходящие под фильтр (set_filter), в порядке исходной модели.
+    Строки отбираются по индексу исходной модели (FilterIndex), а не вызовами
+    filterAcceptsRow для каждой строки, как в QSortFilterProxyModel: на сотнях
+    тысяч строк это занимает секунды. Сортировку выполняет исходная модель.
+    Удаление, добавление и изменение строк исходной модели передаются
+    представлению сигналами для соответствующих показываемых строк,
+    поэтому выделение сохраняется и при обновлении результата (update_rows).
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.row_filter = RowFilter()
+        # Номера показываемых строк исходной модели по возрастанию; None — все строки.
+        # Список не изменяется, а заменяется (см. DiffTableModel.get_rows)
+        self.source_rows: list[int] | None = None
+        # Показываемые строки, удаляемые из исходной модели (первая, последняя)
+        self.removed_range: tuple[int, int] | None = None
+        # Индексы, сохранённые представлением, и соответствующие им индексы
+        # исходной модели на время перестановки её строк
+        self.layout_indexes: list[QModelIndex] = []
+        self.layout_source_indexes: list[QPersistentModelIndex] = []
+
+    def setSourceModel(self, source: DiffTableModel) -> None:
+        self.beginResetModel()
+        super().setSourceModel(source)
+        source.modelAboutToBeReset.connect(self.beginResetModel)
+        source.modelReset.connect(self.on_source_reset)
+        source.layoutAboutToBeChanged.connect(self.on_source_layout_about_to_change)
+        source.layoutChanged.connect(self.on_source_layout_changed)
+        source.rowsAboutToBeRemoved.connect(self.on_source_rows_about_to_be_removed)
+        source.rowsRemoved.connect(self.on_source_rows_removed)
+        source.rowsAboutToBeInserted.connect(self.on_source_rows_about_to_be_inserted)
+        source.rowsInserted.connect(self.on_source_rows_inserted)
+        source.dataChanged.connect(self.on_source_data_changed)
+        self.source_rows = self.match_rows()
+        self.endResetModel()
+
+    def set_filter(self, row_filter: RowFilter) -> None:
+        """
+        Показывает строки, подходящие под фильтр. Если фильтр уточняет прежний
+        (например, при наборе фрагмента названия), проверяются только
+        показываемые строки.
+        """
+        if row_filter == self.row_filter:
+            return
+        candidates = None
+        if self.source_rows is not None and row_filter.narrows(self.row_filter):
+            candidates = self.source_rows
+        self.row_filter = row_filter
+
+        self.beginResetModel()
+        self.source_rows = self.match_rows(candidates)
+        self.endResetModel()
+
+    def match_rows(self, candidates: list[int] | None = None) -> list[int] | None:
+        """Строки исходной модели, подходящие под фильтр (None — все строки)."""
+        source = self.sourceModel()
+        if self.row_filter.is_empty() or source is None:
+            return None
+        return source.filter_index.match(self.row_filter, candidates)
+
+    def get_source_rows(self) -> list[int] | None:
+        """Номера показываемых строк исходной модели (None — все строки)."""
+        return self.source_rows
+
+    def get_proxy_range(self, first: int, last: int) -> tuple[int, int]:
+        """
+        Показываемые строки, соответствующие строкам исходной модели
+        с first по last: (первая, следующая за последней).
+        """
+        if self.source_rows is None:
+            return first, last + 1
+        return (
+            bisect.bisect_left(self.source_rows, first),
+            bisect.bisect_right(self.source_rows, last),
+        )
+
+    # Соответствие строк прокси-модели и исходной модели
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        source = self.sourceModel()
+        if parent.isValid() or source is None:
+            return 0
+        if self.source_rows is None:
+            return source.rowCount()
+        return len(self.source_rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        source = self.sourceModel()
+        if parent.isValid() or source is None:
+            return 0
+        return source.columnCount()
+
+    def index(
+        self, row: int, column: int, parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex | None = None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        source = self.sourceModel()
+        if not proxy_index.isValid() or source is None:
+            return QModelIndex()
+        row = proxy_index.row()
+        if self.source_rows is not None:
+            row = self.source_rows[row]
+        return source.index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        first, end = self.get_proxy_range(source_index.row(), source_index.row())
+        if first == end:
+            return QModelIndex()
+        return self.index(first, source_index.column())
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> object:
+        source = self.sourceModel()
+        if orientation == Qt.Orientation.Horizontal and source is not None:
+            # Шапка не зависит от показываемых строк, в том числе при их отсутствии
+            return source.headerData(section, orientation, role)
+        return super().headerData(section, orientation, role)
+
+    def sort(
+        self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ) -> None:
+        source = self.sourceModel()
+        if source is not None:
+            source.sort(column, order)
+
+    # Изменения исходной модели
+    def on_source_reset(self) -> None:
+        self.source_rows = self.match_rows()
+        self.endResetModel()
+
+    def on_source_layout_about_to_change(self) -> None:
+        self.layoutAboutToBeChanged.emit(
+            [], QAbstractProxyModel.LayoutChangeHint.VerticalSortHint
+        )
+        self.layout_indexes = self.persistentIndexList()
+        self.layout_source_indexes = [
+            QPersistentModelIndex(self.mapToSource(index))
+            for index in self.layout_indexes
+        ]
+
+    def on_source_layout_changed(self) -> None:
+        # Перестановка строк не меняет набор показываемых строк, только их номера
+        self.source_rows = self.match_rows()
+        self.changePersistentIndexList(
+            self.layout_indexes,
+            [
+                self.mapFromSource(QModelIndex(index))
+                for index in self.layout_source_indexes
+            ],
+        )
+        self.layout_indexes = []
+        self.layout_source_indexes = []
+        self.layoutChanged.emit(
+            [], QAbstractProxyModel.LayoutChangeHint.VerticalSortHint
+        )
+
+    def on_source_rows_about_to_be_removed(
+        self, parent: QModelIndex, first: int, last: int
+    ) -> None:
+        proxy_first, proxy_end = self.get_proxy_range(first, last)
+        self.removed_range = None
+        if proxy_first < proxy_end:
+            self.removed_range = (proxy_first, proxy_end - 1)
+            self.beginRemoveRows(QModelIndex(), proxy_first, proxy_end - 1)
+
+    def on_source_rows_removed(
+        self, parent: QModelIndex, first: int, last: int
+    ) -> None:
+        if self.source_rows is not None:
+            proxy_first, proxy_end = self.get_proxy_range(first, last)
+            count = last - first + 1
+            self.source_rows = self.source_rows[:proxy_first] + [
+                row - count for row in self.source_rows[proxy_end:]
+            ]
+        if self.removed_range is not None:
+            self.removed_range = None
+            self.endRemoveRows()
+
+    def on_source_rows_about_to_be_inserted(
+        self, parent: QModelIndex, first: int, last: int
+    ) -> None:
+        # Без фильтра показываются все строки, иначе показываемые среди
+        # добавленных строк известны только после их добавления
+        if self.source_rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def on_source_rows_inserted(
+        self, parent: QModelIndex, first: int, last: int
+    ) -> None:
+        if self.source_rows is None:
+            self.endInsertRows()
+            return
+
+        source = self.sourceModel()
+        inserted = source.filter_index.match(self.row_filter, range(first, last + 1))
+        proxy_first = bisect.bisect_left(self.source_rows, first)
+        count = last - first + 1
+        if inserted:
+            self.beginInsertRows(
+                QModelIndex(), proxy_first, proxy_first + len(inserted) - 1
+            )
+        self.source_rows = (
+            self.source_rows[:proxy_first]
+            + inserted
+            + [row + count for row in self.source_rows[proxy_first:]]
+        )
+        if inserted:
+            self.endInsertRows()
+
+    def on_source_data_changed(
+        self, top_left: QModelIndex, bottom_right: QModelIndex
+    ) -> None:
+        if self.source_rows is not None and self.match_rows() != self.source_rows:
+            # Изменились признаки строк: набор показываемых строк другой
+            self.beginResetModel()
+            self.source_rows = self.match_rows()
+            self.endResetModel()
+            return
+
+        proxy_first, proxy_end = self.get_proxy_range(
+            top_left.row(), bottom_right.row()
+        )
+        if proxy_first < proxy_end:
+            self.dataChanged.emit(
+                self.index(proxy_first, top_left.column()),
+                self.index(proxy_end - 1, bottom_right.column()),
+            )
+
+
+def get_ranges(rows: Sequence[int]) -> list[tuple[int, int]]:
+    """Разбивает возрастающие номера строк на диапазоны подряд идущих (первая, последняя)."""
+    ranges: list[tuple[int, int]] = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
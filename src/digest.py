@@ -0,0 +1,353 @@
+"""
+Модуль содержит дайджесты отчётов для быстрой проверки их совпадения.
+
+Дайджест — дерево хэшей (дерево Меркла) разобранного отчёта: записи каждого
+вида распределяются по c.DIGEST_BUCKETS группам по контрольной сумме названия,
+для каждой группы вычисляется хэш её записей в порядке названий, хэш вида —
+по хэшам его групп, корневой хэш — по хэшам видов. Дайджест занимает несколько
+килобайт и хранится в файле рядом с отчётом (c.DIGEST_SUFFIX), поэтому
+вместо отчёта станция может передать только дайджест. Совпадение корневых
+хэшей означает совпадение записей отчётов без их разбора, а при отличии
+сравниваются только записи групп с разными хэшами (см. diff_reports).
+Модуль не импортирует PyQt6.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.compare import PARSER_VERSION, DiffEntry, RecordStore, merge_diff
+from src.constants import Constant as c
+from src.parse_cache import get_file_digest, parse_file_cached, write_entry
+from src.record_store import RecordKind
+
+# Версия формата файла дайджеста
+DIGEST_FORMAT = 1
+
+# Поддерево дайджеста: вид записей и номер группы
+Subtree = tuple[RecordKind, int]
+
+
+def get_hash(data: bytes) -> bytes:
+    """Хэш узла дерева."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def get_bucket(name: str) -> int:
+    """Номер группы записи по её названию (не зависит от запуска программы)."""
+    return zlib.crc32(name.encode()) % c.DIGEST_BUCKETS
+
+
+def get_digest_kinds(compare_comps: bool, compare_loads: bool) -> list[RecordKind]:
+    """Виды записей, которые попадают в результат разбора с этими параметрами."""
+    kinds = []
+    if compare_comps:
+        kinds.append(RecordKind.COMPONENT)
+    if compare_loads:
+        kinds.append(RecordKind.LOAD)
+    return kinds
+
+
+@dataclass(frozen=True, slots=True)
+class KindDigest:
+    """Хэши записей одного вида."""
+
+    count: int  # Число записей
+    hash: bytes
+    buckets: list[bytes]  # Хэши групп; у пустой группы — пустая строка
+
+
+@dataclass(frozen=True, slots=True)
+class ReportDigest:
+    """Дайджест отчёта."""
+
+    root: bytes
+    kinds: dict[RecordKind, KindDigest]
+    parser_version: int = PARSER_VERSION
+    # Размер, время изменения и хэш файла отчёта, по которым проверяется,
+    # что дайджест рядом с отчётом не устарел
+    file_size: int = 0
+    file_mtime_ns: int = 0
+    file_hash: bytes = b""
+
+    def is_comparable(self, other: "ReportDigest") -> bool:
+        """Признак того, что дайджесты построены одинаково и их можно сравнить."""
+        return self.parser_version == other.parser_version and list(self.kinds) == list(
+            other.kinds
+        )
+
+
+def make_digest(
+    records: RecordStore,
+    compare_comps: bool,
+    compare_loads: bool,
+    file_stat: os.stat_result | None = None,
+    file_hash: bytes = b"",
+) -> ReportDigest:
+    """
+    Строит дайджест результата разбора отчёта.
+    Запись группы — строка «название, версия, размер» через табуляцию.
+    :param file_stat: Состояние файла отчёта при разборе.
+    :param file_hash: Хэш содержимого файла отчёта (см. get_file_digest).
+    """
+    kinds = get_digest_kinds(compare_comps, compare_loads)
+    lines: dict[int, list[list[str]]] = {
+        kind: [[] for _ in range(c.DIGEST_BUCKETS)] for kind in kinds
+    }
+    names, stamps, stamp_ids, sizes = (
+        records.names,
+        records.stamps,
+        records.stamp_ids,
+        records.sizes,
+    )
+    for row in records.get_sorted_rows():
+        name = names[row]
+        lines[records.kinds[row]][get_bucket(name)].append(
+            f"{name}\t{stamps[stamp_ids[row]]}\t{sizes[row]}\n"
+        )
+
+    kind_digests = {}
+    for kind in kinds:
+        buckets = [
+            get_hash("".join(bucket).encode()) if bucket else b""
+            for bucket in lines[kind]
+        ]
+        count = sum(map(len, lines[kind]))
+        kind_digests[kind] = KindDigest(
+            count, get_hash(b"".join(buckets) + str(count).encode()), buckets
+        )
+    root = get_hash(b"".join(bytes([kind]) + kind_digests[kind].hash for kind in kinds))
+    return ReportDigest(
+        root,
+        kind_digests,
+        PARSER_VERSION,
+        file_stat.st_size if file_stat is not None else 0,
+        file_stat.st_mtime_ns if file_stat is not None else 0,
+        file_hash,
+    )
+
+
+def dumps_digest(digest: ReportDigest) -> str:
+    """Записывает дайджест в формате JSON (хэши — шестнадцатеричными строками)."""
+    return json.dumps(
+        {
+            "format": DIGEST_FORMAT,
+            "parser": digest.parser_version,
+            "file": [digest.file_size, digest.file_mtime_ns, digest.file_hash.hex()],
+            "root": digest.root.hex(),
+            "kinds": {
+                kind.name: {
+                    "count": kind_digest.count,
+                    "hash": kind_digest.hash.hex(),
+                    "buckets": [bucket.hex() for bucket in kind_digest.buckets],
+                }
+                for kind, kind_digest in digest.kinds.items()
+            },
+        },
+        separators=(",", ":"),
+    )
+
+
+def loads_digest(text: str) -> ReportDigest:
+    """
+    Читает дайджест в формате JSON.
+    :raises ValueError: Если формат дайджеста неизвестен или данные повреждены.
+    """
+    try:
+        data = json.loads(text)
+        if data["format"] != DIGEST_FORMAT:
+            raise ValueError(f"неизвестный формат дайджеста {data['format']}")
+        kinds = {
+            RecordKind[name]: KindDigest(
+                int(kind_data["count"]),
+                bytes.fromhex(kind_data["hash"]),
+                [bytes.fromhex(bucket) for bucket in kind_data["buckets"]],
+            )
+            for name, kind_data in data["kinds"].items()
+        }
+        if any(len(kind.buckets) != c.DIGEST_BUCKETS for kind in kinds.values()):
+            raise ValueError("другое число групп записей")
+        file_size, file_mtime_ns, file_hash = data["file"]
+        return ReportDigest(
+            bytes.fromhex(data["root"]),
+            kinds,
+            int(data["parser"]),
+            int(file_size),
+            int(file_mtime_ns),
+            bytes.fromhex(file_hash),
+        )
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"повреждённый дайджест: {e!r}") from None
+
+
+def get_digest_path(file_path: str) -> str:
+    """Путь к файлу дайджеста отчёта."""
+    return file_path + c.DIGEST_SUFFIX
+
+
+def is_digest_path(file_path: str) -> bool:
+    """Признак того, что файл — дайджест, а не отчёт."""
+    return file_path.endswith(c.DIGEST_SUFFIX)
+
+
+def read_digest(digest_path: str) -> ReportDigest:
+    """Читает файл дайджеста. Ошибки чтения и формата не перехватываются."""
+    try:
+        return loads_digest(Path(digest_path).read_text(encoding="utf-8"))
+    except ValueError as e:
+        raise ValueError(f"{digest_path}: {e}") from None
+
+
+def digest_report(
+    file_path: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    parse_function: Callable[..., RecordStore] = parse_file_cached,
+) -> ReportDigest:
+    """
+    Разбирает отчёт, строит его дайджест и записывает его в файл рядом с отчётом
+    (атомарно: временный файл переименовывается).
+    :param parse_function: Функция разбора отчёта с параметрами parse_file.
+    """
+    file_stat = os.stat(file_path)
+    file_hash = get_file_digest(file_path)
+    records = parse_function(file_path, compare_comps, compare_loads)
+    digest = make_digest(records, compare_comps, compare_loads, file_stat, file_hash)
+    write_entry(Path(get_digest_path(file_path)), dumps_digest(digest).encode())
+    return digest
+
+
+def load_report_digest(
+    file_path: str, compare_comps: bool, compare_loads: bool
+) -> ReportDigest | None:
+    """
+    Возвращает дайджест отчёта, не разбирая его.
+    Файл дайджеста (c.DIGEST_SUFFIX) читается как есть, ошибки не перехватываются.
+    Для отчёта используется файл дайджеста рядом с ним, если он построен для тех же
+    видов записей и не устарел: у отчёта те же размер и время изменения
+    или, если время изменилось, то же содержимое.
+    :return: Дайджест или None, если у отчёта нет действительного дайджеста.
+    """
+    if is_digest_path(file_path):
+        return read_digest(file_path)
+
+    try:
+        digest = read_digest(get_digest_path(file_path))
+        file_stat = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+    if (
+        digest.parser_version != PARSER_VERSION
+        or list(digest.kinds) != get_digest_kinds(compare_comps, compare_loads)
+        or digest.file_size != file_stat.st_size
+    ):
+        return None
+    if digest.file_mtime_ns != file_stat.st_mtime_ns:
+        # Отчёт мог быть скопирован заново без изменения содержимого
+        try:
+            if get_file_digest(file_path) != digest.file_hash:
+                return None
+        except OSError:
+            return None
+    return digest
+
+
+def compare_digests(digest1: ReportDigest, digest2: ReportDigest) -> list[Subtree]:
+    """
+    Сравнивает дайджесты.
+    :return: Группы записей с разными хэшами; пустой список — записи отчётов совпадают.
+    :raises ValueError: Если дайджесты построены по-разному (см. is_comparable).
+    """
+    if not digest1.is_comparable(digest2):
+        raise ValueError("дайджесты построены для разных видов записей или разборов")
+    if digest1.root == digest2.root:
+        return []
+    subtrees = []
+    for kind, kind_digest1 in digest1.kinds.items():
+        kind_digest2 = digest2.kinds[kind]
+        if kind_digest1.hash == kind_digest2.hash:
+            continue
+        subtrees.extend(
+            (kind, bucket)
+            for bucket, (hash1, hash2) in enumerate(
+                zip(kind_digest1.buckets, kind_digest2.buckets)
+            )
+            if hash1 != hash2
+        )
+    return subtrees
+
+
+def select_records(records: RecordStore, subtrees: Iterable[Subtree]) -> RecordStore:
+    """Записи, попадающие в заданные группы."""
+    selected = set(subtrees)
+    result = RecordStore()
+    names, stamps, stamp_ids, sizes = (
+        records.names,
+        records.stamps,
+        records.stamp_ids,
+        records.sizes,
+    )
+    for row, kind in enumerate(records.kinds):
+        name = names[row]
+        if (kind, get_bucket(name)) in selected:
+            result.add(kind, name, stamps[stamp_ids[row]], sizes[row])
+    result.release_index()
+    return result
+
+
+def diff_reports(
+    file_path1: str,
+    file_path2: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    parse_function: Callable[..., RecordStore] = parse_file_cached,
+) -> list[DiffEntry]:
+    """
+    Сравнивает два отчёта, используя их дайджесты (см. load_report_digest).
+    Если дайджесты совпадают, отчёты не разбираются; если отличаются —
+    сравниваются только записи отличающихся групп. Без дайджестов отчёты
+    сравниваются целиком. Вместо отчёта можно задать файл его дайджеста:
+    тогда отличия можно найти только при совпадении дайджестов.
+
+    Returns:
+        list[DiffEntry]: Отличия в порядке merge_diff.
+
+    Raises:
+        ValueError: Если дайджест отличается от дайджеста второго отчёта или
+            построен по-другому, а отчёта, по которому он построен, нет.
+        Exception: Если возникает ошибка при чтении файлов.
+    """
+    file_paths = (file_path1, file_path2)
+    digests = [
+        load_report_digest(file_path, compare_comps, compare_loads)
+        for file_path in file_paths
+    ]
+
+    subtrees = None
+    digest1, digest2 = digests
+    if digest1 is not None and digest2 is not None and digest1.is_comparable(digest2):
+        subtrees = compare_digests(digest1, digest2)
+        if not subtrees:
+            return []
+
+    for file_path in file_paths:
+        if is_digest_path(file_path):
+            detail = (
+                f"отличаются группы записей: {len(subtrees)}"
+                if subtrees is not None
+                else "дайджесты нельзя сравнить"
+            )
+            raise ValueError(f"{file_path}: для поиска отличий нужен отчёт ({detail})")
+
+    records1, records2 = (
+        parse_function(file_path, compare_comps, compare_loads)
+        for file_path in file_paths
+    )
+    if subtrees is not None:
+        records1 = select_records(records1, subtrees)
+        records2 = select_records(records2, subtrees)
+    return list(merge_diff(records1, records2))
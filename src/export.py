@@ -0,0 +1,183 @@
+"""
+Модуль формирует строки результата сравнения отчётов и записывает их в файлы.
+Не зависит от PyQt6: используется и окном программы, и пакетным режимом.
+"""
+
+import csv
+import os
+import tempfile
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.compare import VS, DiffEntry
+import src.functions as f
+from src.constants import Constant as c
+
+if TYPE_CHECKING:
+    from src.fleet import FleetResult
+    from src.report_matrix import ReportMatrix
+
+DiffRow = list[str | int]
+
+
+def make_rows_from_diff(diff: Iterable[DiffEntry]) -> list[DiffRow]:
+    """
+    Формирует строки таблицы результатов сравнения отчётов (столбцы
+    c.LIST_HEADER_COLUMNS) из отличий в порядке их получения (см. merge_diff).
+    """
+    rows = []
+    for _, name, state1, state2 in diff:
+        if state1 is None:
+            rows.append([name, "", state2.stamp, "", state2.size])
+        elif state2 is None:
+            rows.append([name, state1.stamp, "", state1.size, ""])
+        else:
+            rows.append([name, state1.stamp, state2.stamp, state1.size, state2.size])
+    return rows
+
+
+def make_matrix_header(report_names: list[str]) -> list[str]:
+    """Формирует шапку таблицы сравнения нескольких отчётов:
+    пара столбцов (версия, размер) для каждого отчёта."""
+    header = [c.LIST_HEADER_COLUMNS[0]]
+    for report_name in report_names:
+        header.append(f"{report_name}\n{c.TEXT_HEADER_STAMP}")
+        header.append(f"{report_name}\n{c.TEXT_HEADER_SIZE}")
+    return header
+
+
+def make_matrix_rows(matrix: "ReportMatrix") -> list[DiffRow]:
+    """
+    Формирует строки таблицы сравнения нескольких отчётов (см. make_matrix_header)
+    для записей, которые есть не во всех отчётах или различаются в них.
+    """
+    rows = []
+    for name in matrix.get_differing_keys():
+        row: DiffRow = [name]
+        for state in matrix.get_states(name):
+            row.extend(("", "") if state is None else (state.stamp, state.size))
+        rows.append(row)
+    return rows
+
+
+def get_state_values(state: VS | None) -> tuple[str, str | int]:
+    """Версия и размер записи для ячеек таблицы (пустые, если записи нет)."""
+    return ("", "") if state is None else (state.stamp, state.size)
+
+
+def make_fleet_summary_rows(result: "FleetResult") -> list[DiffRow]:
+    """
+    Формирует строки сводной таблицы анализа парка станций
+    (столбцы c.LIST_FLEET_SUMMARY_COLUMNS) для записей, значения которых
+    есть не на всех станциях, по возрастанию ключа.
+    """
+    counters = result.counters
+    rows = []
+    for key in sorted(result.majority):
+        counts = counters.get_counts(key)
+        majority_state = result.majority[key]
+        majority_hosts = counts[majority_state]
+        if majority_hosts == counters.hosts:
+            continue
+        stamp, size = get_state_values(majority_state)
+        rows.append(
+            [
+                key,
+                stamp,
+                size,
+                majority_hosts,
+                counters.hosts - majority_hosts,
+                len(counts),
+            ]
+        )
+    return rows
+
+
+def make_fleet_host_rows(result: "FleetResult") -> Iterator[DiffRow]:
+    """
+    Формирует строки отклонений станций от большинства (столбцы
+    c.LIST_FLEET_HOST_COLUMNS) по станциям и ключам записей.
+    Отклонения станций одной группы одинаковы и хранятся один раз,
+    поэтому строки выдаются по мере записи.
+    """
+    hosts = sorted(
+        (host, number, group)
+        for number, group in enumerate(result.groups, start=1)
+        for host in group.hosts
+    )
+    for host, number, group in hosts:
+        for key, majority_state, state in group.deviations:
+            majority_stamp, majority_size = get_state_values(majority_state)
+            stamp, size = get_state_values(state)
+            yield [host, number, key, majority_stamp, stamp, majority_size, size]
+
+
+def format_value(value: str | int) -> str:
+    """Представление значения ячейки в таблице: размеры — с разделителями разрядов."""
+    if isinstance(value, int):
+        return f"{value:,}".replace(",", "'")
+    return str(value)
+
+
+def write_csv(
+    file_path: str | Path,
+    rows: Iterable[Sequence[str | int]],
+    header: list[str] = c.LIST_HEADER_COLUMNS,
+) -> int:
+    """
+    Записывает строки результата сравнения в CSV файл, открываемый в Microsoft Excel.
+    Если отличий нет, записывается сообщение об удачном сравнении, как в таблице окна.
+    Строки пишутся по мере получения во временный файл в том же каталоге,
+    который затем атомарно переименовывается: недописанный файл не появляется
+    под именем результата.
+    :param file_path: Путь к файлу.
+    :param rows: Строки результата (см. make_rows_from_diff, make_matrix_rows).
+    :param header: Шапка таблицы.
+    :return: Размер записанного файла в байтах.
+    """
+    file_path = Path(file_path)
+    fd, temp_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=file_path.stem, suffix=".tmp"
+    )
+    try:
+        with open(fd, "w", newline="", encoding="utf-8-sig") as csv_file:
+            writer = csv.writer(csv_file, delimiter=";")
+            writer.writerow(header)
+            is_empty = True
+            for row in rows:
+                writer.writerow([format_value(value) for value in row])
+                is_empty = False
+            if is_empty:
+                writer.writerow([c.TEXT_SUCCESSFUL_COMPARISON])
+            csv_file.flush()
+            size = os.fstat(csv_file.fileno()).st_size
+        f.set_new_file_mode(temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return size
+
+
+def write_table(
+    file_path: str | Path,
+    rows: Iterable[Sequence[str | int]],
+    header: list[str] = c.LIST_HEADER_COLUMNS,
+) -> int:
+    """
+    Записывает строки результата сравнения в книгу Excel, если расширение файла
+    c.XLSX_SUFFIX (см. src.xlsx.write_xlsx), иначе в CSV файл (см. write_csv).
+    :return: Размер записанного файла в байтах.
+    """
+    if is_xlsx_path(file_path):
+        from src.xlsx import write_xlsx
+
+        return write_xlsx(file_path, rows, header)
+    return write_csv(file_path, rows, header)
+
+
+def is_xlsx_path(file_path: str | Path) -> bool:
+    """Признак того, что результат записывается в книгу Excel."""
+    return Path(file_path).suffix.lower() == c.XLSX_SUFFIX
@@ -0,0 +1,190 @@
+"""
+Модуль содержит индекс строк таблицы результатов для фильтрации по мере ввода.
+
+Фильтр (RowFilter) задаётся фрагментом названия записи, видом записи
+(компонент или загруженный модуль) и видом отличия. Для каждой строки заранее
+вычисляются название без префикса вида в свёрнутом регистре (str.casefold)
+и байт признаков: по биту на вид записи и на вид отличия. Строки, подходящие
+по признакам, отбираются преобразованием массива признаков (bytes.translate)
+без цикла на Python, по фрагменту — проверкой вхождения в подготовленные названия.
+Пока фрагмент дополняется при наборе, проверяются только строки, подходившие
+под предыдущий фильтр (RowFilter.narrows).
+"""
+
+import itertools
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from src.compare import DiffKind
+from src.record_store import PREFIX_KINDS, PREFIX_LENGTH, RecordKind
+
+# Биты признаков строки: вид записи и вид отличия
+KIND_FLAGS = {RecordKind.COMPONENT: 0x01, RecordKind.LOAD: 0x02}
+DIFF_KIND_FLAGS = {
+    DiffKind.ONLY_IN_1: 0x04,
+    DiffKind.ONLY_IN_2: 0x08,
+    DiffKind.DIFFERENT: 0x10,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RowFilter:
+    """Фильтр строк таблицы. Пустые условия не ограничивают строки."""
+
+    text: str = ""  # Фрагмент названия записи (без учёта регистра)
+    kind: RecordKind | None = None
+    diff_kind: DiffKind | None = None
+
+    def is_empty(self) -> bool:
+        return not self.text and self.kind is None and self.diff_kind is None
+
+    def narrows(self, previous: "RowFilter") -> bool:
+        """Признак того, что фильтр пропускает только строки, пропускаемые previous."""
+        return (
+            self.kind == previous.kind
+            and self.diff_kind == previous.diff_kind
+            and previous.text.casefold() in self.text.casefold()
+        )
+
+    def get_flags_table(self) -> bytes:
+        """Таблица bytes.translate: 1 для значений признаков, подходящих под фильтр."""
+        # Без условия строка подходит при любых признаках, в том числе без них
+        kind_mask = 0 if self.kind is None else KIND_FLAGS[self.kind]
+        diff_mask = 0 if self.diff_kind is None else DIFF_KIND_FLAGS[self.diff_kind]
+        return bytes(
+            (not kind_mask or bool(flags & kind_mask))
+            and (not diff_mask or bool(flags & diff_mask))
+            for flags in range(256)
+        )
+
+
+def get_row_filter_data(
+    row: Sequence[str | int], stamp_columns: tuple[int, int] | None
+) -> tuple[str, int]:
+    """
+    Название и признаки строки таблицы.
+    :param row: Строка таблицы; в первом столбце — ключ записи (префикс вида и название).
+    :param stamp_columns: Столбцы версий первого и второго отчёта, по пустым
+                          значениям которых определяется вид отличия.
+                          Без них признаков вида отличия у строки нет.
+    """
+    key = str(row[0]) if row else ""
+    kind = PREFIX_KINDS.get(key[:PREFIX_LENGTH])
+    if kind is None:
+        name, flags = key, 0
+    else:
+        name, flags = key[PREFIX_LENGTH:], KIND_FLAGS[kind]
+
+    if stamp_columns is not None and len(row) > max(stamp_columns):
+        stamp1, stamp2 = (row[column] for column in stamp_columns)
+        if stamp1 == "":
+            flags |= DIFF_KIND_FLAGS[DiffKind.ONLY_IN_2]
+        elif stamp2 == "":
+            flags |= DIFF_KIND_FLAGS[DiffKind.ONLY_IN_1]
+        else:
+            flags |= DIFF_KIND_FLAGS[DiffKind.DIFFERENT]
+    return name.casefold(), flags
+
+
+class FilterIndex:
+    """
+    Названия и признаки строк таблицы в порядке строк модели.
+    Модель изменяет индекс вместе со своими строками (удаление, добавление,
+    изменение, перестановка), поэтому номера строк индекса — номера строк модели.
+    """
+
+    __slots__ = ("names", "flags", "stamp_columns")
+
+    def __init__(
+        self,
+        rows: Iterable[Sequence[str | int]] = (),
+        stamp_columns: tuple[int, int] | None = None,
+    ) -> None:
+        self.stamp_columns = stamp_columns
+        self.names: list[str] = []
+        self.flags = bytearray()
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def extend(self, rows: Iterable[Sequence[str | int]]) -> None:
+        """
+        Добавляет строки в конец.
+        Строки таблицы сравнения двух отчётов обрабатываются одним проходом
+        без вызова get_row_filter_data: индекс строится для всей таблицы сразу.
+        """
+        if self.stamp_columns is None:
+            for row in rows:
+                name, flags = get_row_filter_data(row, None)
+                self.names.append(name)
+                self.flags.append(flags)
+            return
+
+        column1, column2 = self.stamp_columns
+        kind_flags = {prefix: KIND_FLAGS[kind] for prefix, kind in PREFIX_KINDS.items()}
+        only_in_1 = DIFF_KIND_FLAGS[DiffKind.ONLY_IN_1]
+        only_in_2 = DIFF_KIND_FLAGS[DiffKind.ONLY_IN_2]
+        different = DIFF_KIND_FLAGS[DiffKind.DIFFERENT]
+        names_append, flags_append = self.names.append, self.flags.append
+        last_column = max(column1, column2)
+        for row in rows:
+            if len(row) <= last_column:  # Например, строка сообщения
+                name, flags = get_row_filter_data(row, self.stamp_columns)
+                names_append(name)
+                flags_append(flags)
+                continue
+            key = row[0]
+            flags = kind_flags.get(key[:PREFIX_LENGTH])
+            if flags is None:
+                names_append(key.casefold())
+                flags = 0
+            else:
+                names_append(key[PREFIX_LENGTH:].casefold())
+            if row[column1] == "":
+                flags |= only_in_2
+            elif row[column2] == "":
+                flags |= only_in_1
+            else:
+                flags |= different
+            flags_append(flags)
+
+    def delete(self, first: int, last: int) -> None:
+        """Удаляет строки с first по last включительно."""
+        del self.names[first : last + 1]
+        del self.flags[first : last + 1]
+
+    def set_row(self, row: int, values: Sequence[str | int]) -> None:
+        """Заменяет данные строки row."""
+        self.names[row], self.flags[row] = get_row_filter_data(
+            values, self.stamp_columns
+        )
+
+    def reorder(self, order_rows: Sequence[int]) -> None:
+        """Переставляет строки: новая строка i — прежняя строка order_rows[i]."""
+        names, flags = self.names, self.flags
+        self.names = [names[row] for row in order_rows]
+        self.flags = bytearray(flags[row] for row in order_rows)
+
+    def match(
+        self, row_filter: RowFilter, rows: Iterable[int] | None = None
+    ) -> list[int]:
+        """
+        Возвращает номера строк, подходящих под фильтр, по возрастанию.
+        :param rows: Проверяемые строки по возрастанию (по умолчанию все), например
+                     результат фильтра, который уточняет row_filter (см. RowFilter.narrows).
+        """
+        table = row_filter.get_flags_table()
+        if rows is None:
+            candidates: Iterable[int] = itertools.compress(
+                range(len(self.names)), self.flags.translate(table)
+            )
+        else:
+            flags = self.flags
+            candidates = [row for row in rows if table[flags[row]]]
+
+        text = row_filter.text.casefold()
+        if not text:
+            return list(candidates)
+        names = self.names
+        return [row for row in candidates if text in names[row]]
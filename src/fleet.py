@@ -0,0 +1,226 @@
+"""
+Модуль анализирует отчёты парка рабочих станций без эталонного отчёта.
+
+Эталоном служит большинство: для каждой записи определяется значение (VS),
+которое встречается на наибольшем числе станций, а отклонениями станции
+считаются её записи с другим значением, лишние и недостающие записи.
+Отчёты разбираются пулом процессов и сворачиваются в счётчики значений
+каждой записи (FleetCounters), поэтому объём памяти определяется числом
+различных значений, а не числом станций. Станции с одинаковым набором
+записей (отпечатком) объединяются в группы: отклонения вычисляются один раз
+для группы, для чего отчёт её первой станции разбирается повторно (обычно
+результат берётся из кэша разбора).
+Модуль не импортирует PyQt6.
+"""
+
+import hashlib
+import itertools
+import os
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.compare import VS, RecordStore
+from src.constants import Constant as c
+from src.parse_cache import parse_file_cached
+from src.record_store import get_stamp_key
+
+
+def get_fingerprint(records: RecordStore) -> bytes:
+    """Отпечаток набора записей: хэш записей в порядке ключей."""
+    digest = hashlib.blake2b(digest_size=16)
+    stamps = records.stamps
+    for row in records.get_sorted_rows():
+        digest.update(
+            f"{records.kinds[row]}\t{records.names[row]}\t"
+            f"{stamps[records.stamp_ids[row]]}\t{records.sizes[row]}\n".encode()
+        )
+    return digest.digest()
+
+
+def parse_fleet_report(
+    file_path: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    parse_function: Callable[..., RecordStore] = parse_file_cached,
+) -> tuple[bytes, RecordStore]:
+    """Разбирает отчёт станции (задание процесса разбора). Возвращает отпечаток и записи."""
+    records = parse_function(file_path, compare_comps, compare_loads)
+    return get_fingerprint(records), records
+
+
+class FleetCounters:
+    """Счётчики станций для каждого значения каждой записи."""
+
+    def __init__(self) -> None:
+        self.hosts = 0
+        # Ключ записи: {значение: число станций с этим значением}
+        self.values: dict[str, dict[VS, int]] = {}
+
+    def add_report(self, records: Mapping[str, VS]) -> None:
+        """Добавляет записи отчёта очередной станции."""
+        self.hosts += 1
+        values = self.values
+        for key, state in records.items():
+            counts = values.get(key)
+            if counts is None:
+                values[key] = {state: 1}
+            else:
+                counts[state] = counts.get(state, 0) + 1
+
+    def get_counts(self, key: str) -> dict[VS | None, int]:
+        """Число станций с каждым значением записи; None — станции без записи."""
+        counts: dict[VS | None, int] = dict(self.values[key])
+        absent = self.hosts - sum(counts.values())
+        if absent:
+            counts[None] = absent
+        return counts
+
+    def get_majority(self) -> dict[str, VS | None]:
+        """Значения большинства станций для каждой записи (None — у большинства записи нет)."""
+        return {
+            key: max(self.get_counts(key).items(), key=get_majority_order)[0]
+            for key in self.values
+        }
+
+
+def get_majority_order(item: tuple[VS | None, int]) -> tuple[int, int, int]:
+    """
+    Ключ выбора значения большинства: число станций, а при равенстве —
+    наличие записи, бо́льшая версия (см. get_stamp_key) и бо́льший размер.
+    """
+    state, count = item
+    if state is None:
+        return count, -1, -1
+    return count, get_stamp_key(state.stamp), state.size
+
+
+# Отклонение станции: ключ записи, значение большинства, значение станции
+Deviation = tuple[str, VS | None, VS | None]
+
+
+def get_deviations(
+    records: Mapping[str, VS], majority: Mapping[str, VS | None]
+) -> list[Deviation]:
+    """Отклонения записей станции от большинства по возрастанию ключа."""
+    deviations = []
+    for key, majority_state in majority.items():
+        state = records.get(key)
+        if state != majority_state:
+            deviations.append((key, majority_state, state))
+    deviations.sort(key=lambda deviation: deviation[0])
+    return deviations
+
+
+@dataclass(slots=True)
+class FleetGroup:
+    """Станции с одинаковым набором записей."""
+
+    fingerprint: bytes
+    file_paths: list[str] = field(default_factory=list)  # Отчёты станций
+    deviations: list[Deviation] = field(default_factory=list)
+
+    @property
+    def hosts(self) -> list[str]:
+        """Названия станций — имена файлов их отчётов."""
+        return [Path(file_path).stem for file_path in self.file_paths]
+
+
+@dataclass(frozen=True, slots=True)
+class FleetResult:
+    """Результат анализа парка станций."""
+
+    counters: FleetCounters
+    majority: dict[str, VS | None]
+    groups: list[FleetGroup]  # В порядке первых станций групп
+
+
+def iter_parsed_reports(
+    executor: Executor,
+    file_paths: Sequence[str],
+    compare_comps: bool,
+    compare_loads: bool,
+    parse_function: Callable[..., RecordStore],
+    window: int,
+) -> Iterator[tuple[bytes, RecordStore]]:
+    """
+    Разбирает отчёты в пуле (см. parse_fleet_report) и выдаёт результаты
+    в порядке file_paths. Одновременно разбирается не больше window отчётов,
+    чтобы ещё не обработанные результаты не накапливались в памяти.
+    """
+
+    def submit(file_path: str) -> Future:
+        return executor.submit(
+            parse_fleet_report, file_path, compare_comps, compare_loads, parse_function
+        )
+
+    paths = iter(file_paths)
+    pending = deque(submit(file_path) for file_path in itertools.islice(paths, window))
+    while pending:
+        result = pending.popleft().result()
+        pending.extend(submit(file_path) for file_path in itertools.islice(paths, 1))
+        yield result
+
+
+def analyze_fleet(
+    file_paths: Sequence[str],
+    compare_comps: bool,
+    compare_loads: bool,
+    max_workers: int | None = None,
+    parse_function: Callable[..., RecordStore] = parse_file_cached,
+) -> FleetResult:
+    """
+    Определяет значения большинства станций и отклонения от них.
+
+    Args:
+        file_paths (Sequence[str]): Пути к отчётам станций
+        compare_comps (bool): Признак того, что надо сравнивать компоненты
+        compare_loads (bool): Признак того, что надо сравнивать загрузки
+        max_workers (int | None): Число процессов разбора (по умолчанию
+            по числу процессоров).
+        parse_function (Callable[..., RecordStore]): Функция разбора отчёта
+            с параметрами parse_file.
+
+    Returns:
+        FleetResult: Счётчики значений, значения большинства и группы станций
+            с одинаковыми отчётами и их отклонениями.
+
+    Raises:
+        Exception: Ошибка разбора первого по порядку отчёта, разбор которого не удался.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    window = c.FLEET_PENDING_PER_WORKER * max_workers
+
+    counters = FleetCounters()
+    groups: dict[bytes, FleetGroup] = {}
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        # Результаты разбора освобождаются сразу после добавления в счётчики
+        parsed = iter_parsed_reports(
+            executor, file_paths, compare_comps, compare_loads, parse_function, window
+        )
+        for file_path, (fingerprint, records) in zip(file_paths, parsed):
+            counters.add_report(records)
+            group = groups.setdefault(fingerprint, FleetGroup(fingerprint))
+            group.file_paths.append(file_path)
+
+        majority = counters.get_majority()
+        group_list = list(groups.values())
+        parsed = iter_parsed_reports(
+            executor,
+            [group.file_paths[0] for group in group_list],
+            compare_comps,
+            compare_loads,
+            parse_function,
+            window,
+        )
+        for group, (_, records) in zip(group_list, parsed):
+            group.deviations = get_deviations(records, majority)
+    finally:
+        # После ошибки разбор остальных отчётов не дожидаемся
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return FleetResult(counters, majority, group_list)
@@ -1,15 +1,25 @@
 """
-Модуль содержит автономные функции
+Модуль содержит автономные функции.
+
+Модуль не импортирует PyQt6 при загрузке: он нужен и программам без графического
+интерфейса. Функции, работающие с окнами, импортируют PyQt6 при вызове.
 """
 
+import os
 from pathlib import Path
 import sys
-
-from PyQt6.QtWidgets import QPushButton, QMessageBox
-from PyQt6.QtCore import QTimer
+from typing import TYPE_CHECKING
 
 from src.constants import Constant as c
 
+if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QPushButton
+
+# Маска прав создаваемых файлов. Читается при загрузке модуля, до запуска потоков:
+# os.umask меняет маску всего процесса
+UMASK = os.umask(0)
+os.umask(UMASK)
+
 
 def set_bold(widget) -> None:
     """
@@ -22,7 +32,7 @@ def set_bold(widget) -> None:
     widget.setFont(font)
 
 
-def highlight_button_if_no_file(button: QPushButton) -> bool:
+def highlight_button_if_no_file(button: "QPushButton") -> bool:
     """
     Метод вызывают при ошибочных действиях пользователя.
     Устанавливает стиль кнопки, по нажатию которой надо исправить ошибку и возвращает False.
@@ -39,7 +49,7 @@ def get_downloads_path() -> str:
     return str(Path.home() / c.DOWNLOADS)
 
 
-def set_focus(btn: QPushButton | None) -> None:
+def set_focus(btn: "QPushButton | None") -> None:
     """
     Устанавливает фокус на требуемую кнопку
     :param btn: Кнопка
@@ -49,6 +59,15 @@ def set_focus(btn: QPushButton | None) -> None:
         btn.setFocus()
 
 
+def set_new_file_mode(file_path: str | Path) -> None:
+    """
+    Устанавливает файлу права, с которыми создаётся обычный файл (0o666 с учётом
+    маски). Временные файлы tempfile.mkstemp доступны только владельцу:
+    права устанавливаются перед переименованием временного файла в итоговый.
+    """
+    os.chmod(file_path, 0o666 & ~UMASK)
+
+
 def get_base_dir(folder_level: int = 1) -> Path:
     """
     Структура проекта:
@@ -84,6 +103,9 @@ def show_message(parent, text: str, wait: int) -> None:
     wait - максимальное время нахождения сообщения на экране в мс
     Если wait <= 0, сообщение не показывается.
     """
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QMessageBox
+
     # Создаём окно сообщения
     msg_box = QMessageBox(parent)
     msg_box.setText(text)
@@ -91,3 +113,16 @@ def show_message(parent, text: str, wait: int) -> None:
 
     # Для закрытия окна устанавливаем таймер
     QTimer.singleShot(wait, msg_box.accept)
+
+
+def show_warning(title: str, text: str) -> None:
+    """
+    Показывает предупреждение в окне, если программа работает с графическим
+    интерфейсом, иначе выводит его в поток ошибок.
+    PyQt6 при этом не импортируется, если он ещё не загружен.
+    """
+    qt_widgets = sys.modules.get("PyQt6.QtWidgets")
+    if qt_widgets is not None and qt_widgets.QApplication.instance() is not None:
+        qt_widgets.QMessageBox.warning(None, title, text)
+    else:
+        print(f"{title}: {text}", file=sys.stderr)
@@ -0,0 +1,174 @@
+"""
+Модуль содержит замеры этапов сравнения отчётов и сохранения результата.
+
+Этап (разбор отчётов, сравнение, заполнение таблицы, запись CSV) замеряется
+именованным интервалом StageTimer.span: время выполнения и, если включено
+отслеживание памяти (переменная окружения c.TRACE_MEMORY_ENV), наибольший
+объём памяти, выделенной на этапе (tracemalloc). Отслеживание памяти замедляет
+разбор отчётов в несколько раз, поэтому по умолчанию выключено; память,
+выделенная в процессах разбора, не учитывается. Замеры вместе со счётчиками
+разбора (ParseStats) показываются в строке состояния окна и дописываются
+строкой JSON в журнал c.METRICS_LOG_FILE в каталоге кэша.
+Переменная окружения c.PROFILE_ENV включает профилирование сравнения (cProfile);
+профиль записывается в файл .prof рядом с файлом результата.
+Модуль не импортирует PyQt6.
+"""
+
+import cProfile
+import dataclasses
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from src.compare import ParseStats
+from src.constants import Constant as c
+from src.export import format_value
+from src.parse_cache import get_cache_dir
+
+# Расширение файла профиля cProfile
+PROFILE_SUFFIX = ".prof"
+
+
+def is_env_enabled(name: str) -> bool:
+    """Признак того, что переменная окружения задана и не равна 0."""
+    return os.environ.get(name, "") not in ("", "0")
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    """Замер этапа."""
+
+    name: str  # Ключ c.METRICS_SPAN_TITLES
+    seconds: float
+    peak: int | None  # Наибольший объём выделенной на этапе памяти (байт)
+
+
+class StageTimer:
+    """
+    Замеры этапов одного сравнения отчётов, счётчики их разбора и профиль.
+    Этапы замеряются по очереди: отслеживание памяти сбрасывает наибольший
+    объём памяти всего процесса в начале каждого этапа.
+    """
+
+    __slots__ = ("spans", "counters", "trace_memory", "profile")
+
+    def __init__(self, trace_memory: bool | None = None) -> None:
+        """
+        :param trace_memory: Признак отслеживания памяти; по умолчанию —
+                             по переменной окружения c.TRACE_MEMORY_ENV.
+        """
+        if trace_memory is None:
+            trace_memory = is_env_enabled(c.TRACE_MEMORY_ENV)
+        self.trace_memory = trace_memory
+        self.spans: list[Span] = []
+        self.counters: dict[str, int] = {}
+        self.profile: cProfile.Profile | None = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Замеряет этап name. Этап замеряется и при возникновении исключения."""
+        start_memory = 0
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = None
+            if self.trace_memory:
+                peak = max(0, tracemalloc.get_traced_memory()[1] - start_memory)
+            self.spans.append(Span(name, seconds, peak))
+
+    def add_parse_stats(self, stats: Sequence[ParseStats]) -> None:
+        """Добавляет счётчики разбора отчётов."""
+        for report_stats in stats:
+            for field in dataclasses.fields(report_stats):
+                name = field.name
+                self.counters[name] = self.counters.get(name, 0) + getattr(
+                    report_stats, name
+                )
+
+    def start_profile(self) -> None:
+        """Включает профилирование вызывающего потока, если задана переменная
+        окружения c.PROFILE_ENV."""
+        if is_env_enabled(c.PROFILE_ENV):
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def stop_profile(self) -> None:
+        if self.profile is not None:
+            self.profile.disable()
+
+    def dump_profile(self, result_path: str | Path) -> Path | None:
+        """
+        Записывает профиль в файл рядом с файлом результата.
+        :return: Путь к файлу профиля или None, если профилирование не включено.
+        """
+        if self.profile is None:
+            return None
+        profile_path = Path(result_path).with_suffix(PROFILE_SUFFIX)
+        self.profile.dump_stats(profile_path)
+        return profile_path
+
+    def format_summary(self) -> str:
+        """Замеры и счётчики для строки состояния."""
+        parts = []
+        for span in self.spans:
+            text = f"{c.METRICS_SPAN_TITLES.get(span.name, span.name)} {span.seconds:.2f} с"
+            if span.peak is not None:
+                text += f" ({span.peak / 1024 / 1024:.1f} МБ)"
+            parts.append(text)
+        summary = ", ".join(parts)
+        counters = ", ".join(
+            f"{title} {format_value(self.counters[name])}"
+            for name, title in c.METRICS_COUNTER_TITLES.items()
+            if name in self.counters
+        )
+        return f"{summary}; {counters}" if counters else summary
+
+    def to_record(self, event: str, **fields: object) -> dict[str, object]:
+        """Запись журнала: событие, его параметры, замеры и счётчики."""
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "event": event,
+            **fields,
+            "spans": [dataclasses.asdict(span) for span in self.spans],
+            "counters": self.counters,
+        }
+
+
+def get_log_path() -> Path:
+    """Путь к журналу замеров."""
+    return get_cache_dir() / c.METRICS_LOG_FILE
+
+
+def append_log(record: dict[str, object], log_path: Path | None = None) -> None:
+    """
+    Дописывает запись в журнал замеров строкой JSON. Журнал больше
+    c.METRICS_LOG_MAX_SIZE переименовывается в резервный (расширение .1),
+    и записи пишутся в новый. Ошибки записи журнала не мешают работе.
+    """
+    if log_path is None:
+        log_path = get_log_path()
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if log_path.stat().st_size > c.METRICS_LOG_MAX_SIZE:
+                os.replace(log_path, log_path.with_name(log_path.name + ".1"))
+        except FileNotFoundError:
+            pass
+        with open(log_path, "a", encoding="utf-8") as log_file:
+            log_file.write(line)
+    except OSError:
+        pass
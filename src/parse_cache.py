@@ -0,0 +1,268 @@
+"""
+Модуль содержит дисковый кэш результатов разбора файлов отчётов.
+
+Запись кэша соответствует файлу отчёта (абсолютный путь) и параметрам разбора.
+Запись действительна, пока у файла прежние размер и время изменения; при другом
+времени изменения сравнивается хэш содержимого файла. Записи вытесняются
+в порядке давности использования, когда размер кэша превышает c.CACHE_MAX_SIZE.
+Записи пишутся во временный файл и атомарно переименовываются, поэтому кэш
+может использоваться несколькими экземплярами программы одновременно.
+"""
+
+import hashlib
+import marshal
+import os
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+from src.compare import (
+    PARSER_VERSION,
+    ParseEngine,
+    ParseStats,
+    ProgressCallback,
+    RecordStore,
+    parse_file,
+)
+from src.constants import Constant as c
+
+# Расширение файлов записей кэша и временных файлов, в которые они записываются
+ENTRY_SUFFIX = ".bin"
+TEMP_SUFFIX = ".tmp"
+
+
+def get_cache_dir() -> Path:
+    """
+    Возвращает каталог кэша. Его можно задать переменной окружения
+    c.CACHE_DIR_ENV, иначе используется каталог кэшей пользователя.
+    """
+    cache_dir = os.environ.get(c.CACHE_DIR_ENV)
+    if cache_dir:
+        return Path(cache_dir)
+
+    user_cache_dir = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if not user_cache_dir:
+        user_cache_dir = str(Path.home() / ".cache")
+    return Path(user_cache_dir) / c.CACHE_FOLDER
+
+
+def get_entry_path(
+    cache_dir: Path, file_path: str, compare_comps: bool, compare_loads: bool
+) -> Path:
+    """Возвращает путь к записи кэша для файла отчёта и параметров разбора."""
+    key = repr(
+        (
+            os.path.normcase(os.path.abspath(file_path)),
+            compare_comps,
+            compare_loads,
+            PARSER_VERSION,
+            marshal.version,
+        )
+    )
+    name = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return cache_dir / f"{name}{ENTRY_SUFFIX}"
+
+
+def new_digest() -> hashlib.blake2b:
+    """Создаёт хэш содержимого файла отчёта."""
+    return hashlib.blake2b(digest_size=32)
+
+
+def get_file_digest(file_path: str) -> bytes:
+    """Вычисляет хэш содержимого файла."""
+    digest = new_digest()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(c.CACHE_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def pack_records(
+    file_stat: os.stat_result, digest: bytes, records: RecordStore
+) -> bytes:
+    """
+    Упаковывает результат разбора в запись кэша.
+    Столбцы хранилища записываются как есть: версии и даты — таблицей
+    уникальных значений, номера, виды и размеры — массивами целых.
+    """
+    return marshal.dumps(
+        (
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            digest,
+            records.names,
+            records.kinds.tobytes(),
+            records.stamps,
+            records.stamp_ids.tobytes(),
+            records.sizes.tobytes(),
+        )
+    )
+
+
+def unpack_records(
+    data: bytes,
+) -> tuple[int, int, bytes, RecordStore]:
+    """
+    Распаковывает запись кэша.
+    :return: Размер и время изменения файла, хэш его содержимого и результат разбора.
+    """
+    size, mtime_ns, digest, names, kinds_bytes, stamps, stamp_ids_bytes, sizes_bytes = (
+        marshal.loads(data)
+    )
+    kinds = array("B", kinds_bytes)
+    stamp_ids = array("I")
+    stamp_ids.frombytes(stamp_ids_bytes)
+    sizes = array("q")
+    sizes.frombytes(sizes_bytes)
+    try:
+        records = RecordStore.from_columns(names, kinds, stamps, stamp_ids, sizes)
+    except ValueError:
+        raise ValueError("Повреждённая запись кэша") from None
+    return size, mtime_ns, digest, records
+
+
+def write_entry(entry_path: Path, data: bytes) -> None:
+    """
+    Записывает запись кэша атомарно: читатели видят либо прежнюю запись, либо новую.
+    """
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        dir=entry_path.parent, prefix=entry_path.stem, suffix=TEMP_SUFFIX
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, entry_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def evict_entries(cache_dir: Path, max_size: int) -> None:
+    """
+    Удаляет давно не использованные записи кэша, пока его размер больше max_size.
+    Записи, удалённые или используемые другим экземпляром программы, пропускаются.
+    Временные файлы записей старше c.CACHE_TEMP_MAX_AGE остаются от прерванных
+    экземпляров программы и удаляются; более новые могут дописываться другим
+    экземпляром и только учитываются в размере кэша.
+    """
+    temp_size = 0
+    expired_ns = time.time_ns() - c.CACHE_TEMP_MAX_AGE * 10**9
+    for temp_path in cache_dir.glob(f"*{TEMP_SUFFIX}"):
+        try:
+            temp_stat = temp_path.stat()
+            if temp_stat.st_mtime_ns < expired_ns:
+                temp_path.unlink()
+            else:
+                temp_size += temp_stat.st_size
+        except OSError:
+            continue
+
+    entries = []
+    for entry_path in cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+        try:
+            entry_stat = entry_path.stat()
+        except OSError:
+            continue
+        entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry_path))
+
+    total_size = temp_size + sum(entry_size for _, entry_size, _ in entries)
+    for _, entry_size, entry_path in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            entry_path.unlink()
+        except OSError:
+            continue
+        total_size -= entry_size
+
+
+def load_cached(
+    entry_path: Path, file_path: str, file_stat: os.stat_result
+) -> RecordStore | None:
+    """
+    Возвращает результат разбора из кэша или None, если записи нет или она устарела.
+    """
+    try:
+        data = entry_path.read_bytes()
+        size, mtime_ns, digest, records = unpack_records(data)
+    except (OSError, ValueError, EOFError, TypeError):
+        return None  # Записи нет, она повреждена или удалена другим экземпляром
+
+    if size != file_stat.st_size:
+        return None
+    if mtime_ns != file_stat.st_mtime_ns:
+        # Файл мог быть скопирован заново без изменения содержимого
+        if get_file_digest(file_path) != digest:
+            return None
+        store_cached(entry_path, file_stat, digest, records)
+        return records
+
+    try:
+        os.utime(entry_path)  # Время использования записи для вытеснения
+    except OSError:
+        pass
+    return records
+
+
+def store_cached(
+    entry_path: Path,
+    file_stat: os.stat_result,
+    digest: bytes,
+    records: RecordStore,
+) -> None:
+    """Сохраняет результат разбора в кэш. Ошибки записи кэша не мешают работе."""
+    try:
+        write_entry(entry_path, pack_records(file_stat, digest, records))
+        evict_entries(entry_path.parent, c.CACHE_MAX_SIZE)
+    except OSError:
+        pass
+
+
+def parse_file_cached(
+    file_path: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    engine: ParseEngine = ParseEngine.LINES,
+    stats: ParseStats | None = None,
+    progress: ProgressCallback | None = None,
+) -> RecordStore:
+    """
+    Выполняет parse_file, используя кэш результатов разбора.
+    Параметры и результат совпадают с parse_file. При получении результата
+    из кэша из счётчиков stats заполняется только число найденных записей.
+    """
+    if c.CACHE_MAX_SIZE <= 0:
+        return parse_file(
+            file_path, compare_comps, compare_loads, engine, stats, progress
+        )
+
+    file_stat = os.stat(file_path)
+    entry_path = get_entry_path(
+        get_cache_dir(), file_path, compare_comps, compare_loads
+    )
+
+    records = load_cached(entry_path, file_path, file_stat)
+    if records is not None:
+        if stats is not None:
+            stats.matched = len(records)
+        if progress is not None:
+            progress(file_stat.st_size)
+        return records
+
+    # Хэш содержимого вычисляется по байтам, прочитанным при разборе
+    digest = new_digest()
+    records = parse_file(
+        file_path, compare_comps, compare_loads, engine, stats, progress, digest
+    )
+
+    # Файл, изменённый во время разбора, не кэшируется
+    current_stat = os.stat(file_path)
+    if (current_stat.st_size, current_stat.st_mtime_ns) == (
+        file_stat.st_size,
+        file_stat.st_mtime_ns,
+    ):
+        store_cached(entry_path, file_stat, digest.digest(), records)
+
+    return records
@@ -0,0 +1,280 @@
+"""
+Модуль содержит хранилище записей, найденных при разборе отчёта.
+
+Запись — вид (компонент или загруженный модуль), название, версия/дата и размер.
+Записи хранятся по столбцам: вид — номером в массиве байтов, названия — списком
+строк, размеры — массивом целых. Версии и даты сильно повторяются, поэтому
+хранятся таблицей уникальных значений и номерами в ней. Ключ записи (префикс
+вида и название) и объект VS создаются только при обращении к записи,
+поэтому хранилище занимает в несколько раз меньше памяти, чем словарь.
+"""
+
+import functools
+import re
+from array import array
+from collections.abc import ItemsView, Iterator, Mapping, ValuesView
+from dataclasses import dataclass
+from enum import IntEnum
+
+from src.constants import Constant as c
+
+PREFIX_COMPONENT = "C: "
+PREFIX_LOAD = "L: "
+
+
+@dataclass(frozen=True, slots=True)
+class VS:
+    """Класс для хранения версии и размера компонента."""
+
+    stamp: str
+    size: int
+
+
+class RecordKind(IntEnum):
+    """Вид записи. Порядок значений — порядок префиксов ключей."""
+
+    COMPONENT = 0
+    LOAD = 1
+
+
+# Префиксы ключей записей по видам (индекс — RecordKind)
+KIND_PREFIXES = (PREFIX_COMPONENT, PREFIX_LOAD)
+PREFIX_LENGTH = len(PREFIX_COMPONENT)
+PREFIX_KINDS = {prefix: kind for kind, prefix in enumerate(KIND_PREFIXES)}
+
+
+# Ключ версии — до VERSION_KEY_PARTS её чисел по VERSION_KEY_BITS бит
+VERSION_KEY_PARTS = 4
+VERSION_KEY_BITS = 15
+VERSION_PART_MAX = (1 << VERSION_KEY_BITS) - 1
+# Признак ключа даты: ключи дат больше ключей любых версий
+DATE_KEY_FLAG = 1 << VERSION_KEY_PARTS * VERSION_KEY_BITS
+
+RE_STAMP_VERSION = re.compile(r"[\d.]+")
+RE_STAMP_DATE = re.compile(r"(\d{2})\\(\d{2})\\(\d{4})\s(\d{2}):(\d{2})")
+
+
+@functools.lru_cache(maxsize=c.STAMP_KEY_CACHE_SIZE)
+def get_stamp_key(stamp: str) -> int:
+    """
+    Возвращает целочисленный ключ сортировки версии или даты записи.
+    Строки версий и дат упорядочены не так, как значения: "9.1.100.0" < "9.1.49.0",
+    даты ДД\\ММ\\ГГГГ сравниваются сначала по дню. Ключ версии — её числа,
+    упакованные по VERSION_KEY_BITS бит (недостающие числа считаются нулями,
+    большие ограничиваются), ключ даты — число минут от начала летоисчисления
+    (месяцы считаются по 31 дню) с признаком DATE_KEY_FLAG.
+    Версии и даты сильно повторяются, поэтому ключи запоминаются.
+    :return: Ключ; -1 для пустой или нераспознанной строки.
+    """
+    if RE_STAMP_VERSION.fullmatch(stamp):
+        parts = stamp.split(".")[:VERSION_KEY_PARTS]
+        parts += [""] * (VERSION_KEY_PARTS - len(parts))
+        key = 0
+        for part in parts:
+            key = key << VERSION_KEY_BITS | min(int(part or 0), VERSION_PART_MAX)
+        return key
+
+    match_result = RE_STAMP_DATE.fullmatch(stamp)
+    if match_result is None:
+        return -1
+    day, month, year, hour, minute = map(int, match_result.groups())
+    days = (year * 12 + month - 1) * 31 + day - 1
+    return DATE_KEY_FLAG | (days * 24 + hour) * 60 + minute
+
+
+class RecordStore(Mapping[str, VS]):
+    """
+    Результат разбора отчёта: отображение «ключ записи → VS», как словарь
+    {PREFIX_COMPONENT + название: VS(...)}, но с хранением по столбцам.
+    Для поиска по ключу и добавления записей строятся словари номеров строк
+    по названиям и номеров версий по значениям (rows_by_name, stamp_ids_by_value).
+    После разбора они освобождаются (release_index) и строятся заново
+    при следующем поиске: сравнение отчётов обходит записи, не выполняя поиска.
+    """
+
+    __slots__ = (
+        "names",
+        "kinds",
+        "stamps",
+        "stamp_ids",
+        "sizes",
+        "rows_by_name",
+        "stamp_ids_by_value",
+    )
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.kinds = array("B")
+        self.stamps: list[str] = []  # Уникальные версии и даты
+        self.stamp_ids = array("I")  # Номер версии записи в self.stamps
+        self.sizes = array("q")
+        # Номера строк по названиям для каждого вида записей
+        self.rows_by_name: tuple[dict[str, int], ...] | None = ({}, {})
+        self.stamp_ids_by_value: dict[str, int] | None = {}
+
+    @classmethod
+    def from_columns(
+        cls,
+        names: list[str],
+        kinds: array,
+        stamps: list[str],
+        stamp_ids: array,
+        sizes: array,
+    ) -> "RecordStore":
+        """
+        Создаёт хранилище из столбцов (см. parse_cache, __reduce__).
+        :raise ValueError: Если столбцы не согласованы между собой.
+        """
+        if not (
+            len(names) == len(kinds) == len(stamp_ids) == len(sizes)
+            and max(kinds, default=0) < len(KIND_PREFIXES)
+            and max(stamp_ids, default=-1) < len(stamps)
+        ):
+            raise ValueError("Несогласованные столбцы записей")
+        store = cls()
+        store.names = names
+        store.kinds = kinds
+        store.stamps = stamps
+        store.stamp_ids = stamp_ids
+        store.sizes = sizes
+        store.release_index()
+        return store
+
+    def __reduce__(self) -> tuple:
+        # Передача в другой процесс: массивы сериализуются целиком, без записей
+        return RecordStore.from_columns, (
+            self.names,
+            self.kinds,
+            self.stamps,
+            self.stamp_ids,
+            self.sizes,
+        )
+
+    def build_index(self) -> tuple[dict[str, int], ...]:
+        """Строит словари поиска записей и версий."""
+        rows_by_name: tuple[dict[str, int], ...] = tuple({} for _ in KIND_PREFIXES)
+        for row, (kind, name) in enumerate(zip(self.kinds, self.names)):
+            rows_by_name[kind][name] = row
+        self.rows_by_name = rows_by_name
+        self.stamp_ids_by_value = {
+            stamp: index for index, stamp in enumerate(self.stamps)
+        }
+        return rows_by_name
+
+    def release_index(self) -> None:
+        """Освобождает словари поиска; они строятся заново при необходимости."""
+        self.rows_by_name = None
+        self.stamp_ids_by_value = None
+
+    def add(self, kind: int, name: str, stamp: str, size: int) -> None:
+        """
+        Добавляет запись.
+        Повтор записи с теми же характеристиками допустим, с другими — ошибка.
+        :param kind: Вид записи (RecordKind).
+        :raise ValueError: Если запись уже есть с другими характеристиками.
+        """
+        rows_by_name = self.rows_by_name
+        if rows_by_name is None:
+            rows_by_name = self.build_index()
+        rows = rows_by_name[kind]
+        row = rows.get(name)
+        if row is None:
+            stamp_ids_by_value = self.stamp_ids_by_value
+            stamp_id = stamp_ids_by_value.get(stamp)
+            if stamp_id is None:
+                stamp_id = stamp_ids_by_value[stamp] = len(self.stamps)
+                self.stamps.append(stamp)
+            rows[name] = len(self.names)
+            self.names.append(name)
+            self.kinds.append(kind)
+            self.stamp_ids.append(stamp_id)
+            self.sizes.append(size)
+        elif self.sizes[row] != size or self.stamps[self.stamp_ids[row]] != stamp:
+            state = self.get_state(row)
+            raise ValueError(
+                f"{KIND_PREFIXES[kind]}{name} присутствует в исходном отчете "
+                f"с разными характеристиками: "
+                f"версия/дата: {state.stamp}, размер: {state.size}; "
+                f"версия/дата: {stamp}, размер: {size}"
+            )
+
+    def find(self, key: object) -> int:
+        """Номер строки записи с ключом key или -1, если её нет."""
+        if not isinstance(key, str):
+            return -1
+        kind = PREFIX_KINDS.get(key[:PREFIX_LENGTH])
+        if kind is None:
+            return -1
+        rows_by_name = self.rows_by_name
+        if rows_by_name is None:
+            rows_by_name = self.build_index()
+        return rows_by_name[kind].get(key[PREFIX_LENGTH:], -1)
+
+    def get_key(self, row: int) -> str:
+        """Ключ записи строки row: префикс вида и название."""
+        return KIND_PREFIXES[self.kinds[row]] + self.names[row]
+
+    def get_state(self, row: int) -> VS:
+        """Характеристики записи строки row."""
+        return VS(self.stamps[self.stamp_ids[row]], self.sizes[row])
+
+    def get_sorted_rows(self) -> list[int]:
+        """
+        Номера строк в порядке возрастания ключей. Префиксы видов имеют
+        одинаковую длину и упорядочены так же, как виды, поэтому строки
+        сортируются по названию, а затем (устойчиво) по виду, не создавая ключей.
+        """
+        rows = sorted(range(len(self.names)), key=self.names.__getitem__)
+        kinds = self.kinds
+        if kinds and kinds.count(kinds[0]) != len(kinds):
+            rows.sort(key=kinds.__getitem__)
+        return rows
+
+    def iter_states(self) -> Iterator[VS]:
+        """Характеристики записей в порядке строк."""
+        stamps = self.stamps
+        for stamp_id, size in zip(self.stamp_ids, self.sizes):
+            yield VS(stamps[stamp_id], size)
+
+    def __getitem__(self, key: str) -> VS:
+        row = self.find(key)
+        if row < 0:
+            raise KeyError(key)
+        return self.get_state(row)
+
+    def __contains__(self, key: object) -> bool:
+        return self.find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for kind, name in zip(self.kinds, self.names):
+            yield KIND_PREFIXES[kind] + name
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} записей)"
+
+    def items(self) -> "RecordItemsView":
+        return RecordItemsView(self)
+
+    def values(self) -> "RecordValuesView":
+        return RecordValuesView(self)
+
+
+class RecordItemsView(ItemsView):
+    """Пары (ключ, VS) хранилища: обходятся по строкам, без поиска по ключам."""
+
+    _mapping: RecordStore
+
+    def __iter__(self) -> Iterator[tuple[str, VS]]:
+        return zip(iter(self._mapping), self._mapping.iter_states())
+
+
+class RecordValuesView(ValuesView):
+    """Характеристики записей хранилища в порядке строк."""
+
+    _mapping: RecordStore
+
+    def __iter__(self) -> Iterator[VS]:
+        return self._mapping.iter_states()
@@ -0,0 +1,154 @@
+"""
+Модуль сравнивает сразу несколько отчётов (установок системы).
+
+Отчёты сливаются в общий индекс по ключу записи: для каждого ключа хранятся
+различающиеся значения VS и битовые маски отчётов, в которых они встречаются.
+Поэтому объём памяти определяется числом различных пар (ключ, VS),
+а не числом отчётов, умноженным на их размер.
+"""
+
+import functools
+import itertools
+import os
+from collections import deque
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from src.compare import (
+    VS,
+    ParseEngine,
+    RecordStore,
+    get_file_size,
+    get_parse_executor_class,
+    parse_file,
+)
+from src.constants import Constant as c
+
+
+class ReportMatrix:
+    """Общий индекс записей нескольких отчётов."""
+
+    def __init__(self, report_names: Sequence[str]) -> None:
+        """
+        :param report_names: Названия отчётов (столбцов матрицы) в порядке добавления.
+        """
+        self.report_names = list(report_names)
+        self.reports_added = 0
+        # Ключ записи: {значение: маска отчётов, содержащих это значение}
+        self.values: dict[str, dict[VS, int]] = {}
+
+    def add_report(self, records: Mapping[str, VS]) -> None:
+        """Добавляет в индекс записи очередного отчёта."""
+        bit = 1 << self.reports_added
+        self.reports_added += 1
+
+        values = self.values
+        for name, state in records.items():
+            states = values.get(name)
+            if states is None:
+                values[name] = {state: bit}
+            else:
+                states[state] = states.get(state, 0) | bit
+
+    def get_differing_keys(self) -> list[str]:
+        """
+        Возвращает отсортированные ключи записей, которые есть не во всех отчётах
+        или отличаются хотя бы в одном из них.
+        """
+        all_reports = (1 << self.reports_added) - 1
+        return sorted(
+            name
+            for name, states in self.values.items()
+            if len(states) > 1 or next(iter(states.values())) != all_reports
+        )
+
+    def get_states(self, name: str) -> list[VS | None]:
+        """Возвращает значения записи в каждом отчёте (None — записи в отчёте нет)."""
+        result: list[VS | None] = [None] * self.reports_added
+        for state, mask in self.values[name].items():
+            for index in range(self.reports_added):
+                if mask >> index & 1:
+                    result[index] = state
+        return result
+
+
+def build_report_matrix(
+    file_paths: Sequence[str],
+    compare_comps: bool,
+    compare_loads: bool,
+    engine: ParseEngine = ParseEngine.LINES,
+    progress: Callable[[int, int], None] | None = None,
+    parse_function: Callable[..., RecordStore] = parse_file,
+) -> ReportMatrix:
+    """
+    Разбирает отчёты одновременно и сливает их в общий индекс.
+    Результат разбора каждого отчёта освобождается сразу после слияния, а разбор
+    следующих отчётов начинается по мере слияния: в памяти одновременно не больше
+    c.MATRIX_PENDING_PER_WORKER результатов на поток или процесс разбора.
+
+    Args:
+        file_paths (Sequence[str]): Пути к файлам отчётов
+        compare_comps (bool): Признак того, что надо сравнивать компоненты
+        compare_loads (bool): Признак того, что надо сравнивать загрузки
+        engine (ParseEngine): Способ разбора файлов
+        progress (Callable[[int, int], None] | None): Получает номер отчёта и число
+            прочитанных байт его файла (см. parse_reports). Отчёты, разбираемые
+            в отдельных процессах, сообщают о прочитанных байтах по завершении разбора.
+        parse_function (Callable[..., RecordStore]): Функция разбора отчёта
+            с параметрами parse_file.
+
+    Returns:
+        ReportMatrix: Индекс записей; названия отчётов — имена их файлов.
+
+    Raises:
+        Exception: Ошибка разбора первого по порядку отчёта, разбор которого не удался.
+    """
+    matrix = ReportMatrix([Path(file_path).stem for file_path in file_paths])
+
+    executor_class = get_parse_executor_class(file_paths)
+    if executor_class is ThreadPoolExecutor:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)  # Как по умолчанию в пуле
+    else:
+        max_workers = os.cpu_count() or 1
+    window = c.MATRIX_PENDING_PER_WORKER * max_workers
+
+    def submit(index: int, file_path: str) -> Future:
+        if progress is not None and executor_class is ThreadPoolExecutor:
+            return executor.submit(
+                parse_function,
+                file_path,
+                compare_comps,
+                compare_loads,
+                engine,
+                progress=functools.partial(progress, index),
+            )
+        # Функции progress нельзя передать в другой процесс
+        return executor.submit(
+            parse_function, file_path, compare_comps, compare_loads, engine
+        )
+
+    executor = executor_class(max_workers=max_workers)
+    try:
+        # Одновременно разбирается не больше window отчётов, чтобы результаты,
+        # ещё не слитые в индекс, не накапливались в памяти
+        paths = enumerate(file_paths)
+        futures = deque(
+            submit(index, file_path)
+            for index, file_path in itertools.islice(paths, window)
+        )
+        for index, file_path in enumerate(file_paths):
+            # Результат разбора освобождается вместе с future после слияния
+            records = futures.popleft().result()
+            futures.extend(
+                submit(next_index, next_path)
+                for next_index, next_path in itertools.islice(paths, 1)
+            )
+            matrix.add_report(records)
+            if progress is not None:
+                progress(index, get_file_size(file_path))
+    finally:
+        # После ошибки или прерывания разбор остальных отчётов не дожидаемся
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return matrix
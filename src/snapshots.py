@@ -0,0 +1,506 @@
+"""
+Модуль содержит хранилище снимков разобранных отчётов в базе данных SQLite.
+
+Снимок — записи одного отчёта (компоненты и загрузки) с названием рабочей
+станции, временем снятия отчёта и хэшем файла отчёта. Отчёт, совпадающий
+с предыдущим снимком той же станции (тот же хэш), повторно не сохраняется;
+одинаковые отчёты разных станций и возврат станции к прежнему отчёту
+сохраняются новыми снимками. Записи отчёта, уже загруженного в базу, копируются
+из его снимка без повторного разбора. Названия записей и версии хранятся в базе
+один раз (таблицы names и stamps), записи снимков — номерами в них, поэтому
+годы отчётов по каждой станции занимают немного места.
+
+Сравнение двух снимков выполняется запросами к базе (EXCEPT и соединение
+по названию), без повторного разбора отчётов. Индексы по названию и по версии
+записей позволяют быстро отвечать на вопросы об истории: когда изменилась
+запись на станции (get_history), на каких станциях ещё стоит версия (find_hosts).
+Модуль не импортирует PyQt6.
+"""
+
+import os
+import sqlite3
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from src.compare import (
+    PARSER_VERSION,
+    VS,
+    DiffEntry,
+    DiffKind,
+    ParseEngine,
+    RecordStore,
+)
+from src.parse_cache import get_file_digest, parse_file_cached
+from src.record_store import KIND_PREFIXES, PREFIX_KINDS, PREFIX_LENGTH, RecordKind
+
+# Версия схемы базы (PRAGMA user_version). Версия 1: хэш отчёта уникален во всей
+# базе, а не в снимках станции
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    source_hash BLOB NOT NULL,
+    source_path TEXT NOT NULL,
+    parser_version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_host ON snapshots (host, taken_at);
+CREATE INDEX IF NOT EXISTS snapshots_by_hash ON snapshots (source_hash);
+
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    kind INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (kind, name)
+);
+
+CREATE TABLE IF NOT EXISTS stamps (
+    id INTEGER PRIMARY KEY,
+    stamp TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS records (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    name_id INTEGER NOT NULL REFERENCES names (id),
+    stamp_id INTEGER NOT NULL REFERENCES stamps (id),
+    size INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, name_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_by_name ON records (name_id, snapshot_id);
+CREATE INDEX IF NOT EXISTS records_by_stamp ON records (stamp_id, snapshot_id);
+"""
+
+# Перенос снимков версии 1 в таблицу без уникальности хэша (выполняется
+# с отключёнными внешними ключами, чтобы не удалить записи снимков)
+MIGRATE_V1 = """
+CREATE TABLE snapshots_v2 (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    source_hash BLOB NOT NULL,
+    source_path TEXT NOT NULL,
+    parser_version INTEGER NOT NULL
+);
+INSERT INTO snapshots_v2 SELECT * FROM snapshots;
+DROP TABLE snapshots;
+ALTER TABLE snapshots_v2 RENAME TO snapshots;
+"""
+
+# Формат времени снятия отчёта: строки этого формата упорядочены так же, как время
+TAKEN_AT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Последний снимок каждой станции
+LATEST_SNAPSHOTS = """
+SELECT id FROM (
+    SELECT id, ROW_NUMBER() OVER (
+        PARTITION BY host ORDER BY taken_at DESC, id DESC
+    ) AS position
+    FROM snapshots
+)
+WHERE position = 1
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Снимок отчёта в базе."""
+
+    id: int
+    host: str  # Рабочая станция
+    taken_at: str  # Время снятия отчёта (TAKEN_AT_FORMAT)
+    source_hash: bytes  # Хэш файла отчёта (см. parse_cache.get_file_digest)
+    source_path: str  # Путь к файлу отчёта при загрузке
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    """Изменение записи на станции: состояние записи начиная со снимка."""
+
+    snapshot: Snapshot
+    key: str  # Ключ записи: префикс вида и название
+    state: VS | None  # None — записи в снимке нет
+
+
+def get_kinds(compare_comps: bool, compare_loads: bool) -> tuple[int, ...]:
+    """Виды записей, которые надо сравнивать."""
+    return tuple(
+        kind
+        for kind, selected in (
+            (RecordKind.COMPONENT, compare_comps),
+            (RecordKind.LOAD, compare_loads),
+        )
+        if selected
+    )
+
+
+def make_placeholders(values: tuple) -> str:
+    """Параметры запроса для списка значений: «?, ?, ?»."""
+    return ", ".join("?" * len(values))
+
+
+class SnapshotStore:
+    """
+    База снимков отчётов. Закрывается методом close или выходом из блока with.
+    :raise ValueError: Если база создана другой версией программы.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        self.connection = sqlite3.connect(db_path)
+        try:
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+            if version not in (0, 1, SCHEMA_VERSION):
+                raise ValueError(
+                    f"{db_path}: неизвестная версия базы снимков {version}"
+                )
+            if version == 1:
+                self.migrate_v1()
+            with self.connection:
+                self.connection.executescript(SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except BaseException:
+            self.connection.close()
+            raise
+
+    def migrate_v1(self) -> None:
+        """Переводит базу версии 1 на текущую схему, сохраняя снимки и записи."""
+        connection = self.connection
+        connection.execute("PRAGMA foreign_keys = OFF")
+        try:
+            connection.executescript(f"BEGIN;{MIGRATE_V1}COMMIT;")
+        except BaseException:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            connection.execute("PRAGMA foreign_keys = ON")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Загрузка отчётов
+    def ingest(
+        self,
+        file_path: str,
+        host: str | None = None,
+        taken_at: datetime | None = None,
+    ) -> tuple[Snapshot, bool]:
+        """
+        Разбирает отчёт (компоненты и загрузки) и сохраняет его снимок.
+        :param host: Рабочая станция; по умолчанию — имя файла отчёта без расширения.
+        :param taken_at: Время снятия отчёта; по умолчанию — время изменения файла.
+        :return: Снимок и признак того, что он добавлен (False — отчёт совпадает
+                 с предыдущим снимком станции, возвращается этот снимок).
+        """
+        digest = get_file_digest(file_path)
+        if host is None:
+            host = Path(file_path).stem
+        if taken_at is None:
+            taken_at = datetime.fromtimestamp(os.path.getmtime(file_path))
+        taken_at_text = taken_at.strftime(TAKEN_AT_FORMAT)
+
+        previous = self.get_previous_snapshot(host, taken_at_text)
+        if previous is not None and previous.source_hash == digest:
+            return previous, False
+
+        # Записи того же отчёта, загруженного для другой станции или раньше,
+        # копируются из его снимка; отчёт разбирается, только если их нет
+        same_report = self.find_snapshot(digest)
+        records = None
+        if same_report is None:
+            records = parse_file_cached(file_path, True, True, ParseEngine.MMAP)
+
+        with self.connection:
+            snapshot_id = self.connection.execute(
+                "INSERT INTO snapshots "
+                "(host, taken_at, source_hash, source_path, parser_version) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    host,
+                    taken_at_text,
+                    digest,
+                    os.path.abspath(file_path),
+                    PARSER_VERSION,
+                ),
+            ).lastrowid
+            if records is None:
+                self.connection.execute(
+                    "INSERT INTO records (snapshot_id, name_id, stamp_id, size) "
+                    "SELECT ?, name_id, stamp_id, size FROM records "
+                    "WHERE snapshot_id = ?",
+                    (snapshot_id, same_report.id),
+                )
+            else:
+                self.insert_records(snapshot_id, records)
+        return self.get_snapshot(snapshot_id), True
+
+    def insert_records(self, snapshot_id: int, records: RecordStore) -> None:
+        """
+        Сохраняет записи снимка. Записи загружаются во временную таблицу,
+        новые названия и версии добавляются в справочники одним запросом.
+        """
+        connection = self.connection
+        connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS staging "
+            "(kind INTEGER, name TEXT, stamp TEXT, size INTEGER)"
+        )
+        connection.execute("DELETE FROM staging")
+        stamps = records.stamps
+        connection.executemany(
+            "INSERT INTO staging VALUES (?, ?, ?, ?)",
+            zip(
+                records.kinds,
+                records.names,
+                (stamps[stamp_id] for stamp_id in records.stamp_ids),
+                records.sizes,
+            ),
+        )
+        connection.execute(
+            "INSERT OR IGNORE INTO names (kind, name) SELECT kind, name FROM staging"
+        )
+        connection.execute(
+            "INSERT OR IGNORE INTO stamps (stamp) SELECT DISTINCT stamp FROM staging"
+        )
+        connection.execute(
+            "INSERT INTO records (snapshot_id, name_id, stamp_id, size) "
+            "SELECT ?, names.id, stamps.id, staging.size FROM staging "
+            "JOIN names ON names.kind = staging.kind AND names.name = staging.name "
+            "JOIN stamps ON stamps.stamp = staging.stamp",
+            (snapshot_id,),
+        )
+        connection.execute("DELETE FROM staging")
+
+    def delete_snapshot(self, snapshot_id: int) -> None:
+        """Удаляет снимок и его записи."""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM snapshots WHERE id = ?", (snapshot_id,)
+            )
+
+    # Снимки
+    def find_snapshot(
+        self, source_hash: bytes, host: str | None = None
+    ) -> Snapshot | None:
+        """
+        Первый снимок отчёта с хэшем source_hash или None, если его нет в базе.
+        :param host: Станция; по умолчанию — снимки всех станций.
+        """
+        query = (
+            "SELECT id, host, taken_at, source_hash, source_path FROM snapshots "
+            "WHERE source_hash = ?"
+        )
+        parameters: tuple = (source_hash,)
+        if host is not None:
+            query += " AND host = ?"
+            parameters += (host,)
+        row = self.connection.execute(query + " ORDER BY id", parameters).fetchone()
+        return None if row is None else Snapshot(*row)
+
+    def get_previous_snapshot(self, host: str, taken_at: str) -> Snapshot | None:
+        """
+        Последний снимок станции, снятый не позже taken_at (TAKEN_AT_FORMAT),
+        или None, если таких снимков нет.
+        """
+        row = self.connection.execute(
+            "SELECT id, host, taken_at, source_hash, source_path FROM snapshots "
+            "WHERE host = ? AND taken_at <= ? ORDER BY taken_at DESC, id DESC",
+            (host, taken_at),
+        ).fetchone()
+        return None if row is None else Snapshot(*row)
+
+    def get_snapshot(self, snapshot_id: int) -> Snapshot:
+        """
+        Снимок с номером snapshot_id.
+        :raise ValueError: Если снимка нет в базе.
+        """
+        row = self.connection.execute(
+            "SELECT id, host, taken_at, source_hash, source_path FROM snapshots "
+            "WHERE id = ?",
+            (snapshot_id,),
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Снимка {snapshot_id} нет в базе")
+        return Snapshot(*row)
+
+    def get_snapshots(self, host: str | None = None) -> list[Snapshot]:
+        """Снимки станции (по умолчанию всех станций) по станциям и времени."""
+        query = "SELECT id, host, taken_at, source_hash, source_path FROM snapshots"
+        parameters: tuple = ()
+        if host is not None:
+            query += " WHERE host = ?"
+            parameters = (host,)
+        query += " ORDER BY host, taken_at, id"
+        return [Snapshot(*row) for row in self.connection.execute(query, parameters)]
+
+    def get_records(
+        self, snapshot_id: int, compare_comps: bool = True, compare_loads: bool = True
+    ) -> RecordStore:
+        """Записи снимка, как результат разбора его отчёта."""
+        self.get_snapshot(snapshot_id)
+        kinds = get_kinds(compare_comps, compare_loads)
+        store = RecordStore()
+        for kind, name, stamp, size in self.connection.execute(
+            "SELECT names.kind, names.name, stamps.stamp, records.size "
+            "FROM records "
+            "JOIN names ON names.id = records.name_id "
+            "JOIN stamps ON stamps.id = records.stamp_id "
+            f"WHERE records.snapshot_id = ? AND names.kind IN ({make_placeholders(kinds)})",
+            (snapshot_id, *kinds),
+        ):
+            store.add(kind, name, stamp, size)
+        store.release_index()
+        return store
+
+    # Сравнение снимков
+    def diff(
+        self,
+        snapshot_id1: int,
+        snapshot_id2: int,
+        compare_comps: bool = True,
+        compare_loads: bool = True,
+    ) -> Iterator[DiffEntry]:
+        """
+        Сравнивает два снимка запросами к базе.
+        Отличия выдаются в том же порядке, что и merge_diff: записи только
+        первого снимка, только второго и отличающиеся, каждая группа —
+        по возрастанию ключа (виды упорядочены так же, как префиксы ключей).
+        :raise ValueError: Если снимка нет в базе.
+        """
+        self.get_snapshot(snapshot_id1)
+        self.get_snapshot(snapshot_id2)
+        kinds = get_kinds(compare_comps, compare_loads)
+        kinds_filter = f"names.kind IN ({make_placeholders(kinds)})"
+
+        for diff_kind, first, second in (
+            (DiffKind.ONLY_IN_1, snapshot_id1, snapshot_id2),
+            (DiffKind.ONLY_IN_2, snapshot_id2, snapshot_id1),
+        ):
+            rows = self.connection.execute(
+                "WITH only_names AS ("
+                "SELECT name_id FROM records WHERE snapshot_id = ? "
+                "EXCEPT SELECT name_id FROM records WHERE snapshot_id = ?) "
+                "SELECT names.kind, names.name, stamps.stamp, records.size "
+                "FROM only_names "
+                "JOIN records ON records.snapshot_id = ? "
+                "AND records.name_id = only_names.name_id "
+                "JOIN names ON names.id = records.name_id "
+                "JOIN stamps ON stamps.id = records.stamp_id "
+                f"WHERE {kinds_filter} "
+                "ORDER BY names.kind, names.name",
+                (first, second, first, *kinds),
+            )
+            for kind, name, stamp, size in rows:
+                state = VS(stamp, size)
+                if diff_kind is DiffKind.ONLY_IN_1:
+                    yield diff_kind, KIND_PREFIXES[kind] + name, state, None
+                else:
+                    yield diff_kind, KIND_PREFIXES[kind] + name, None, state
+
+        rows = self.connection.execute(
+            "SELECT names.kind, names.name, stamps1.stamp, records1.size, "
+            "stamps2.stamp, records2.size "
+            "FROM records AS records1 "
+            "JOIN records AS records2 ON records2.snapshot_id = ? "
+            "AND records2.name_id = records1.name_id "
+            "AND (records2.stamp_id != records1.stamp_id "
+            "OR records2.size != records1.size) "
+            "JOIN names ON names.id = records1.name_id "
+            "JOIN stamps AS stamps1 ON stamps1.id = records1.stamp_id "
+            "JOIN stamps AS stamps2 ON stamps2.id = records2.stamp_id "
+            f"WHERE records1.snapshot_id = ? AND {kinds_filter} "
+            "ORDER BY names.kind, names.name",
+            (snapshot_id2, snapshot_id1, *kinds),
+        )
+        for kind, name, stamp1, size1, stamp2, size2 in rows:
+            yield (
+                DiffKind.DIFFERENT,
+                KIND_PREFIXES[kind] + name,
+                VS(stamp1, size1),
+                VS(stamp2, size2),
+            )
+
+    # История
+    def get_name_ids(self, key: str) -> list[int]:
+        """
+        Номера названий записи. Ключ задаётся с префиксом вида, как в таблице
+        результатов («C: G_MD5»), или без него — тогда записи всех видов.
+        """
+        kind = PREFIX_KINDS.get(key[:PREFIX_LENGTH])
+        if kind is None:
+            query, parameters = "SELECT id FROM names WHERE name = ?", (key,)
+        else:
+            query = "SELECT id FROM names WHERE kind = ? AND name = ?"
+            parameters = (kind, key[PREFIX_LENGTH:])
+        return [name_id for (name_id,) in self.connection.execute(query, parameters)]
+
+    def get_history(self, key: str, host: str) -> list[HistoryEntry]:
+        """
+        Изменения записи на станции: первое состояние записи и каждое
+        его изменение (в том числе появление и исчезновение) по времени снимков.
+        :param key: Ключ записи (см. get_name_ids).
+        """
+        history = []
+        for name_id in self.get_name_ids(key):
+            rows = self.connection.execute(
+                "SELECT snapshots.id, snapshots.host, snapshots.taken_at, "
+                "snapshots.source_hash, snapshots.source_path, "
+                "names.kind, names.name, stamps.stamp, records.size "
+                "FROM snapshots "
+                "JOIN names ON names.id = :name_id "
+                "LEFT JOIN records ON records.snapshot_id = snapshots.id "
+                "AND records.name_id = :name_id "
+                "LEFT JOIN stamps ON stamps.id = records.stamp_id "
+                "WHERE snapshots.host = :host "
+                "ORDER BY snapshots.taken_at, snapshots.id",
+                {"name_id": name_id, "host": host},
+            )
+            previous: VS | None = None
+            for position, row in enumerate(rows):
+                kind, name, stamp, size = row[5:]
+                state = None if stamp is None else VS(stamp, size)
+                if position == 0 or state != previous:
+                    history.append(
+                        HistoryEntry(
+                            Snapshot(*row[:5]), KIND_PREFIXES[kind] + name, state
+                        )
+                    )
+                previous = state
+        history.sort(key=lambda entry: (entry.snapshot.taken_at, entry.snapshot.id))
+        return history
+
+    def find_hosts(
+        self, stamp: str, key: str | None = None
+    ) -> list[tuple[str, str, str]]:
+        """
+        Станции, последний снимок которых содержит записи с версией (датой) stamp.
+        :param key: Ключ записи (см. get_name_ids); по умолчанию — любые записи.
+        :return: Список (станция, время снимка, ключ записи) по станциям и ключам.
+        """
+        query = (
+            "SELECT snapshots.host, snapshots.taken_at, names.kind, names.name "
+            "FROM records "
+            "JOIN snapshots ON snapshots.id = records.snapshot_id "
+            "JOIN names ON names.id = records.name_id "
+            "WHERE records.stamp_id = (SELECT id FROM stamps WHERE stamp = ?) "
+            f"AND records.snapshot_id IN ({LATEST_SNAPSHOTS})"
+        )
+        parameters: tuple = (stamp,)
+        if key is not None:
+            name_ids = tuple(self.get_name_ids(key))
+            query += f" AND records.name_id IN ({make_placeholders(name_ids)})"
+            parameters += name_ids
+        query += " ORDER BY snapshots.host, names.kind, names.name"
+        return [
+            (host, taken_at, KIND_PREFIXES[kind] + name)
+            for host, taken_at, kind, name in self.connection.execute(query, parameters)
+        ]
@@ -1,13 +1,22 @@
 """Модуль содержит класс работы с настройками и dataclass, описывающий структуру информации о настройки.
 Настройки хранятся в словаре.
-Ключами словаря являются имя настройки, а значениями - значения настроек."""
+Ключами словаря являются имя настройки, а значениями - значения настроек.
+Модуль не импортирует PyQt6: ошибки чтения и записи настроек показываются
+через src.functions.show_warning.
+Изменённые настройки записываются в файл не сразу, а через c.TUNES_WRITE_DELAY_MS
+в отдельном потоке: изменения за это время записываются один раз, и поток
+интерфейса не ждёт записи файла (например, на сетевом диске профиля).
+Файл пишется во временный и атомарно переименовывается, поэтому прерванная
+запись не портит файл настроек. При закрытии программы отложенные изменения
+записываются сразу (Tunes.flush)."""
 
 import json
+import os
+import tempfile
+import threading
 from dataclasses import dataclass
 from enum import IntEnum
 
-from PyQt6.QtWidgets import QMessageBox
-
 import src.functions as f
 from src.constants import Constant as c
 
@@ -32,6 +41,7 @@ DESCRIPTION_TUNES = {
     c.CHECK_BOX_COMPS: VT(CheckStateValue.CHECKED.value, c.CHECK_BOX),
     c.CHECK_BOX_LOADS: VT(CheckStateValue.UNCHECKED.value, c.CHECK_BOX),
     c.SAVER_FOLDER: VT("", c.STRING),
+    c.ACTION_SAVE_XLSX: VT(CheckStateValue.UNCHECKED.value, c.CHECK_BOX),
 }  # Имя настройки: (значение по умолчанию, метод контроля типа)
 
 
@@ -45,8 +55,19 @@ class Tunes:
         """
 
         self.description_tunes = description_tunes
+        # Настройки в файле (None, если файл не прочитан): их повторно не записывают
+        self._saved_tunes: dict[str, TuneValue] | None = None
         self.dict_tunes: dict[str, TuneValue] = self._read_tunes()  # словарь настроек
 
+        # Отложенная запись: настройки для записи, таймер записи и ошибка
+        # последней записи, которая показывается в вызывающем потоке
+        self._pending_tunes: dict[str, TuneValue] | None = None
+        self._write_timer: threading.Timer | None = None
+        self._write_error: str | None = None
+        self._pending_lock = threading.Lock()
+        # Записи файла выполняются по очереди, в порядке изменения настроек
+        self._write_lock = threading.Lock()
+
     def _get_tune(self, name: str) -> TuneValue:
         """
         Получение настройки
@@ -64,6 +85,7 @@ class Tunes:
         :param name: Имя настройки
         :param value: Значение настройки
         :param write: Параметр, определяющий следует ли записывать словарь в файл.
+                      Запись откладывается (см. schedule_write).
         :return: None
         """
         if not isinstance(name, str):
@@ -73,7 +95,40 @@ class Tunes:
         self.dict_tunes[name] = self._normalize_tune_value(name, value)
 
         if write:
-            self._write_tunes()
+            self.schedule_write()
+
+    def schedule_write(self) -> None:
+        """
+        Откладывает запись настроек в файл на c.TUNES_WRITE_DELAY_MS: запись
+        выполняется в отдельном потоке один раз для всех изменений за это время.
+        Настройки, совпадающие с прочитанными из файла, не записываются.
+        """
+        self._show_write_error()
+        tunes = dict(self.dict_tunes)
+        with self._pending_lock:
+            if self._pending_tunes is None and tunes == self._saved_tunes:
+                return
+            self._pending_tunes = tunes
+            if self._write_timer is None:
+                self._write_timer = threading.Timer(
+                    c.TUNES_WRITE_DELAY_MS / 1000, self._write_tunes
+                )
+                self._write_timer.start()
+
+    def flush(self) -> None:
+        """Записывает отложенные изменения настроек сразу (при закрытии программы)."""
+        with self._pending_lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+        self._write_tunes()
+        self._show_write_error()
+
+    def _show_write_error(self) -> None:
+        """Показывает ошибку предыдущей записи файла настроек."""
+        with self._pending_lock:
+            error, self._write_error = self._write_error, None
+        if error is not None:
+            f.show_warning(c.TITLE_ERROR_WRITE, f"{c.TEXT_ERROR_WRITE}\n{error}")
 
     def _get_default_tunes(self) -> dict[str, TuneValue]:
         """
@@ -101,29 +156,53 @@ class Tunes:
             with open(c.FILE_TUNES, "r") as file:
                 tunes_from_file = json.load(file)
 
-            return self._normalize_tunes(tunes_from_file)
+            tunes = self._normalize_tunes(tunes_from_file)
+            self._saved_tunes = dict(tunes)
+            return tunes
 
         except FileNotFoundError:
             pass  # Отсутствие файла настроек не ошибка.
         except Exception as e:
-            QMessageBox.warning(
-                None,
-                c.TITLE_ERROR_READ,
-                f"{c.TEXT_ERROR_READ}\n {e}",
-            )
+            f.show_warning(c.TITLE_ERROR_READ, f"{c.TEXT_ERROR_READ}\n {e}")
         return self._get_default_tunes()
 
     def _write_tunes(self) -> None:
         """
-        Запись словаря настроек в файл настроек
+        Запись отложенных настроек в файл настроек (выполняется потоком таймера
+        или при flush). Файл пишется во временный файл в том же каталоге, который
+        затем атомарно переименовывается. Ошибка записи запоминается и показывается
+        в потоке, вызвавшем schedule_write или flush; настройки, которые не удалось
+        записать, записываются снова при flush.
         :return:
         """
-        try:
-            with open(c.FILE_TUNES, "w") as file:
-                # noinspection PyTypeChecker
-                json.dump(self.dict_tunes, file)
-        except Exception as e:
-            QMessageBox.warning(None, c.TITLE_ERROR_WRITE, f"{c.TEXT_ERROR_WRITE}\n{e}")
+        with self._write_lock:
+            with self._pending_lock:
+                tunes, self._pending_tunes = self._pending_tunes, None
+                self._write_timer = None
+            if tunes is None:
+                return
+
+            file_path = os.path.abspath(c.FILE_TUNES)
+            try:
+                fd, temp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(file_path), suffix=".tmp"
+                )
+                try:
+                    with os.fdopen(fd, "w") as file:
+                        # noinspection PyTypeChecker
+                        json.dump(tunes, file)
+                    f.set_new_file_mode(temp_path)
+                    os.replace(temp_path, file_path)
+                except BaseException:
+                    os.unlink(temp_path)
+                    raise
+            except Exception as e:
+                with self._pending_lock:
+                    self._write_error = str(e)
+                    if self._pending_tunes is None:
+                        self._pending_tunes = tunes
+                return
+            self._saved_tunes = tunes
 
     def _normalize_tune_value(
         self,
@@ -157,16 +236,20 @@ class Tunes:
     def _normalize_tunes(self, tunes: dict[str, TuneValue]) -> dict[str, TuneValue]:
         """
         Проверяет и нормализует полный словарь настроек.
+        Настройки, которых нет в файле прежней версии программы,
+        получают значения по умолчанию.
         """
 
         if not isinstance(tunes, dict):
             raise ValueError(c.TEXT_ERROR_TYPE_TUNES)
 
-        if set(tunes) != set(self.description_tunes):
+        if not set(tunes) <= set(self.description_tunes):
             raise ValueError(c.TEXT_ERROR_TYPE_TUNES)
 
         return {
-            key: self._normalize_tune_value(key, tunes[key])
+            key: self._normalize_tune_value(
+                key, tunes.get(key, self.description_tunes[key].value)
+            )
             for key in self.description_tunes
         }
 
@@ -0,0 +1,117 @@
+"""
+Модуль загружает интерфейс главного окна и компилирует файл интерфейса Qt
+(c.FILE_UI_NAME) в модуль Python (c.UI_MODULE_NAME).
+
+uic.loadUi при каждом запуске разбирает XML файла интерфейса и создаёт виджеты
+по их описанию; скомпилированный модуль создаёт те же виджеты в несколько раз
+быстрее и не требует загрузки PyQt6.uic. Модуль компилируется при сборке
+программы (compare_reports.spec) или командой
+    python -m src.ui_loader
+и хранит хэш файла интерфейса, из которого он создан. При запуске из исходников
+модуль используется, только если файл интерфейса с тех пор не изменялся,
+иначе (и если модуля нет) интерфейс загружается из файла .ui.
+Модуль не импортирует PyQt6 при загрузке.
+"""
+
+import hashlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import src.functions as f
+from src.constants import Constant as c
+from src.metrics import is_env_enabled
+
+# Класс интерфейса в скомпилированном модуле (Ui_ и имя окна в файле .ui)
+UI_CLASS_NAME = "Ui_MainWindow"
+# Переменная скомпилированного модуля с хэшем файла интерфейса
+UI_HASH_NAME = "UI_HASH"
+
+
+def get_ui_hash(ui_path: Path) -> str:
+    """Хэш содержимого файла интерфейса."""
+    return hashlib.blake2b(ui_path.read_bytes(), digest_size=16).hexdigest()
+
+
+def get_module_path() -> Path:
+    """Путь к файлу скомпилированного модуля интерфейса в исходниках."""
+    return f.get_base_dir() / Path(*c.UI_MODULE_NAME.split(".")).with_suffix(".py")
+
+
+def compile_ui(ui_path: Path | None = None, module_path: Path | None = None) -> Path:
+    """
+    Компилирует файл интерфейса в модуль Python. Модуль записывается
+    во временный файл и атомарно переименовывается.
+    :return: Путь к файлу модуля.
+    """
+    from PyQt6 import uic
+
+    if ui_path is None:
+        ui_path = f.get_file_ui_name()
+    if module_path is None:
+        module_path = get_module_path()
+
+    code = io.StringIO()
+    with open(ui_path, "r", encoding="utf-8") as ui_file:
+        uic.compileUi(ui_file, code)
+    code.write(f'\n{UI_HASH_NAME} = "{get_ui_hash(ui_path)}"\n')
+
+    fd, temp_path = tempfile.mkstemp(dir=module_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as module_file:
+            module_file.write(code.getvalue())
+        f.set_new_file_mode(temp_path)
+        os.replace(temp_path, module_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return module_path
+
+
+def load_compiled_ui() -> type | None:
+    """
+    Класс интерфейса из скомпилированного модуля.
+    :return: None, если интерфейс нужно загрузить из файла .ui: модуля нет,
+             он устарел или задана переменная окружения c.LOAD_UI_ENV.
+             В собранной программе всегда используется скомпилированный модуль.
+    """
+    frozen = getattr(sys, "frozen", False)
+    if not frozen and is_env_enabled(c.LOAD_UI_ENV):
+        return None
+    try:
+        module = importlib.import_module(c.UI_MODULE_NAME)
+    except ImportError:
+        if frozen:
+            raise
+        return None
+    if not frozen:
+        try:
+            if get_ui_hash(f.get_file_ui_name()) != getattr(module, UI_HASH_NAME, ""):
+                return None
+        except OSError:
+            pass  # Файла интерфейса нет: используется модуль
+    return getattr(module, UI_CLASS_NAME)
+
+
+def load_ui(window) -> None:
+    """
+    Создаёт виджеты окна из скомпилированного модуля или из файла .ui.
+    Как и при uic.loadUi, виджеты становятся атрибутами окна, а сигналы
+    соединяются со слотами окна по их именам.
+    """
+    ui_class = load_compiled_ui()
+    if ui_class is None:
+        from PyQt6 import uic
+
+        uic.loadUi(f.get_file_ui_name(), window)
+        return
+    ui = ui_class()
+    ui.setupUi(window)
+    vars(window).update(vars(ui))
+
+
+if __name__ == "__main__":
+    print(compile_ui())
@@ -0,0 +1,274 @@
+"""
+Модуль сверяет отчёт с файлами установки системы на диске.
+
+Пути к файлам записей отчёта указывают на каталог установки, с которой
+снят отчёт (например, C:\\GalaktikaCorp\\GAL91\\EXE\\G_MD5.dll). Путь файла
+относительно этого каталога переносится в заданный каталог установки на диске,
+и у файла проверяются размер и версия (у загруженных модулей — дата изменения).
+Файлов тысячи, и каталог установки обычно находится на сетевом диске, поэтому
+файлы проверяются пулом потоков: время проверки определяется ожиданием ответа
+файловой системы, а не процессором.
+Версия компонента читается из ресурса версии файла. Прочитанные версии
+запоминаются по пути, размеру и времени изменения файла (FileVersionCache),
+поэтому при повторной сверке читаются только изменившиеся файлы.
+Модуль не импортирует PyQt6.
+"""
+
+import mmap
+import ntpath
+import os
+import struct
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.compare import RecordKind, RecordStore, merge_diff, parse_file_mmap
+from src.constants import Constant as c
+from src.export import DiffRow, make_rows_from_diff
+
+# Структура VS_FIXEDFILEINFO ресурса версии: сигнатура, версия структуры,
+# старшее и младшее слова версии файла
+FIXED_FILE_INFO = struct.Struct("<4I")
+FIXED_FILE_INFO_SIGNATURE = 0xFEEF04BD
+FIXED_FILE_INFO_MARKER = FIXED_FILE_INFO_SIGNATURE.to_bytes(4, "little")
+
+# Формат даты загруженного модуля в отчёте: ДД\ММ\ГГГГ ЧЧ:ММ
+LOAD_STAMP_FORMAT = "%d\\%m\\%Y %H:%M"
+
+# Функция, получающая число проверенных и общее число файлов
+VerifyProgressCallback = Callable[[int, int], None]
+
+# Состояние файла на диске: версия/дата и размер; None — файла нет
+FileState = tuple[str, int] | None
+
+
+def read_file_version(file_path: str) -> str:
+    """
+    Читает версию файла из ресурса версии исполняемого файла (VS_FIXEDFILEINFO).
+    Ресурсы располагаются в конце файла, поэтому структура ищется с конца.
+    :return: Версия вида 9.1.49.0 или пустая строка, если её нет.
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < FIXED_FILE_INFO.size:
+            return ""  # Пустой файл нельзя отобразить в память
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if buffer[:2] != b"MZ":
+                return ""
+            position = buffer.rfind(FIXED_FILE_INFO_MARKER)
+            if position < 0 or position + FIXED_FILE_INFO.size > len(buffer):
+                return ""
+            _, _, version_ms, version_ls = FIXED_FILE_INFO.unpack_from(buffer, position)
+    parts = (
+        version_ms >> 16,
+        version_ms & 0xFFFF,
+        version_ls >> 16,
+        version_ls & 0xFFFF,
+    )
+    return ".".join(map(str, parts))
+
+
+class FileVersionCache:
+    """
+    Версии файлов по пути, размеру и времени изменения (наносекунды).
+    Изменённый файл получает новый ключ и читается заново. Кэш используется
+    потоками проверки одновременно: чтение и запись словаря атомарны.
+    """
+
+    __slots__ = ("versions",)
+
+    def __init__(self) -> None:
+        self.versions: dict[tuple[str, int, int], str] = {}
+
+    def get_version(self, file_path: str, file_stat: os.stat_result) -> str:
+        key = (file_path, file_stat.st_size, file_stat.st_mtime_ns)
+        version = self.versions.get(key)
+        if version is None:
+            if len(self.versions) >= c.VERIFY_CACHE_SIZE:
+                self.versions.clear()  # Устаревшие версии изменённых файлов
+            version = self.versions[key] = read_file_version(file_path)
+        return version
+
+
+def get_report_root(paths: Sequence[str], install_root: str = "") -> str:
+    """
+    Определяет каталог установки, с которой снят отчёт: общий каталог файлов записей.
+    Если все файлы в одном подкаталоге установки (например, EXE), общий каталог
+    поднимается до каталога с тем же именем, что у каталога установки на диске.
+    Пути в отчёте — пути Windows, поэтому разбираются ntpath на любой платформе.
+    :param install_root: Каталог установки на диске.
+    :return: Каталог или пустая строка, если общего каталога нет.
+    """
+    if not paths:
+        return ""
+    try:
+        report_root = ntpath.commonpath([ntpath.dirname(path) for path in paths])
+    except ValueError:
+        return ""  # Пути на разных дисках или относительные вместе с абсолютными
+
+    install_name = os.path.basename(os.path.normpath(install_root)).casefold()
+    root = report_root
+    while install_name:
+        parent, name = ntpath.split(root)
+        if name.casefold() == install_name:
+            return root
+        if not name or parent == root:
+            break
+        root = parent
+    return report_root
+
+
+def get_disk_path(report_path: str, report_root: str, install_root: str) -> str | None:
+    """
+    Переносит путь файла из отчёта в каталог установки на диске.
+    :return: Путь на диске или None, если файл вне каталога установки отчёта.
+    """
+    if not report_root:
+        return None
+    try:
+        relative_path = ntpath.relpath(report_path, report_root)
+    except ValueError:
+        return None  # Файл на другом диске
+    if relative_path == ".." or relative_path.startswith(".." + ntpath.sep):
+        return None
+    return os.path.join(install_root, *relative_path.split(ntpath.sep))
+
+
+def get_file_state(
+    disk_path: str, kind: RecordKind, cache: FileVersionCache
+) -> FileState:
+    """
+    Проверяет файл записи на диске.
+    :return: Версия (у загруженного модуля — дата изменения) и размер файла
+             или None, если файла нет. Версия пуста, если её не удалось прочитать.
+    """
+    try:
+        file_stat = os.stat(disk_path)
+        if kind is RecordKind.LOAD:
+            stamp = datetime.fromtimestamp(file_stat.st_mtime).strftime(
+                LOAD_STAMP_FORMAT
+            )
+        else:
+            stamp = cache.get_version(disk_path, file_stat)
+    except OSError:
+        return None
+    return stamp, file_stat.st_size
+
+
+def get_file_states(
+    disk_paths: Sequence[str],
+    kinds: Sequence[RecordKind],
+    cache: FileVersionCache,
+) -> list[FileState]:
+    """Проверяет группу файлов (задание одного потока проверки)."""
+    return [
+        get_file_state(disk_path, kind, cache)
+        for disk_path, kind in zip(disk_paths, kinds)
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class VerifyResult:
+    """Результат сверки отчёта с каталогом установки."""
+
+    records: RecordStore  # Записи отчёта, файлы которых в каталоге установки
+    files: RecordStore  # Состояние этих файлов на диске (нет записи — нет файла)
+    rows: list[DiffRow]  # Строки таблицы отличий
+    skipped: int  # Записи, файлы которых вне каталога установки отчёта
+
+
+def verify_report(
+    file_path: str,
+    install_root: str,
+    compare_comps: bool,
+    compare_loads: bool,
+    report_root: str | None = None,
+    cache: FileVersionCache | None = None,
+    progress: VerifyProgressCallback | None = None,
+) -> VerifyResult:
+    """
+    Сверяет отчёт с файлами каталога установки на диске.
+
+    Args:
+        file_path (str): Путь к файлу отчёта
+        install_root (str): Каталог установки на диске
+        compare_comps (bool): Признак того, что надо сверять компоненты
+        compare_loads (bool): Признак того, что надо сверять загрузки
+        report_root (str | None): Каталог установки в путях отчёта.
+            По умолчанию определяется по путям файлов компонентов (см. get_report_root).
+        cache (FileVersionCache | None): Прочитанные ранее версии файлов.
+        progress (VerifyProgressCallback | None): Получает число проверенных
+            и общее число файлов. Исключение, возбуждённое в функции, прерывает сверку.
+
+    Returns:
+        VerifyResult: Строки таблицы в столбцах c.LIST_VERIFY_HEADER_COLUMNS:
+            файлы, которых нет на диске, затем файлы с другими версией или размером.
+            Версия файла без ресурса версии считается совпадающей с отчётом.
+
+    Raises:
+        Exception: Если возникает ошибка при чтении файла отчёта.
+    """
+    if cache is None:
+        cache = FileVersionCache()
+
+    paths: list[str] = []
+    report = parse_file_mmap(file_path, compare_comps, compare_loads, paths=paths)
+    if report_root is None:
+        component_paths = [
+            path
+            for path, kind in zip(paths, report.kinds)
+            if kind == RecordKind.COMPONENT
+        ]
+        report_root = get_report_root(component_paths or paths, install_root)
+
+    # Записи отчёта, файлы которых в каталоге установки
+    rows: list[int] = []
+    disk_paths: list[str] = []
+    for row, path in enumerate(paths):
+        disk_path = get_disk_path(path, report_root, install_root)
+        if disk_path is not None:
+            rows.append(row)
+            disk_paths.append(disk_path)
+    kinds = [RecordKind(report.kinds[row]) for row in rows]
+
+    states: list[FileState] = []
+    chunk = c.VERIFY_CHUNK_FILES
+    executor = ThreadPoolExecutor(max_workers=c.VERIFY_THREADS)
+    try:
+        futures = [
+            executor.submit(
+                get_file_states,
+                disk_paths[start : start + chunk],
+                kinds[start : start + chunk],
+                cache,
+            )
+            for start in range(0, len(disk_paths), chunk)
+        ]
+        if progress is not None:
+            progress(0, len(disk_paths))
+        for future in futures:
+            states.extend(future.result())
+            if progress is not None:
+                progress(len(states), len(disk_paths))
+    finally:
+        # После ошибки или прерывания проверки остальных файлов не дожидаемся
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    records = RecordStore()
+    files = RecordStore()
+    for row, kind, state in zip(rows, kinds, states):
+        name = report.names[row]
+        expected = report.get_state(row)
+        records.add(kind, name, expected.stamp, expected.size)
+        if state is not None:
+            stamp, size = state
+            files.add(kind, name, stamp or expected.stamp, size)
+    records.release_index()
+    files.release_index()
+
+    return VerifyResult(
+        records,
+        files,
+        make_rows_from_diff(merge_diff(records, files)),
+        len(paths) - len(rows),
+    )
@@ -0,0 +1,270 @@
+"""
+Модуль записывает строки результата сравнения в книгу Microsoft Excel (XLSX)
+без сторонних библиотек.
+
+Книга — архив ZIP с частями XML. Строки листа пишутся в архив по мере получения
+(zipfile.ZipFile.open в режиме записи), поэтому лист не строится в памяти,
+и записываются миллион строк и больше (до c.XLSX_MAX_ROWS — предела листа Excel).
+Текст пишется в ячейки непосредственно (inlineStr), без таблицы общих строк,
+которую пришлось бы держать в памяти до конца записи. Размеры записываются
+числами с разделителями разрядов, строка шапки закреплена, на столбцы
+установлен автофильтр.
+Модуль не импортирует PyQt6.
+"""
+
+import os
+import re
+import tempfile
+import zipfile
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+import src.functions as f
+from src.constants import Constant as c
+from src.export import format_value
+
+# Стили ячеек (порядковые номера xf в cellXfs, см. STYLES_XML)
+STYLE_NUMBER = 1  # Число с разделителями разрядов (встроенный формат 3, #,##0)
+STYLE_HEADER = 2  # Шапка: полужирный текст с переносом строк
+
+# Символы, недопустимые в XML 1.0
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_RELATIONSHIPS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+CONTENT_TYPES_XML = (
+    XML_DECLARATION
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+
+ROOT_RELS_XML = (
+    XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{NS_RELATIONSHIPS}/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+WORKBOOK_RELS_XML = (
+    XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{NS_RELATIONSHIPS}/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{NS_RELATIONSHIPS}/styles" Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+STYLES_XML = (
+    XML_DECLARATION + f'<styleSheet xmlns="{NS_MAIN}">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    "</fonts>"
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    "</borders>"
+    '<cellStyleXfs count="1">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="3" fontId="0" fillId="0" borderId="0" xfId="0" '
+    'applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1" '
+    'applyAlignment="1"><alignment horizontal="center" vertical="center" '
+    'wrapText="1"/></xf>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    "</cellStyles>"
+    "</styleSheet>"
+)
+
+# Число строк, которые собираются в один блок перед записью в архив
+ROWS_PER_CHUNK = 1000
+
+
+def get_column_letter(number: int) -> str:
+    """Буквенное обозначение столбца листа по его номеру (1 — A, 27 — AA)."""
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def get_text(text: str) -> str:
+    """
+    Текст ячейки в разметке XML: без недопустимых в XML символов, с заменой
+    символов разметки; пробелы в начале и конце текста сохраняются.
+    """
+    if not text.isprintable():
+        text = INVALID_XML_CHARS.sub("", text)
+    if "&" in text or "<" in text or ">" in text:
+        text = escape(text)
+    if text != text.strip():
+        return f'<t xml:space="preserve">{text}</t>'
+    return f"<t>{text}</t>"
+
+
+def get_text_cell(text: str, style: int = 0) -> str:
+    """Ячейка с текстом."""
+    style_attribute = f' s="{style}"' if style else ""
+    return f'<c t="inlineStr"{style_attribute}><is>{get_text(text)}</is></c>'
+
+
+def get_row(row: Sequence[str | int]) -> str:
+    """
+    Ячейки строки результата: числа — числами, пустые значения — пустыми ячейками.
+    Вызывается для каждой строки результата, поэтому текст, не требующий
+    изменений (обычный случай), записывается без вызова get_text.
+    """
+    cells = []
+    for value in row:
+        if isinstance(value, int):
+            cells.append(f'<c s="{STYLE_NUMBER}"><v>{value}</v></c>')
+        elif not value:
+            cells.append("<c/>")
+        elif (
+            value.isprintable()
+            and "&" not in value
+            and "<" not in value
+            and ">" not in value
+            and value[0] != " "
+            and value[-1] != " "
+        ):
+            cells.append(f'<c t="inlineStr"><is><t>{value}</t></is></c>')
+        else:
+            cells.append(f'<c t="inlineStr"><is>{get_text(value)}</is></c>')
+    return "".join(cells)
+
+
+def get_sheet_start(header: Sequence[str]) -> str:
+    """Начало листа до первой строки результата: закрепление и ширины столбцов, шапка."""
+    columns = len(header)
+    widths = (
+        f'<col min="1" max="1" width="{c.XLSX_NAME_COLUMN_WIDTH}" customWidth="1"/>'
+    )
+    if columns > 1:
+        widths += (
+            f'<col min="2" max="{columns}" width="{c.XLSX_COLUMN_WIDTH}" '
+            'customWidth="1"/>'
+        )
+    lines = max(title.count("\n") for title in header) + 1 if header else 1
+    height = f' ht="{15 * lines}" customHeight="1"' if lines > 1 else ""
+    header_cells = "".join(get_text_cell(title, STYLE_HEADER) for title in header)
+    return (
+        XML_DECLARATION + f'<worksheet xmlns="{NS_MAIN}">'
+        '<sheetViews><sheetView workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        '<selection pane="bottomLeft"/></sheetView></sheetViews>'
+        '<sheetFormatPr defaultRowHeight="15"/>'
+        f"<cols>{widths}</cols><sheetData>"
+        f'<row r="1"{height}>{header_cells}</row>'
+    )
+
+
+def get_workbook(filter_range: str) -> str:
+    """Книга из одного листа; filter_range — диапазон автофильтра ($A$1:$E$10)."""
+    sheet_name = quoteattr(c.XLSX_SHEET_NAME)
+    return (
+        XML_DECLARATION + f'<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_RELATIONSHIPS}">'
+        f'<sheets><sheet name={sheet_name} sheetId="1" r:id="rId1"/></sheets>'
+        '<definedNames><definedName name="_xlnm._FilterDatabase" localSheetId="0" '
+        f"hidden=\"1\">'{escape(c.XLSX_SHEET_NAME)}'!{filter_range}</definedName>"
+        "</definedNames></workbook>"
+    )
+
+
+def write_sheet(
+    sheet_file, rows: Iterable[Sequence[str | int]], header: Sequence[str]
+) -> int:
+    """
+    Пишет лист по мере получения строк блоками по ROWS_PER_CHUNK строк.
+    Если отличий нет, записывается сообщение об удачном сравнении.
+    :return: Номер последней строки листа.
+    """
+    sheet_file.write(get_sheet_start(header).encode())
+    row_number = 1
+    chunk = []
+    for row in rows:
+        row_number += 1
+        if row_number > c.XLSX_MAX_ROWS:
+            raise ValueError(
+                f"{c.TEXT_ERROR_XLSX_ROWS} {format_value(c.XLSX_MAX_ROWS)}"
+            )
+        chunk.append(f'<row r="{row_number}">{get_row(row)}</row>')
+        if len(chunk) == ROWS_PER_CHUNK:
+            sheet_file.write("".join(chunk).encode())
+            chunk.clear()
+    if row_number == 1:
+        row_number = 2
+        chunk.append(f'<row r="2">{get_text_cell(c.TEXT_SUCCESSFUL_COMPARISON)}</row>')
+    sheet_file.write("".join(chunk).encode())
+    return row_number
+
+
+def write_xlsx(
+    file_path: str | Path,
+    rows: Iterable[Sequence[str | int]],
+    header: list[str] = c.LIST_HEADER_COLUMNS,
+) -> int:
+    """
+    Записывает строки результата сравнения в книгу Excel, как write_csv в CSV файл:
+    по мере получения во временный файл в том же каталоге, который затем атомарно
+    переименовывается.
+    :param file_path: Путь к файлу.
+    :param rows: Строки результата (см. make_rows_from_diff, make_matrix_rows).
+    :param header: Шапка таблицы.
+    :return: Размер записанного файла в байтах.
+    """
+    file_path = Path(file_path)
+    fd, temp_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=file_path.stem, suffix=".tmp"
+    )
+    try:
+        with open(fd, "wb") as xlsx_file:
+            with zipfile.ZipFile(
+                xlsx_file,
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+                compresslevel=c.XLSX_COMPRESS_LEVEL,
+            ) as book:
+                book.writestr("[Content_Types].xml", CONTENT_TYPES_XML)
+                book.writestr("_rels/.rels", ROOT_RELS_XML)
+                book.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS_XML)
+                book.writestr("xl/styles.xml", STYLES_XML)
+                # Размер листа заранее неизвестен: ZIP64 допускает листы больше 2 ГБ
+                with book.open(
+                    "xl/worksheets/sheet1.xml", "w", force_zip64=True
+                ) as sheet_file:
+                    last_row = write_sheet(sheet_file, rows, header)
+                    last_column = get_column_letter(max(len(header), 1))
+                    sheet_file.write(
+                        f'</sheetData><autoFilter ref="A1:{last_column}{last_row}"/>'
+                        "</worksheet>".encode()
+                    )
+                book.writestr(
+                    "xl/workbook.xml",
+                    get_workbook(f"$A$1:${last_column}${last_row}"),
+                )
+            size = xlsx_file.tell()
+        f.set_new_file_mode(temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return size
@@ -0,0 +1,20 @@
+import pytest
+from PyQt6 import QtWidgets
+
+from src.constants import Constant as c
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Кэш результатов разбора отчётов каждого теста — в его временном каталоге."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv(c.CACHE_DIR_ENV, str(path))
+    return path
+
+
+@pytest.fixture
+def qapp():
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    return app
@@ -1,13 +1,16 @@
 import csv
+import json
+import zipfile
 from unittest.mock import patch
 
 import pytest
-from PyQt6 import QtWidgets
 from PyQt6.QtCore import Qt
 
 from src.compare import PREFIX_COMPONENT, compare, parse_file
+from src.compare_worker import UpdateWorker
 from src.compare_reports import MyWindow
 from src.constants import Constant as c
+from src.metrics import get_log_path
 from src.tunes import Tunes
 
 TEST_DATA_1 = """Component, Stamp, Size
@@ -36,19 +39,12 @@ def test_tunes(tmp_path, monkeypatch):
         c.CHECK_BOX_COMPS: Qt.CheckState.Checked.value,
         c.CHECK_BOX_LOADS: Qt.CheckState.Unchecked.value,
         c.SAVER_FOLDER: str(tmp_path),
+        c.ACTION_SAVE_XLSX: Qt.CheckState.Unchecked.value,
     }
     monkeypatch.setattr(Tunes, "_read_tunes", lambda self: tunes.copy())
     monkeypatch.setattr(Tunes, "_write_tunes", lambda self: None)
 
 
-@pytest.fixture
-def qapp():
-    app = QtWidgets.QApplication.instance()
-    if app is None:
-        app = QtWidgets.QApplication([])
-    return app
-
-
 @pytest.fixture
 def window(qapp, test_tunes):
     window = MyWindow()
@@ -56,6 +52,14 @@ def window(qapp, test_tunes):
     window.close()
 
 
+def compare_and_wait(qapp, window):
+    worker = window.compare_reports()
+    if worker is not None:
+        worker.wait()
+        qapp.processEvents()  # Доставка сигналов потока сравнения
+    return worker
+
+
 class TestCompareFunctions:
     def test_parse_file(self, test_files):
         file1, _ = test_files
@@ -94,52 +98,301 @@ class TestMainWindow:
         assert window.lblFilePath1.text() == file1
         assert "test1.csv" in window.lblFilePath1.text()
 
-    def test_comparison_logic(self, window, test_files):
+    def test_comparison_logic(self, qapp, window, test_files):
         file1, file2 = test_files
         window.lblFilePath1.setText(file1)
         window.lblFilePath2.setText(file2)
 
-        window.compare_reports()
+        compare_and_wait(qapp, window)
 
         assert window.model.rowCount() == 3
         assert window.was_comparison is True
+        assert window.worker is None
+        assert window.progressBar.isHidden()
+
+    def test_comparison_metrics(self, qapp, window, test_files, tmp_path, monkeypatch):
+        monkeypatch.setenv(c.PROFILE_ENV, "1")
+        window.lblFilePath1.setText(test_files[0])
+        window.lblFilePath2.setText(test_files[1])
+        compare_and_wait(qapp, window)
+        save_path = tmp_path / "compare_test.csv"
 
-    def test_save_functionality(self, window, test_files, tmp_path):
+        with (
+            patch.object(window, "get_result_file_path", return_value=save_path),
+            patch("src.compare_reports.f.show_message"),
+        ):
+            window.save_results().wait()
+            qapp.processEvents()
+
+        names = [span.name for span in window.timer.spans]
+        assert names == ["parse", "diff", "populate_model", "header", "write_csv"]
+        assert window.timer.counters["matched"] == 4
+        assert window.statusBar().currentMessage().startswith("разбор ")
+        assert save_path.with_suffix(".prof").exists()
+        log_path = get_log_path()
+        events = [json.loads(line)["event"] for line in log_path.open(encoding="utf-8")]
+        assert events == ["compare", "save"]
+
+    def test_comparison_cancel(self, qapp, window, test_files):
         file1, file2 = test_files
         window.lblFilePath1.setText(file1)
         window.lblFilePath2.setText(file2)
-        window.compare_reports()
+        cancelled = []
+
+        worker = window.compare_reports()
+        worker.cancelled.connect(lambda: cancelled.append(True))
+        window.cancel_comparison()
+        worker.wait()
+        qapp.processEvents()
+
+        # Разбор маленьких файлов может завершиться до отмены
+        assert cancelled or window.model.rowCount() == 3
+        assert window.was_comparison is not bool(cancelled)
+        assert window.worker is None
+
+    def test_super_fast_dialogue_saves_after_comparison(
+        self, qapp, window, test_files, tmp_path
+    ):
+        window.tunes.put_tune(c.CHECK_BOX_SUPER_FAST, Qt.CheckState.Checked.value)
         save_path = tmp_path / "compare_test.csv"
 
         with (
+            patch.object(window, "open_files_dialog", return_value=list(test_files)),
             patch.object(window, "get_result_file_path", return_value=save_path),
             patch("src.compare_reports.f.show_message"),
         ):
-            window.save_results()
+            window.run_super_fast_dialogue()
+            window.worker.wait()
+            qapp.processEvents()
+            window.export_worker.wait()
+            qapp.processEvents()
 
         assert save_path.exists()
         assert window.was_comparison is False
 
+    def test_save_functionality(self, qapp, window, test_files, tmp_path):
+        file1, file2 = test_files
+        window.lblFilePath1.setText(file1)
+        window.lblFilePath2.setText(file2)
+        compare_and_wait(qapp, window)
+        save_path = tmp_path / "compare_test.csv"
+
+        with (
+            patch.object(window, "get_result_file_path", return_value=save_path),
+            patch("src.compare_reports.f.show_message") as show_message,
+        ):
+            window.save_results().wait()
+            qapp.processEvents()
+
+        assert save_path.exists()
+        assert window.was_comparison is False
+        assert window.export_worker is None
+        assert "байт" in show_message.call_args.args[1]
+        assert not list(tmp_path.glob("*.tmp"))
+
         with save_path.open(encoding="utf-8-sig") as csv_file:
             rows = list(csv.reader(csv_file, delimiter=";"))
 
         assert rows[0] == c.LIST_HEADER_COLUMNS
         assert len(rows) == 4
 
+    def test_save_to_xlsx(self, qapp, window, test_files, tmp_path):
+        window.lblFilePath1.setText(test_files[0])
+        window.lblFilePath2.setText(test_files[1])
+        compare_and_wait(qapp, window)
+        window.actionSaveXlsx.setChecked(True)
+        save_path = window.get_result_file_path()
+
+        with (
+            patch.object(window, "get_result_file_path", return_value=save_path),
+            patch("src.compare_reports.f.show_message"),
+        ):
+            window.save_results().wait()
+            qapp.processEvents()
+
+        assert window.tunes.is_checked(c.ACTION_SAVE_XLSX)
+        assert save_path.suffix == c.XLSX_SUFFIX
+        assert zipfile.is_zipfile(save_path)
+        assert window.timer.spans[-1].name == "write_xlsx"
+
+    def test_filter_limits_table_and_export(self, qapp, window, test_files, tmp_path):
+        file1, file2 = test_files
+        window.lblFilePath1.setText(file1)
+        window.lblFilePath2.setText(file2)
+        compare_and_wait(qapp, window)
+        save_path = tmp_path / "compare_filtered.csv"
+
+        window.editFilter.setText("BUTTON")
+        assert window.proxy.rowCount() == 1
+        assert window.proxy.index(0, 0).data() == f"{PREFIX_COMPONENT}Button"
+
+        window.editFilter.clear()
+        window.comboFilterDiff.setCurrentIndex(
+            window.comboFilterDiff.findText(c.LIST_FILTER_DIFF_KINDS[2])
+        )
+        assert window.proxy.rowCount() == 1
+        assert window.proxy.index(0, 0).data() == f"{PREFIX_COMPONENT}Slider"
+
+        with (
+            patch.object(window, "get_result_file_path", return_value=save_path),
+            patch("src.compare_reports.f.show_message"),
+        ):
+            window.save_results().wait()
+            qapp.processEvents()
+
+        with save_path.open(encoding="utf-8-sig") as csv_file:
+            rows = list(csv.reader(csv_file, delimiter=";"))
+
+        assert [row[0] for row in rows[1:]] == [f"{PREFIX_COMPONENT}Slider"]
+
+    def test_watch_updates_changed_report(self, qapp, window, test_files):
+        file1, file2 = test_files
+        window.lblFilePath1.setText(file1)
+        window.lblFilePath2.setText(file2)
+        compare_and_wait(qapp, window)
+        window.actionWatchReports.setChecked(True)
+        resets = []
+        window.model.modelReset.connect(lambda: resets.append(True))
+
+        assert sorted(window.watcher.files()) == sorted(test_files)
+
+        with open(file2, "w", encoding=c.ENCODING_FILE) as file:
+            file.write(TEST_DATA_1.replace("2.1.3", "2.1.4"))
+        window.on_report_file_changed(file2)
+        worker = window.update_changed_reports()
+        worker.wait()
+        qapp.processEvents()
+
+        assert isinstance(worker, UpdateWorker)
+        assert worker.file_paths == [file2]
+        assert not resets
+        assert [row[:3] for row in window.model.get_rows()] == [
+            (f"{PREFIX_COMPONENT}Label", "2.1.3", "2.1.4")
+        ]
+        assert window.was_comparison is True
+        assert sorted(window.watcher.files()) == sorted(test_files)
+
+    def test_watch_update_with_changed_options(self, qapp, window, test_files):
+        file1, file2 = test_files
+        window.lblFilePath1.setText(file1)
+        window.lblFilePath2.setText(file2)
+        compare_and_wait(qapp, window)
+        window.tunes.put_tune(c.CHECK_BOX_COMPS, Qt.CheckState.Unchecked.value)
+        window.tunes.put_tune(c.CHECK_BOX_LOADS, Qt.CheckState.Checked.value)
+
+        window.on_report_file_changed(file2)
+        worker = window.update_changed_reports()
+        worker.wait()
+        qapp.processEvents()
+
+        # Прежние записи отчёта разобраны с другими признаками: оба отчёта
+        # разбираются заново
+        assert not isinstance(worker, UpdateWorker)
+        assert worker.file_paths == [file1, file2]
+        assert window.last_result.compare_comps is False
+        assert window.last_result.compare_loads is True
+
+    def test_watch_update_after_equal_reports(self, qapp, window, test_files):
+        file1, file2 = test_files
+        with open(file2, "w", encoding=c.ENCODING_FILE) as file:
+            file.write(TEST_DATA_1)
+        window.lblFilePath1.setText(file1)
+        window.lblFilePath2.setText(file2)
+        compare_and_wait(qapp, window)
+        assert window.message_shown is True
+
+        with open(file2, "w", encoding=c.ENCODING_FILE) as file:
+            file.write(TEST_DATA_1.replace("2.1.3", "2.1.4"))
+        window.on_report_file_changed(file2)
+        window.update_changed_reports().wait()
+        qapp.processEvents()
+
+        # Таблица заполняется заново, со столбцами версий, как после сравнения
+        assert window.message_shown is False
+        assert window.model.stamp_columns == frozenset(c.STAMP_COLUMNS)
+        assert window.model.newer_columns == c.STAMP_COLUMNS
+        assert window.model.index(0, 2).data(Qt.ItemDataRole.ToolTipRole) == (
+            c.TEXT_STAMP_NEWER
+        )
+
+    def test_matrix_comparison(self, qapp, window, test_files):
+        file1, file2 = test_files
+
+        with patch("PyQt6.QtWidgets.QFileDialog.getOpenFileNames") as file_dialog:
+            file_dialog.return_value = ([file1, file2, file1], None)
+            worker = window.compare_many_reports()
+        worker.wait()
+        qapp.processEvents()
+
+        assert window.model.columnCount() == 7
+        assert window.model.rowCount() == 3
+        assert window.header_columns[1] == "test1\nверсия"
+        assert window.was_comparison is True
+
+    def test_verify_installation(self, qapp, window, test_files, tmp_path):
+        file1, _ = test_files
+        install_root = tmp_path / "App"
+        install_root.mkdir()
+        (install_root / "button.dll").write_bytes(b"\0" * 1024)
+
+        with (
+            patch("PyQt6.QtWidgets.QFileDialog.getOpenFileName") as file_dialog,
+            patch("PyQt6.QtWidgets.QFileDialog.getExistingDirectory") as dir_dialog,
+        ):
+            file_dialog.return_value = (file1, None)
+            dir_dialog.return_value = str(install_root)
+            worker = window.verify_installation()
+        worker.wait()
+        qapp.processEvents()
+
+        assert window.header_columns == c.LIST_VERIFY_HEADER_COLUMNS
+        assert list(window.model.get_rows()) == [
+            (f"{PREFIX_COMPONENT}Label", "2.1.3", "", 2048, "")
+        ]
+        assert window.was_comparison is True
+
 
 class TestErrorHandling:
-    def test_missing_files_error(self, window):
-        window.compare_reports()
+    def test_save_error_allows_retry(self, qapp, window, test_files, tmp_path):
+        file1, file2 = test_files
+        window.lblFilePath1.setText(file1)
+        window.lblFilePath2.setText(file2)
+        compare_and_wait(qapp, window)
+        save_path = tmp_path / "missing" / "compare_test.csv"
+
+        with (
+            patch.object(window, "get_result_file_path", return_value=save_path),
+            patch("src.compare_reports.QMessageBox.critical") as critical,
+        ):
+            window.save_results().wait()
+            qapp.processEvents()
+
+        critical.assert_called_once()
+        assert window.was_comparison is True
+
+    def test_missing_files_error(self, qapp, window):
+        assert compare_and_wait(qapp, window) is None
 
         assert window.model.rowCount() == 0
 
-    def test_unrecognized_file_has_no_differences(self, window, tmp_path):
+    def test_parse_error_is_reported(self, qapp, window, tmp_path):
+        window.lblFilePath1.setText(str(tmp_path / "missing1.txt"))
+        window.lblFilePath2.setText(str(tmp_path / "missing2.txt"))
+
+        with patch("src.compare_reports.QMessageBox.critical") as critical:
+            compare_and_wait(qapp, window)
+
+        critical.assert_called_once()
+        assert "missing1" in critical.call_args.args[2]
+        assert window.was_comparison is False
+
+    def test_unrecognized_file_has_no_differences(self, qapp, window, tmp_path):
         bad_file = tmp_path / "bad.csv"
         bad_file.write_text("Invalid,Data\n1,2,3", encoding=c.ENCODING_FILE)
         window.lblFilePath1.setText(str(bad_file))
         window.lblFilePath2.setText(str(bad_file))
 
-        window.compare_reports()
+        compare_and_wait(qapp, window)
 
         assert window.model.rowCount() == 1
         assert window.model.index(0, 0).data() == c.TEXT_SUCCESSFUL_COMPARISON
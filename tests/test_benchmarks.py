@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from benchmarks import run, startup
+from benchmarks.report_generator import ReportKind, ReportOptions, generate_report_pair
+from src.compare import ParseEngine, compare, parse_file
+
+
+@pytest.mark.parametrize("kind", list(ReportKind))
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_generated_reports_parse_as_expected(tmp_path, kind, engine):
+    options = ReportOptions(
+        kind, lines=3000, diff_ratio=0.1, duplicate_ratio=0.05, malformed_ratio=0.05
+    )
+    report1, report2 = tmp_path / "1.txt", tmp_path / "2.txt"
+    expected1, expected2 = generate_report_pair(report1, report2, options)
+
+    records = [
+        parse_file(str(report), True, True, engine) for report in (report1, report2)
+    ]
+
+    assert records == [expected1, expected2]
+    only_in_1, only_in_2, differences = compare(*records)
+    assert only_in_1 and only_in_2 and differences
+
+
+def test_benchmark_results_json(tmp_path):
+    output = tmp_path / "results.json"
+
+    run.main(["--sizes", "1000", "--work-dir", str(tmp_path), "-o", str(output)])
+
+    data = json.loads(output.read_text(encoding="utf-8"))
+    stages = [result["stage"] for result in data["results"]]
+    assert stages[:4] == ["parse_lines", "parse_mmap", "records_dict", "diff_rows"]
+    assert stages[-1] == "write_csv"
+    assert all(result["peak_bytes"] is not None for result in data["results"])
+    retained = {result["stage"]: result["retained_bytes"] for result in data["results"]}
+    assert retained["parse_lines"] < retained["records_dict"]
+
+
+def test_startup_benchmark_json(tmp_path):
+    output = tmp_path / "startup.json"
+
+    startup.main(["--runs", "1", "-o", str(output)])
+
+    data = json.loads(output.read_text(encoding="utf-8"))
+    assert set(data["summary"]) == set(startup.PHASES)
+    assert 0 < data["runs"][0]["imports"] < data["runs"][0]["total"]
@@ -0,0 +1,183 @@
+import csv
+import subprocess
+import sys
+
+import pytest
+
+from src.cli import EXIT_DIFFERENCES, EXIT_ERROR, EXIT_NO_DIFFERENCES, main
+from src.constants import Constant as c
+
+REPORT_1 = """DLL Button   1.0.0   1024   C:\\App\\button.dll
+EXE Label    2.1.3   2048   C:\\App\\label.exe"""
+
+REPORT_2 = """DLL Button   1.0.1   1024   C:\\App\\button.dll
+EXE Slider   3.0.0   4096   C:\\App\\slider.exe"""
+
+
+@pytest.fixture
+def reports(tmp_path):
+    paths = []
+    for name, content in (("first.txt", REPORT_1), ("second.txt", REPORT_2)):
+        path = tmp_path / name
+        path.write_text(content, encoding=c.ENCODING_FILE)
+        paths.append(str(path))
+    return paths
+
+
+def read_csv(path):
+    with path.open(encoding="utf-8-sig") as csv_file:
+        return list(csv.reader(csv_file, delimiter=";"))
+
+
+def test_cli_writes_csv_per_pair(reports, tmp_path):
+    first, second = reports
+    output_dir = tmp_path / "out"
+
+    exit_code = main([first, second, first, first, "-o", str(output_dir), "-j", "1"])
+
+    assert exit_code == EXIT_DIFFERENCES
+    differences, same = sorted(output_dir.iterdir())
+    rows = read_csv(differences)
+    assert rows[0] == c.LIST_HEADER_COLUMNS
+    assert rows[1:] == [
+        ["C: Label", "2.1.3", "", "2'048", ""],
+        ["C: Slider", "", "3.0.0", "", "4'096"],
+        ["C: Button", "1.0.0", "1.0.1", "1'024", "1'024"],
+    ]
+    assert read_csv(same)[1:] == [[c.TEXT_SUCCESSFUL_COMPARISON]]
+
+
+def test_cli_profiles_pair(reports, tmp_path, monkeypatch):
+    monkeypatch.setenv(c.PROFILE_ENV, "1")
+    first, second = reports
+    output_dir = tmp_path / "out"
+
+    main([first, second, "-o", str(output_dir), "-j", "1"])
+
+    assert len(list(output_dir.glob("*.prof"))) == 1
+
+
+def test_cli_manifest_without_differences(reports, tmp_path):
+    first, _ = reports
+    manifest = tmp_path / "pairs.txt"
+    manifest.write_text(f"# эталон\n{first} ; {first}\n\n", encoding="utf-8")
+
+    exit_code = main(["--manifest", str(manifest), "-o", str(tmp_path / "out")])
+
+    assert exit_code == EXIT_NO_DIFFERENCES
+
+
+def test_cli_reports_errors(reports, tmp_path, capsys):
+    first, second = reports
+
+    exit_code = main(
+        [first, str(tmp_path / "missing.txt"), first, second, "-o", str(tmp_path)]
+    )
+
+    assert exit_code == EXIT_ERROR
+    assert "missing.txt" in capsys.readouterr().err
+
+
+def test_cli_rejects_odd_number_of_reports(reports):
+    with pytest.raises(SystemExit) as exc_info:
+        main(reports[:1])
+
+    assert exc_info.value.code == EXIT_ERROR
+
+
+def test_cli_does_not_import_pyqt():
+    code = "import sys, src.cli; sys.exit('PyQt6' in sys.modules)"
+
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_cli_matrix(reports, tmp_path):
+    first, second = reports
+
+    exit_code = main(["--matrix", first, first, second, "-o", str(tmp_path)])
+
+    assert exit_code == EXIT_DIFFERENCES
+    rows = read_csv(tmp_path / c.CLI_MATRIX_FILE)
+    assert len(rows[0]) == 7
+    assert rows[1] == [
+        "C: Button",
+        "1.0.0",
+        "1'024",
+        "1.0.0",
+        "1'024",
+        "1.0.1",
+        "1'024",
+    ]
+
+
+def test_cli_verify(reports, tmp_path):
+    first, _ = reports
+    install_root = tmp_path / "App"
+    install_root.mkdir()
+    (install_root / "button.dll").write_bytes(b"\0" * 1000)
+
+    exit_code = main(["--verify", str(install_root), first, "-o", str(tmp_path)])
+
+    assert exit_code == EXIT_DIFFERENCES
+    rows = read_csv(tmp_path / c.CLI_VERIFY_FILE)
+    assert rows[0] == c.LIST_VERIFY_HEADER_COLUMNS
+    assert rows[1:] == [
+        ["C: Label", "2.1.3", "", "2'048", ""],
+        ["C: Button", "1.0.0", "1.0.0", "1'024", "1'000"],
+    ]
+
+
+def test_cli_fleet(reports, tmp_path, capsys):
+    first, _ = reports
+    reports_dir = tmp_path / "fleet"
+    reports_dir.mkdir()
+    content = open(first, encoding=c.ENCODING_FILE).read()
+    for host in ("ws1", "ws2"):
+        (reports_dir / f"{host}.txt").write_text(content, encoding=c.ENCODING_FILE)
+    (reports_dir / "ws3.txt").write_text(content[:-30], encoding=c.ENCODING_FILE)
+    output_dir = tmp_path / "out"
+
+    exit_code = main(["--fleet", str(reports_dir), "-o", str(output_dir), "-j", "1"])
+
+    assert exit_code == EXIT_DIFFERENCES
+    assert "Станций 3" in capsys.readouterr().out
+    summary = read_csv(output_dir / c.CLI_FLEET_SUMMARY_FILE)
+    assert summary[0] == c.LIST_FLEET_SUMMARY_COLUMNS
+    assert summary[1:] == [["C: Label", "2.1.3", "2'048", "2", "1", "2"]]
+    hosts = read_csv(output_dir / c.CLI_FLEET_HOSTS_FILE)
+    assert hosts[1:] == [["ws3", "2", "C: Label", "2.1.3", "", "2'048", ""]]
+
+
+def test_cli_digest(reports, tmp_path, capsys):
+    first, second = reports
+    output_dir = tmp_path / "out"
+
+    assert main(["--digest", first, second]) == EXIT_NO_DIFFERENCES
+    assert capsys.readouterr().out.startswith(f"{first}: ")
+    digest1, digest2 = (report + c.DIGEST_SUFFIX for report in reports)
+    exit_code = main([digest1, digest1, digest1, digest2, "-o", str(output_dir)])
+
+    # Отличия дайджестов без отчёта не найти
+    assert exit_code == EXIT_ERROR
+    (same,) = output_dir.iterdir()
+    assert read_csv(same)[1:] == [[c.TEXT_SUCCESSFUL_COMPARISON]]
+
+
+def test_cli_snapshots(reports, tmp_path, capsys):
+    first, second = reports
+    db = str(tmp_path / "snapshots.db")
+
+    assert main(["--db", db, "--host", "ws1", first, second]) == EXIT_NO_DIFFERENCES
+    exit_code = main(["--db", db, "--snapshots", "1", "2", "-o", str(tmp_path)])
+
+    assert exit_code == EXIT_DIFFERENCES
+    rows = read_csv(tmp_path / c.CLI_SNAPSHOTS_FILE.format(1, 2))
+    assert rows[1:] == [
+        ["C: Label", "2.1.3", "", "2'048", ""],
+        ["C: Slider", "", "3.0.0", "", "4'096"],
+        ["C: Button", "1.0.0", "1.0.1", "1'024", "1'024"],
+    ]
+
+    capsys.readouterr()
+    main(["--db", db, "--history", "C: Slider", "--host", "ws1"])
+    assert capsys.readouterr().out.splitlines()[-1].endswith("C: Slider 3.0.0 4'096")
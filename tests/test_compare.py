@@ -1,6 +1,23 @@
+import random
+
 import pytest
 
-from src.compare import PREFIX_COMPONENT, PREFIX_LOAD, VS, compare, parse_file
+from src.compare import (
+    PREFIX_COMPONENT,
+    PREFIX_LOAD,
+    RE_PATTERN_COMPONENTS,
+    RE_PATTERN_LOADS,
+    TOKENIZERS,
+    VS,
+    DiffKind,
+    LineClass,
+    ParseEngine,
+    ParseStats,
+    compare,
+    merge_diff,
+    parse_file,
+    parse_reports,
+)
 from src.constants import Constant as c
 
 
@@ -17,35 +34,38 @@ def test_vs_class():
     assert vs.size == 100
 
 
-def test_parse_file_components(tmp_path):
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_file_components(tmp_path, engine):
     test_data = """
     Component name1 1.0 1000 path1
     Component name2 2.0 2000 path2
     """
     report_path = write_report(tmp_path, "components.txt", test_data)
 
-    result = parse_file(str(report_path), True, False)
+    result = parse_file(str(report_path), True, False, engine)
 
     assert len(result) == 2
     assert result[f"{PREFIX_COMPONENT}name1"] == VS("1.0", 1000)
     assert result[f"{PREFIX_COMPONENT}name2"] == VS("2.0", 2000)
 
 
-def test_parse_file_allows_same_duplicate_component(tmp_path):
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_file_allows_same_duplicate_component(tmp_path, engine):
     test_data = """
     \a RES   Z_STAFFDOPREPORTS      9.1.49.0       883 209   .\\Z_STAFFDOPREPORTS.RES
     \a RES   Z_STAFFDOPREPORTS      9.1.49.0       883 209   .\\Z_STAFFDOPREPORTS.RES
     """
     report_path = write_report(tmp_path, "components.txt", test_data)
 
-    result = parse_file(str(report_path), True, False)
+    result = parse_file(str(report_path), True, False, engine)
 
     assert result[f"{PREFIX_COMPONENT}Z_STAFFDOPREPORTS"] == VS(
         "9.1.49.0", 883209
     )
 
 
-def test_parse_file_raises_on_different_duplicate_component(tmp_path):
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_file_raises_on_different_duplicate_component(tmp_path, engine):
     test_data = """
     \a RES   Z_STAFFDOPREPORTS      9.1.47.0       883 209   .\\Z_STAFFDOPREPORTS.RES
     \a RES   Z_STAFFDOPREPORTS      9.1.49.0       883 209   .\\Z_STAFFDOPREPORTS.RES
@@ -53,17 +73,18 @@ def test_parse_file_raises_on_different_duplicate_component(tmp_path):
     report_path = write_report(tmp_path, "components.txt", test_data)
 
     with pytest.raises(ValueError, match="присутствует в исходном отчете"):
-        parse_file(str(report_path), True, False)
+        parse_file(str(report_path), True, False, engine)
 
 
-def test_parse_file_loads(tmp_path):
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_file_loads(tmp_path, engine):
     test_data = """
     module1 01\\02\\2023 10:30 1000 path1
     module2 01\\02\\2023 11:30 2000 path2
     """
     report_path = write_report(tmp_path, "loads.txt", test_data)
 
-    result = parse_file(str(report_path), False, True)
+    result = parse_file(str(report_path), False, True, engine)
 
     assert len(result) == 2
     assert result[f"{PREFIX_LOAD}module1"].stamp == "01\\02\\2023 10:30"
@@ -89,6 +110,215 @@ def test_compare_function():
     assert differences == {"comp2"}
 
 
-def test_parse_file_missing(tmp_path):
+def test_merge_diff_display_order():
+    records1 = {
+        "d": VS("1.0", 100),
+        "b": VS("2.0", 200),
+        "a": VS("1.0", 100),
+        "e": VS("5.0", 500),
+    }
+    records2 = {
+        "c": VS("3.0", 300),
+        "e": VS("5.0", 501),
+        "b": VS("2.1", 200),
+        "a": VS("1.0", 100),
+        "f": VS("6.0", 600),
+    }
+
+    diff = list(merge_diff(records1, records2))
+
+    assert diff == [
+        (DiffKind.ONLY_IN_1, "d", VS("1.0", 100), None),
+        (DiffKind.ONLY_IN_2, "c", None, VS("3.0", 300)),
+        (DiffKind.ONLY_IN_2, "f", None, VS("6.0", 600)),
+        (DiffKind.DIFFERENT, "b", VS("2.0", 200), VS("2.1", 200)),
+        (DiffKind.DIFFERENT, "e", VS("5.0", 500), VS("5.0", 501)),
+    ]
+    keys1, keys2 = sorted(records1), sorted(records2)
+    assert list(merge_diff(records1, records2, keys1, keys2)) == diff
+    only_in_1, only_in_2, differences = compare(records1, records2)
+    assert [name for kind, name, _, _ in diff] == [
+        *sorted(only_in_1),
+        *sorted(only_in_2),
+        *sorted(differences),
+    ]
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_file_missing(tmp_path, engine):
     with pytest.raises(FileNotFoundError):
-        parse_file(str(tmp_path / "nonexistent.txt"), True, True)
+        parse_file(str(tmp_path / "nonexistent.txt"), True, True, engine)
+
+
+def test_parse_file_mmap_empty(tmp_path):
+    report_path = write_report(tmp_path, "empty.txt", "")
+
+    assert parse_file(str(report_path), True, True, ParseEngine.MMAP) == {}
+
+
+def test_parse_file_engines_agree(tmp_path):
+    test_data = (
+        "Список загруженных библиотек (DLL):\r\n"
+        "    G_MD5.dll        07\\04\\2022 11:59            13 344   C:\\EXE\\G_MD5.dll\r\n"
+        "                  Отчет о компонентах системы:\r\n"
+        "\a DLL   ATLAX                  5.5.35.0               126 496   .\\ATLAX.DLL\r\n"
+        "       + DLL   streams_               >= 5.5.34.0        5.5.41.0       \r\n"
+        "\a RES   Z_WT                   9.1.189.0            3 922 005   .\\Z_WT.RES"
+    )
+    report_path = tmp_path / "mixed.txt"
+    report_path.write_bytes(test_data.encode(c.ENCODING_FILE))
+
+    lines = parse_file(str(report_path), True, True, ParseEngine.LINES)
+    buffer = parse_file(str(report_path), True, True, ParseEngine.MMAP)
+
+    assert buffer == lines
+    assert len(buffer) == 3
+    assert buffer[f"{PREFIX_COMPONENT}Z_WT"] == VS("9.1.189.0", 3922005)
+
+
+def test_parse_file_engines_agree_on_pseudographics(tmp_path):
+    # Байты OEM: псевдографика (0xB0-0xDF) и неразрывный пробел (0xFF) незначащие,
+    # буквы кириллицы (0x80-0xAF, 0xE0-0xF7) значащие, как в декодированном тексте
+    noise = [bytes([code]) for code in range(0x80, 0x100)] + [b" ", b"\x1c", b"+"]
+    rng = random.Random(866)
+    title = "Отчет о компонентах системы:".encode(c.ENCODING_FILE)
+    report_path = tmp_path / "pseudographics.txt"
+
+    for _ in range(200):
+        lines = [title, b"\xb3\xba\xdb DLL  Box  1.0  1\xff024  .\\box.dll"]
+        for index in range(5):
+            prefix = b"".join(rng.choices(noise, k=rng.randint(0, 3)))
+            line = b"DLL  N%d  1.%d  %d  .\\n.dll" % (index, index, index)
+            lines.append(prefix + line)
+        report_path.write_bytes(b"\r\n".join(lines))
+
+        lines_result = parse_file(str(report_path), True, False, ParseEngine.LINES)
+        buffer_result = parse_file(str(report_path), True, False, ParseEngine.MMAP)
+
+        assert buffer_result == lines_result
+        assert lines_result[f"{PREFIX_COMPONENT}Box"] == VS("1.0", 1024)
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_file_applies_only_section_pattern(tmp_path, engine):
+    test_data = """Информация по клиентской части системы
+Система:
+   Component sys1 1.0 1000 path
+Список загруженных библиотек (DLL):
+    Component name1 1.0 1000 path1
+    module1 01\\02\\2023 10:30 1000 path1
+______________________________________
+                  Отчет о компонентах системы:
+                 ______________________________
+    module2 01\\02\\2023 11:30 2000 path2
+    Component name2 2.0 2000 path2
+______________________________________
+    Component name3 3.0 3000 path3
+    module3 01\\02\\2023 12:30 3000 path3
+"""
+    report_path = write_report(tmp_path, "sections.txt", test_data)
+
+    result = parse_file(str(report_path), True, True, engine)
+
+    assert set(result) == {
+        f"{PREFIX_LOAD}module1",
+        f"{PREFIX_COMPONENT}name2",
+        f"{PREFIX_COMPONENT}name3",
+        f"{PREFIX_LOAD}module3",
+    }
+
+
+@pytest.mark.parametrize(
+    "pattern, line",
+    [
+        (RE_PATTERN_COMPONENTS, "\a RES   Z_WT   9.1.189.0   3 922 005   .\\Z_WT.RES"),
+        (RE_PATTERN_COMPONENTS, "   Component name1 1.0 1000 path1"),
+        (RE_PATTERN_COMPONENTS, "   + DLL   streams_   >= 5.5.34.0   5.5.41.0"),
+        (RE_PATTERN_COMPONENTS, "Отчет о компонентах системы:"),
+        (RE_PATTERN_LOADS, "  G_MD5.dll 07\\04\\2022 11:59   13 344   C:\\G_MD5.dll"),
+        (RE_PATTERN_LOADS, "    module1 01\\02\\2023  10:30 1000 path1"),
+        (RE_PATTERN_LOADS, "    module1 01\\02\\2023 10:30 1000"),
+    ],
+)
+def test_tokenizer_agrees_with_pattern(pattern, line):
+    parsed = TOKENIZERS[pattern](line.split(), line)
+    if parsed is LineClass.UNCLASSIFIED:
+        return
+
+    match = pattern.match(line)
+    if parsed is LineClass.NO_MATCH:
+        assert match is None
+    else:
+        name, stamp, size = parsed
+        assert (name, stamp) == (match.group("name"), match.group("stamp"))
+        assert size == int(match.group("size").replace(" ", ""))
+
+
+def test_parse_file_stats(tmp_path):
+    test_data = """Список загруженных библиотек (DLL):
+    module1 01\\02\\2023 10:30 1000 path1
+    module2 01\\02\\2023 11:30 1 000
+______________________________________
+    Component name1 1.0 1000 path1
+"""
+    report_path = write_report(tmp_path, "stats.txt", test_data)
+    stats = ParseStats()
+
+    result = parse_file(str(report_path), True, True, ParseEngine.LINES, stats)
+
+    assert len(result) == stats.matched == 3
+    assert stats.lines == 5
+    assert stats.skipped == 2
+    assert stats.fallback == 1
+    assert stats.fast == 2
+
+
+@pytest.mark.parametrize("process_min_size", [0, c.PARSE_PROCESS_MIN_SIZE])
+def test_parse_reports(tmp_path, monkeypatch, process_min_size):
+    monkeypatch.setattr(c, "PARSE_PROCESS_MIN_SIZE", process_min_size)
+    report_path1 = write_report(tmp_path, "1.txt", "Component name1 1.0 1000 path1")
+    report_path2 = write_report(tmp_path, "2.txt", "Component name2 2.0 2000 path2")
+
+    records1, records2 = parse_reports(
+        [str(report_path1), str(report_path2)], True, False
+    )
+
+    assert records1 == {f"{PREFIX_COMPONENT}name1": VS("1.0", 1000)}
+    assert records2 == {f"{PREFIX_COMPONENT}name2": VS("2.0", 2000)}
+
+
+def test_parse_reports_raises_first_error(tmp_path):
+    report_path = write_report(tmp_path, "1.txt", "Component name1 1.0 1000 path1")
+
+    with pytest.raises(FileNotFoundError, match="missing1"):
+        parse_reports(
+            [str(tmp_path / "missing1.txt"), str(tmp_path / "missing2.txt")],
+            True,
+            False,
+        )
+    with pytest.raises(FileNotFoundError, match="missing2"):
+        parse_reports([str(report_path), str(tmp_path / "missing2.txt")], True, False)
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_file_progress(tmp_path, engine):
+    report_path = write_report(tmp_path, "1.txt", "Component name1 1.0 1000 path1\n")
+    positions = []
+
+    parse_file(str(report_path), True, False, engine, progress=positions.append)
+
+    assert positions[-1] == report_path.stat().st_size
+
+
+@pytest.mark.parametrize("process_min_size", [0, c.PARSE_PROCESS_MIN_SIZE])
+def test_parse_reports_progress_interrupts(tmp_path, monkeypatch, process_min_size):
+    monkeypatch.setattr(c, "PARSE_PROCESS_MIN_SIZE", process_min_size)
+    report_path = write_report(tmp_path, "1.txt", "Component name1 1.0 1000 path1\n")
+
+    def progress(index, position):
+        raise InterruptedError
+
+    with pytest.raises(InterruptedError):
+        parse_reports(
+            [str(report_path), str(report_path)], True, False, progress=progress
+        )
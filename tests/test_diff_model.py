@@ -0,0 +1,193 @@
+from PyQt6.QtCore import QPersistentModelIndex, QSortFilterProxyModel, Qt
+
+from src.compare import DiffKind
+from src.constants import Constant as c
+from src.diff_model import (
+    ALIGN_NUMBER,
+    ALIGN_TEXT,
+    SORT_KEY_ROLE,
+    DiffFilterProxyModel,
+    DiffTableModel,
+)
+from src.filter_index import RowFilter
+from src.record_store import RecordKind
+
+ROWS = [
+    ["C: b", "1.0", "", 1000, ""],
+    ["C: a", "", "2.0", "", 20],
+    ["C: c", "1.0", "1.1", 300, 300],
+]
+
+
+def test_diff_model_roles(qapp):
+    model = DiffTableModel()
+    model.set_rows(ROWS, c.LIST_HEADER_COLUMNS)
+
+    index = model.index(0, 3)
+    assert (model.rowCount(), model.columnCount()) == (3, 5)
+    assert index.data() == "1'000"
+    assert index.data(Qt.ItemDataRole.UserRole) == 1000
+    assert index.data(Qt.ItemDataRole.TextAlignmentRole) == ALIGN_NUMBER
+    assert model.index(0, 0).data(Qt.ItemDataRole.TextAlignmentRole) == ALIGN_TEXT
+    assert model.headerData(1, Qt.Orientation.Horizontal) == c.LIST_HEADER_COLUMNS[1]
+
+
+def test_diff_model_pads_short_rows(qapp):
+    model = DiffTableModel()
+    model.set_rows([[c.TEXT_SUCCESSFUL_COMPARISON]], c.LIST_HEADER_COLUMNS)
+
+    assert model.columnCount() == 5
+    assert model.index(0, 0).data() == c.TEXT_SUCCESSFUL_COMPARISON
+    assert model.index(0, 4).data() == ""
+
+
+def test_diff_model_sorts_by_value_in_proxy(qapp):
+    model = DiffTableModel()
+    model.set_rows(ROWS, c.LIST_HEADER_COLUMNS)
+    proxy = QSortFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.setSortRole(SORT_KEY_ROLE)
+
+    proxy.sort(0)
+    assert [proxy.index(row, 0).data() for row in range(3)] == ["C: a", "C: b", "C: c"]
+
+    proxy.sort(3, Qt.SortOrder.DescendingOrder)
+    assert proxy.index(0, 3).data() == "1'000"
+
+    model.clear()
+    assert proxy.rowCount() == 0
+
+
+def test_diff_model_update_rows_changes_only_affected_rows(qapp):
+    model = DiffTableModel()
+    model.set_rows(ROWS, c.LIST_HEADER_COLUMNS)
+    persistent = QPersistentModelIndex(model.index(2, 0))
+    signals = []
+    model.modelReset.connect(lambda: signals.append("reset"))
+    model.rowsRemoved.connect(lambda parent, first, last: signals.append("removed"))
+    model.rowsInserted.connect(lambda parent, first, last: signals.append("inserted"))
+    model.dataChanged.connect(lambda first, last: signals.append("changed"))
+    rows = [
+        ["C: a", "", "2.0", "", 20],
+        ["C: d", "", "3.0", "", 30],
+        ["C: c", "1.0", "1.2", 300, 310],
+    ]
+
+    assert model.update_rows(rows) == 3
+
+    assert signals == ["removed", "changed", "inserted"]
+    assert [list(row) for row in model.get_rows()] == rows
+    assert persistent.row() == 2
+    assert persistent.sibling(2, 4).data() == "310"
+    assert model.update_rows(rows) == 0
+
+
+def test_diff_model_update_rows_keeps_sort(qapp):
+    model = DiffTableModel()
+    model.set_rows(ROWS, c.LIST_HEADER_COLUMNS)
+    model.sort(0, Qt.SortOrder.DescendingOrder)
+
+    model.update_rows([ROWS[0], ["C: e", "", "2.0", "", 20], ROWS[2]])
+
+    assert [model.index(row, 0).data() for row in range(3)] == ["C: e", "C: c", "C: b"]
+
+
+def test_diff_model_update_rows_resets_on_many_removed_ranges(qapp, monkeypatch):
+    monkeypatch.setattr(c, "UPDATE_MAX_REMOVED_RANGES", 1)
+    model = DiffTableModel()
+    rows = [[f"C: {index}", "1.0", "1.1", 1, index] for index in range(6)]
+    model.set_rows(rows, c.LIST_HEADER_COLUMNS, c.STAMP_COLUMNS, c.STAMP_COLUMNS)
+    model.sort(4, Qt.SortOrder.DescendingOrder)
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    # Удаляются строки 0, 2 и 4 (три диапазона), строка 1 изменяется, 6 добавляется
+    new_rows = [rows[1][:4] + [10], rows[3], rows[5], ["C: 6", "", "2.0", "", 6]]
+
+    assert model.update_rows(new_rows) == 5
+
+    assert resets == [True]
+    assert [row[0] for row in model.get_rows()] == ["C: 1", "C: 6", "C: 5", "C: 3"]
+    assert model.filter_index.match(RowFilter(text="6")) == [1]
+
+
+def test_diff_model_sorts_stamps_by_value(qapp):
+    model = DiffTableModel()
+    rows = [
+        ["C: a", "9.1.49.0", "9.1.100.0", 1, 1],
+        ["C: b", "9.1.100.0", "9.1.49.0", 1, 1],
+        ["C: c", "", "9.1.9.0", "", 1],
+        ["L: d", "31\\12\\2022 23:59", "02\\01\\2023 10:30", 1, 1],
+    ]
+    model.set_rows(rows, c.LIST_HEADER_COLUMNS, c.STAMP_COLUMNS, c.STAMP_COLUMNS)
+
+    model.sort(2)
+
+    assert [model.index(row, 0).data() for row in range(4)] == [
+        "C: c",
+        "C: b",
+        "C: a",
+        "L: d",
+    ]
+    assert model.index(0, 1).data(SORT_KEY_ROLE) == -1
+    assert model.index(2, 2).data(Qt.ItemDataRole.ToolTipRole) == c.TEXT_STAMP_NEWER
+    assert model.index(1, 2).data(Qt.ItemDataRole.ToolTipRole) == c.TEXT_STAMP_OLDER
+    assert model.index(3, 2).data(Qt.ItemDataRole.ToolTipRole) == c.TEXT_STAMP_NEWER
+    assert model.index(0, 2).data(Qt.ItemDataRole.ForegroundRole) is None
+    assert model.index(2, 1).data(Qt.ItemDataRole.ToolTipRole) is None
+
+
+def get_proxy_keys(proxy):
+    return [proxy.index(row, 0).data() for row in range(proxy.rowCount())]
+
+
+def test_filter_proxy_filters_and_sorts(qapp):
+    model = DiffTableModel()
+    model.set_rows(ROWS, c.LIST_HEADER_COLUMNS, c.STAMP_COLUMNS, c.STAMP_COLUMNS)
+    proxy = DiffFilterProxyModel()
+    proxy.setSourceModel(model)
+
+    proxy.set_filter(RowFilter("B"))
+    assert get_proxy_keys(proxy) == ["C: b"]
+    proxy.set_filter(RowFilter())
+    assert get_proxy_keys(proxy) == ["C: b", "C: a", "C: c"]
+
+    proxy.set_filter(RowFilter("c: "))
+    assert get_proxy_keys(proxy) == []
+    assert proxy.headerData(0, Qt.Orientation.Horizontal) == c.LIST_HEADER_COLUMNS[0]
+
+    proxy.set_filter(RowFilter(diff_kind=DiffKind.ONLY_IN_1))
+    assert get_proxy_keys(proxy) == ["C: b"]
+
+    proxy.set_filter(RowFilter(kind=RecordKind.COMPONENT))
+    persistent = QPersistentModelIndex(proxy.index(2, 0))
+    proxy.sort(0, Qt.SortOrder.DescendingOrder)
+
+    assert get_proxy_keys(proxy) == ["C: c", "C: b", "C: a"]
+    assert persistent.data() == "C: c"
+    assert proxy.mapToSource(proxy.index(1, 0)).row() == 1
+    assert list(model.get_rows(proxy.get_source_rows()))[0][0] == "C: c"
+
+
+def test_filter_proxy_follows_update_rows(qapp):
+    model = DiffTableModel()
+    model.set_rows(ROWS, c.LIST_HEADER_COLUMNS, c.STAMP_COLUMNS, c.STAMP_COLUMNS)
+    proxy = DiffFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.set_filter(RowFilter(diff_kind=DiffKind.ONLY_IN_2))
+    persistent = QPersistentModelIndex(proxy.index(0, 0))
+    signals = []
+    proxy.modelReset.connect(lambda: signals.append("reset"))
+    proxy.rowsRemoved.connect(lambda parent, first, last: signals.append("removed"))
+    proxy.rowsInserted.connect(lambda parent, first, last: signals.append("inserted"))
+
+    model.update_rows(
+        [
+            ["C: a", "", "2.0", "", 20],
+            ["C: d", "", "3.0", "", 30],
+            ["C: c", "1.0", "1.2", 300, 310],
+        ]
+    )
+
+    assert get_proxy_keys(proxy) == ["C: a", "C: d"]
+    assert signals == ["inserted"]
+    assert persistent.data() == "C: a"
@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from src.compare import RecordStore, merge_diff, parse_file
+from src.constants import Constant as c
+from src.digest import (
+    compare_digests,
+    diff_reports,
+    digest_report,
+    dumps_digest,
+    get_digest_path,
+    load_report_digest,
+    loads_digest,
+    make_digest,
+)
+from src.record_store import RecordKind
+
+REPORT_1 = """Отчет о компонентах системы:
+DLL Button   1.0.0   1024   C:\\App\\button.dll
+EXE Label    2.1.3   2048   C:\\App\\label.exe
+______________________________________________________________________
+Список загруженных библиотек (DLL):
+ button.dll    01\\02\\2023 10:30   1024   C:\\App\\button.dll
+"""
+
+REPORT_2 = """Отчет о компонентах системы:
+DLL Button   1.0.1   1024   C:\\App\\button.dll
+EXE Label    2.1.3   2048   C:\\App\\label.exe
+EXE Slider   3.0.0   4096   C:\\App\\slider.exe
+______________________________________________________________________
+Список загруженных библиотек (DLL):
+ button.dll    01\\02\\2023 10:30   1024   C:\\App\\button.dll
+"""
+
+
+@pytest.fixture
+def reports(tmp_path):
+    paths = []
+    for name, content in (("first.txt", REPORT_1), ("second.txt", REPORT_2)):
+        path = tmp_path / name
+        path.write_text(content, encoding=c.ENCODING_FILE)
+        paths.append(str(path))
+    return paths
+
+
+def make_store(records):
+    store = RecordStore()
+    for kind, name, stamp, size in records:
+        store.add(kind, name, stamp, size)
+    return store
+
+
+def test_digest_does_not_depend_on_record_order():
+    records = [
+        (RecordKind.COMPONENT, f"name{index}", "1.0", index) for index in range(500)
+    ]
+    digest1 = make_digest(make_store(records), True, False)
+    digest2 = make_digest(make_store(records[::-1]), True, False)
+
+    assert digest1.root == digest2.root
+    assert compare_digests(digest1, digest2) == []
+    assert loads_digest(dumps_digest(digest1)) == digest1
+
+
+def test_digest_narrows_diff_to_changed_buckets():
+    records = [
+        (RecordKind.COMPONENT, f"name{index}", "1.0", index) for index in range(500)
+    ]
+    changed = records.copy()
+    changed[7] = (RecordKind.COMPONENT, "name7", "1.1", 7)
+    digest1 = make_digest(make_store(records), True, True)
+    digest2 = make_digest(make_store(changed), True, True)
+
+    subtrees = compare_digests(digest1, digest2)
+
+    assert len(subtrees) == 1
+    assert subtrees[0][0] == RecordKind.COMPONENT
+    with pytest.raises(ValueError):
+        compare_digests(digest1, make_digest(make_store(records), True, False))
+
+
+def test_diff_reports_matches_merge_diff(reports):
+    for report in reports:
+        digest_report(report, True, True, parse_file)
+    expected = list(merge_diff(*(parse_file(path, True, True) for path in reports)))
+
+    assert diff_reports(*reports, True, True) == expected
+    assert len(expected) == 2
+    # Дайджест устаревает при изменении отчёта
+    first, second = reports
+    with open(first, "a", encoding=c.ENCODING_FILE) as file:
+        file.write(" label.exe    01\\02\\2023 10:31   2048   C:\\App\\label.exe\n")
+    assert load_report_digest(first, True, True) is None
+    assert load_report_digest(second, True, False) is None
+    assert load_report_digest(second, True, True) is not None
+
+
+def test_diff_reports_with_digest_files_only(reports, tmp_path):
+    first, second = reports
+    digest_report(first, True, True, parse_file)
+    digest_report(second, True, True, parse_file)
+    copy = tmp_path / "copy.txt"
+    copy.write_text(REPORT_1, encoding=c.ENCODING_FILE)
+    os.utime(copy, ns=(0, 0))
+    digest_report(str(copy), True, True, parse_file)
+
+    assert (
+        diff_reports(get_digest_path(first), get_digest_path(str(copy)), True, True)
+        == []
+    )
+    with pytest.raises(ValueError, match="нужен отчёт"):
+        diff_reports(first, get_digest_path(second), True, True)
@@ -0,0 +1,50 @@
+from src.compare import DiffKind
+from src.constants import Constant as c
+from src.filter_index import FilterIndex, RowFilter
+from src.record_store import RecordKind
+
+ROWS = [
+    ["C: Button", "1.0.0", "1.0.1", 1024, 1024],
+    ["C: Label", "2.1.3", "", 2048, ""],
+    ["L: button.dll", "", "01\\02\\2023 10:30", "", 100],
+    ["C: Slider", "", "3.0.0", "", 4096],
+]
+
+
+def test_filter_index_match():
+    index = FilterIndex(ROWS, c.STAMP_COLUMNS)
+
+    assert index.match(RowFilter()) == [0, 1, 2, 3]
+    assert index.match(RowFilter("BUTTON")) == [0, 2]
+    assert index.match(RowFilter("button", RecordKind.COMPONENT)) == [0]
+    assert index.match(RowFilter(kind=RecordKind.LOAD)) == [2]
+    assert index.match(RowFilter(diff_kind=DiffKind.ONLY_IN_2)) == [2, 3]
+    assert index.match(RowFilter(diff_kind=DiffKind.ONLY_IN_1)) == [1]
+    # Префикс вида записи не входит в название
+    assert index.match(RowFilter("c: ")) == []
+
+
+def test_filter_index_follows_row_changes():
+    index = FilterIndex(ROWS, c.STAMP_COLUMNS)
+
+    index.reorder([3, 2, 1, 0])
+    index.delete(1, 1)
+    index.set_row(0, ["C: Slider", "2.0.0", "3.0.0", 4000, 4096])
+    index.extend([["C: Buttons", "1.0", "", 1, ""]])
+
+    assert index.match(RowFilter("button")) == [2, 3]
+    assert index.match(RowFilter(diff_kind=DiffKind.DIFFERENT)) == [0, 2]
+
+
+def test_row_filter_narrows():
+    assert RowFilter("but").narrows(RowFilter("bu"))
+    assert RowFilter("But").narrows(RowFilter(""))
+    assert not RowFilter("bu").narrows(RowFilter("but"))
+    assert not RowFilter("but", RecordKind.LOAD).narrows(RowFilter("bu"))
+
+
+def test_filter_index_short_rows():
+    index = FilterIndex([["Отчёты совпадают"], ROWS[0]], c.STAMP_COLUMNS)
+
+    assert index.match(RowFilter("отчёты")) == [0]
+    assert index.match(RowFilter(diff_kind=DiffKind.DIFFERENT)) == [1]
@@ -0,0 +1,53 @@
+from src.compare import PREFIX_COMPONENT, VS, parse_file
+from src.constants import Constant as c
+from src.export import make_fleet_host_rows, make_fleet_summary_rows
+from src.fleet import FleetCounters, analyze_fleet, get_deviations
+
+
+def test_fleet_counters_majority_and_ties():
+    counters = FleetCounters()
+    counters.add_report({"a": VS("1.0", 10), "b": VS("1.0", 10), "d": VS("1.0", 10)})
+    counters.add_report({"a": VS("1.0", 10), "b": VS("1.0", 10), "d": VS("1.0", 10)})
+    counters.add_report({"a": VS("1.1", 11), "d": VS("1.1", 10)})
+    counters.add_report({"a": VS("1.0", 10), "c": VS("2.0", 20), "d": VS("1.1", 10)})
+
+    assert counters.get_counts("a") == {VS("1.0", 10): 3, VS("1.1", 11): 1}
+    assert counters.get_counts("c") == {VS("2.0", 20): 1, None: 3}
+    # При равенстве числа станций выбирается наличие записи и бо́льшая версия
+    assert counters.get_majority() == {
+        "a": VS("1.0", 10),
+        "b": VS("1.0", 10),
+        "c": None,
+        "d": VS("1.1", 10),
+    }
+
+
+def test_get_deviations():
+    majority = {"a": VS("1.0", 10), "b": VS("1.1", 10), "c": None}
+
+    assert get_deviations({"c": VS("2.0", 20), "a": VS("1.0", 10)}, majority) == [
+        ("b", VS("1.1", 10), None),
+        ("c", None, VS("2.0", 20)),
+    ]
+
+
+def test_analyze_fleet_groups_hosts(tmp_path):
+    file_paths = []
+    for host, version in (("ws1", "1.0"), ("ws2", "1.0"), ("ws3", "1.1")):
+        path = tmp_path / f"{host}.txt"
+        path.write_text(
+            f"Component name {version} 1000 path\nComponent same 3.0 10 path",
+            encoding=c.ENCODING_FILE,
+        )
+        file_paths.append(str(path))
+
+    result = analyze_fleet(file_paths, True, False, 1, parse_file)
+
+    assert result.counters.hosts == 3
+    assert [group.hosts for group in result.groups] == [["ws1", "ws2"], ["ws3"]]
+    assert result.groups[0].deviations == []
+    key = f"{PREFIX_COMPONENT}name"
+    assert make_fleet_summary_rows(result) == [[key, "1.0", 1000, 2, 1, 2]]
+    assert list(make_fleet_host_rows(result)) == [
+        ["ws3", 2, key, "1.0", "1.1", 1000, 1000]
+    ]
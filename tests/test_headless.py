@@ -0,0 +1,83 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from src.constants import Constant as c
+from src.functions import show_warning
+from src.tunes import DESCRIPTION_TUNES, Tunes
+
+# Модули, которые используются программами без графического интерфейса
+HEADLESS_MODULES = (
+    "src.cli",
+    "src.compare",
+    "src.digest",
+    "src.export",
+    "src.filter_index",
+    "src.fleet",
+    "src.metrics",
+    "src.functions",
+    "src.parse_cache",
+    "src.record_store",
+    "src.snapshots",
+    "src.report_matrix",
+    "src.tunes",
+    "src.ui_loader",
+    "src.verify",
+    "src.xlsx",
+)
+
+# Предельное время импорта этих модулей, мс
+IMPORT_TIME_BUDGET_MS = 250
+
+CHECK_MODULES = f"""
+import json, sys
+import {", ".join(HEADLESS_MODULES)}
+print(json.dumps(sorted(name for name in sys.modules if name.startswith("PyQt6"))))
+"""
+
+
+def run_import(*options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", CHECK_MODULES],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_headless_modules_do_not_import_qt():
+    assert json.loads(run_import().stdout) == []
+
+
+def test_headless_import_time_budget():
+    # Строки -X importtime: "import time: собственное | общее | имя модуля",
+    # вложенность импорта обозначается отступом имени
+    total = 0
+    for line in run_import("-X", "importtime").stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.startswith(" src.") and not name.startswith("  "):
+            total += int(cumulative)
+    assert 0 < total / 1000 < IMPORT_TIME_BUDGET_MS
+
+
+@pytest.fixture
+def without_gui(monkeypatch):
+    """Программа без графического интерфейса: PyQt6.QtWidgets не загружен."""
+    monkeypatch.delitem(sys.modules, "PyQt6.QtWidgets", raising=False)
+
+
+def test_tunes_read_error_without_gui(tmp_path, monkeypatch, capsys, without_gui):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / c.FILE_TUNES).write_text("{", encoding="utf-8")
+
+    tunes = Tunes(DESCRIPTION_TUNES)
+
+    assert tunes.is_checked(c.CHECK_BOX_COMPS)
+    assert c.TITLE_ERROR_READ in capsys.readouterr().err
+
+
+def test_show_warning_without_gui(capsys, without_gui):
+    show_warning("Заголовок", "Текст")
+    assert capsys.readouterr().err == "Заголовок: Текст\n"
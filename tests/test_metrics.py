@@ -0,0 +1,63 @@
+import json
+import pstats
+import tracemalloc
+
+from src.compare import ParseStats
+from src.constants import Constant as c
+from src.metrics import StageTimer, append_log, get_log_path
+
+
+def test_stage_timer_spans_and_counters():
+    timer = StageTimer(trace_memory=True)
+
+    try:
+        with timer.span("parse"):
+            data = [str(number) for number in range(100_000)]
+        with timer.span("diff"):
+            del data
+    finally:
+        tracemalloc.stop()
+    timer.add_parse_stats(
+        [ParseStats(lines=10, matched=8), ParseStats(lines=1500, matched=1000)]
+    )
+
+    parse, diff = timer.spans
+    assert (parse.name, diff.name) == ("parse", "diff")
+    assert parse.peak > 1_000_000
+    assert timer.counters["lines"] == 1510
+    summary = timer.format_summary()
+    assert summary.startswith("разбор ")
+    assert "записей 1'008" in summary
+
+
+def test_append_log_writes_json_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(c, "METRICS_LOG_MAX_SIZE", 200)
+    timer = StageTimer(trace_memory=False)
+    with timer.span("write_csv"):
+        pass
+
+    for _ in range(3):
+        append_log(timer.to_record("save", rows=3))
+
+    log_path = get_log_path()
+    records = [json.loads(line) for line in log_path.read_text("utf-8").splitlines()]
+    assert records[-1]["event"] == "save"
+    assert records[-1]["spans"][0]["name"] == "write_csv"
+    assert records[-1]["spans"][0]["peak"] is None
+    # Переполненный журнал переименовывается в резервный
+    assert log_path.with_name(log_path.name + ".1").exists()
+
+
+def test_profile_is_dumped_next_to_result(tmp_path, monkeypatch):
+    timer = StageTimer()
+    timer.start_profile()
+    assert timer.dump_profile(tmp_path / "result.csv") is None
+
+    monkeypatch.setenv(c.PROFILE_ENV, "1")
+    timer.start_profile()
+    sorted(range(1000))
+    timer.stop_profile()
+
+    profile_path = timer.dump_profile(tmp_path / "result.csv")
+    assert profile_path == tmp_path / "result.prof"
+    assert pstats.Stats(str(profile_path)).total_calls > 0
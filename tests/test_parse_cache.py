@@ -0,0 +1,137 @@
+import os
+import time
+
+import pytest
+
+import src.parse_cache as parse_cache
+from src.compare import PREFIX_COMPONENT, VS, ParseEngine
+from src.constants import Constant as c
+from src.parse_cache import ENTRY_SUFFIX, TEMP_SUFFIX, parse_file_cached
+
+TEST_DATA = """Component name1 1.0 1000 path1
+Component name2 1.0 2000 path2
+Component name3 2.0 3000 path3
+"""
+
+
+@pytest.fixture
+def report_path(tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_text(TEST_DATA, encoding=c.ENCODING_FILE)
+    return path
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    parse_file = parse_cache.parse_file
+
+    def counting_parse_file(*args):
+        calls.append(args)
+        return parse_file(*args)
+
+    monkeypatch.setattr(parse_cache, "parse_file", counting_parse_file)
+    return calls
+
+
+def test_cache_hit(report_path, parse_calls):
+    first = parse_file_cached(str(report_path), True, False)
+    second = parse_file_cached(str(report_path), True, False)
+
+    assert second == first
+    assert second[f"{PREFIX_COMPONENT}name3"] == VS("2.0", 3000)
+    assert len(parse_calls) == 1
+
+
+def test_cache_key_includes_parse_flags(report_path, parse_calls):
+    parse_file_cached(str(report_path), True, False)
+
+    assert parse_file_cached(str(report_path), False, True) == {}
+    assert len(parse_calls) == 2
+
+
+def test_cache_miss_on_changed_file(report_path, parse_calls):
+    parse_file_cached(str(report_path), True, False)
+    report_path.write_text(
+        TEST_DATA.replace("name3 2.0", "name3 2.1"), encoding=c.ENCODING_FILE
+    )
+
+    result = parse_file_cached(str(report_path), True, False)
+
+    assert result[f"{PREFIX_COMPONENT}name3"] == VS("2.1", 3000)
+    assert len(parse_calls) == 2
+
+
+def test_cache_hit_on_touched_file(report_path, parse_calls):
+    parse_file_cached(str(report_path), True, False)
+    file_stat = report_path.stat()
+    os.utime(report_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+    parse_file_cached(str(report_path), True, False)
+
+    assert len(parse_calls) == 1
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_cache_digest_from_parsed_bytes(report_path, cache_dir, monkeypatch, engine):
+    file_digest = parse_cache.get_file_digest(str(report_path))
+
+    def fail_get_file_digest(file_path):
+        raise AssertionError("файл прочитан повторно")
+
+    monkeypatch.setattr(parse_cache, "get_file_digest", fail_get_file_digest)
+    parse_file_cached(str(report_path), True, False, engine)
+
+    (entry_path,) = cache_dir.glob(f"*{ENTRY_SUFFIX}")
+    _, _, digest, _ = parse_cache.unpack_records(entry_path.read_bytes())
+    assert digest == file_digest
+
+
+def test_cache_ignores_corrupted_entry(report_path, parse_calls, cache_dir):
+    first = parse_file_cached(str(report_path), True, False)
+    for entry_path in cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+        entry_path.write_bytes(b"\0")
+
+    assert parse_file_cached(str(report_path), True, False) == first
+    assert len(parse_calls) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path, cache_dir):
+    entry_paths = []
+    for index in range(3):
+        path = tmp_path / f"report{index}.txt"
+        path.write_text(TEST_DATA, encoding=c.ENCODING_FILE)
+        parse_file_cached(str(path), True, False)
+        entry_paths.append(
+            parse_cache.get_entry_path(cache_dir, str(path), True, False)
+        )
+    # Время использования записей: второго отчёта — давнее, первого — последнее
+    for entry_path, used_ns in zip(entry_paths, (3 * 10**18, 10**18, 2 * 10**18)):
+        os.utime(entry_path, ns=(used_ns, used_ns))
+    entry_size = entry_paths[0].stat().st_size
+
+    parse_cache.evict_entries(cache_dir, 2 * entry_size)
+
+    assert set(cache_dir.iterdir()) == {entry_paths[0], entry_paths[2]}
+
+
+def test_cache_evicts_abandoned_temp_files(report_path, cache_dir):
+    parse_file_cached(str(report_path), True, False)
+    (entry_path,) = cache_dir.glob(f"*{ENTRY_SUFFIX}")
+    abandoned = cache_dir / f"{entry_path.stem}old{TEMP_SUFFIX}"
+    abandoned.write_bytes(b"\0" * 100)
+    expired_ns = time.time_ns() - (c.CACHE_TEMP_MAX_AGE + 60) * 10**9
+    os.utime(abandoned, ns=(expired_ns, expired_ns))
+    # Файл, который записывает другой экземпляр программы
+    writing = cache_dir / f"{entry_path.stem}new{TEMP_SUFFIX}"
+    writing.write_bytes(b"\0" * 100)
+    entry_size = entry_path.stat().st_size
+
+    parse_cache.evict_entries(cache_dir, entry_size + 100)
+
+    assert set(cache_dir.iterdir()) == {entry_path, writing}
+
+    # Новый временный файл учитывается в размере кэша
+    parse_cache.evict_entries(cache_dir, entry_size)
+
+    assert set(cache_dir.iterdir()) == {writing}
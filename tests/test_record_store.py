@@ -0,0 +1,105 @@
+import pickle
+
+import pytest
+
+from src.compare import merge_diff
+from src.record_store import (
+    PREFIX_COMPONENT,
+    PREFIX_LOAD,
+    VS,
+    RecordKind,
+    RecordStore,
+    get_stamp_key,
+)
+
+RECORDS = [
+    (RecordKind.LOAD, "module1", "01\\02\\2023 10:30", 1000),
+    (RecordKind.COMPONENT, "name2", "9.1.49.0", 2000),
+    (RecordKind.COMPONENT, "name1", "9.1.49.0", 1000),
+    (RecordKind.COMPONENT, "module1", "5.5.41.0", 3000),
+]
+
+
+def make_store(records):
+    store = RecordStore()
+    for record in records:
+        store.add(*record)
+    return store
+
+
+def make_dict(records):
+    prefixes = {RecordKind.COMPONENT: PREFIX_COMPONENT, RecordKind.LOAD: PREFIX_LOAD}
+    return {
+        prefixes[kind] + name: VS(stamp, size) for kind, name, stamp, size in records
+    }
+
+
+def test_store_is_mapping():
+    store = make_store(RECORDS)
+    store.release_index()
+
+    assert store == make_dict(RECORDS)
+    assert list(store.items()) == list(make_dict(RECORDS).items())
+    assert store[f"{PREFIX_LOAD}module1"] == VS("01\\02\\2023 10:30", 1000)
+    assert f"{PREFIX_COMPONENT}module1" in store
+    assert f"{PREFIX_LOAD}name1" not in store
+    assert "name1" not in store
+    assert store.stamps == ["01\\02\\2023 10:30", "9.1.49.0", "5.5.41.0"]
+
+
+def test_store_pickle():
+    store = make_store(RECORDS)
+
+    restored = pickle.loads(pickle.dumps(store))
+
+    assert restored == store
+    restored.add(RecordKind.COMPONENT, "name3", "9.1.49.0", 1)
+    assert len(restored) == len(store) + 1
+    assert restored.stamps == store.stamps
+
+
+def test_store_rejects_different_duplicate():
+    store = make_store(RECORDS)
+    store.add(RecordKind.COMPONENT, "name1", "9.1.49.0", 1000)
+
+    with pytest.raises(ValueError, match=f"{PREFIX_COMPONENT}name1 присутствует"):
+        store.add(RecordKind.COMPONENT, "name1", "9.1.49.0", 1001)
+    assert len(store) == len(RECORDS)
+
+
+def test_store_rejects_inconsistent_columns():
+    store = make_store(RECORDS)
+    with pytest.raises(ValueError):
+        RecordStore.from_columns(
+            store.names, store.kinds, store.stamps[:1], store.stamp_ids, store.sizes
+        )
+
+
+def test_merge_diff_stores_agree_with_dicts():
+    records1 = RECORDS + [(RecordKind.COMPONENT, "Z_only1", "1.0", 1)]
+    records2 = [
+        (RecordKind.LOAD, "module1", "01\\02\\2023 10:30", 1001),
+        (RecordKind.COMPONENT, "name1", "9.1.50.0", 1000),
+        (RecordKind.COMPONENT, "name2", "9.1.49.0", 2000),
+        (RecordKind.LOAD, "A_only2", "01\\02\\2023 10:30", 1),
+    ]
+
+    diff = list(merge_diff(make_store(records1), make_store(records2)))
+
+    assert diff == list(merge_diff(make_dict(records1), make_dict(records2)))
+    assert len(diff) == 5
+
+
+@pytest.mark.parametrize(
+    "lower, higher",
+    [
+        ("9.1.49.0", "9.1.100.0"),
+        ("9.1", "9.1.0.1"),
+        ("", "0.0.0.0"),
+        ("31\\12\\2022 23:59", "01\\01\\2023 00:00"),
+        ("01\\02\\2023 10:30", "01\\02\\2023 11:29"),
+        ("99999.1", "01\\01\\1990 00:00"),
+    ],
+)
+def test_stamp_key_order(lower, higher):
+    assert get_stamp_key(lower) < get_stamp_key(higher)
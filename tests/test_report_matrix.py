@@ -0,0 +1,78 @@
+import os
+import threading
+
+import src.report_matrix as report_matrix
+from src.compare import PREFIX_COMPONENT, VS, parse_file
+from src.constants import Constant as c
+from src.export import make_matrix_header, make_matrix_rows
+from src.report_matrix import ReportMatrix, build_report_matrix
+
+
+def test_report_matrix_keeps_only_differing_keys():
+    matrix = ReportMatrix(["base", "ws1", "ws2"])
+    matrix.add_report({"same": VS("1.0", 10), "changed": VS("1.0", 10)})
+    matrix.add_report({"same": VS("1.0", 10), "changed": VS("1.1", 11)})
+    matrix.add_report(
+        {"same": VS("1.0", 10), "changed": VS("1.0", 10), "extra": VS("2.0", 20)}
+    )
+
+    assert matrix.get_differing_keys() == ["changed", "extra"]
+    assert matrix.get_states("changed") == [VS("1.0", 10), VS("1.1", 11), VS("1.0", 10)]
+    assert matrix.get_states("extra") == [None, None, VS("2.0", 20)]
+    # Одинаковые значения разных отчётов хранятся один раз
+    assert len(matrix.values["changed"]) == 2
+
+
+def test_build_report_matrix(tmp_path):
+    file_paths = []
+    for index, version in enumerate(("1.0", "1.0", "1.1")):
+        path = tmp_path / f"report{index}.txt"
+        path.write_text(f"Component name {version} 1000 path", encoding=c.ENCODING_FILE)
+        file_paths.append(str(path))
+    positions = {}
+
+    matrix = build_report_matrix(
+        file_paths, True, False, progress=positions.__setitem__
+    )
+
+    assert make_matrix_header(matrix.report_names)[1] == "report0\nверсия"
+    assert make_matrix_rows(matrix) == [
+        [f"{PREFIX_COMPONENT}name", "1.0", 1000, "1.0", 1000, "1.1", 1000]
+    ]
+    assert sorted(positions) == [0, 1, 2]
+
+
+def test_build_report_matrix_limits_pending_reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(c, "MATRIX_PENDING_PER_WORKER", 1)
+    file_paths = []
+    for index in range(40):
+        path = tmp_path / f"report{index}.txt"
+        path.write_text(f"Component name 1.{index} 1000 path", encoding=c.ENCODING_FILE)
+        file_paths.append(str(path))
+    lock = threading.Lock()
+    counts = {"parsed": 0, "merged": 0, "pending": 0}
+
+    def counting_parse_file(*args, **kwargs):
+        with lock:
+            counts["parsed"] += 1
+            pending = counts["parsed"] - counts["merged"]
+            counts["pending"] = max(counts["pending"], pending)
+        return parse_file(*args, **kwargs)
+
+    add_report = report_matrix.ReportMatrix.add_report
+
+    def counting_add_report(self, records):
+        with lock:
+            counts["merged"] += 1
+        add_report(self, records)
+
+    monkeypatch.setattr(report_matrix.ReportMatrix, "add_report", counting_add_report)
+
+    matrix = build_report_matrix(
+        file_paths, True, False, parse_function=counting_parse_file
+    )
+
+    assert matrix.reports_added == 40
+    assert counts["parsed"] == 40
+    # Не больше одного отчёта на поток разбора и следующего за сливаемым
+    assert counts["pending"] <= min(32, (os.cpu_count() or 1) + 4) + 1
@@ -0,0 +1,150 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from src.compare import VS, ParseEngine, merge_diff, parse_file
+from src.constants import Constant as c
+from src.snapshots import SnapshotStore
+
+REPORT_1 = """Отчет о компонентах системы:
+DLL Button   1.0.0   1024   C:\\App\\button.dll
+EXE Label    2.1.3   2048   C:\\App\\label.exe
+______________________________________________________________________
+Список загруженных библиотек (DLL):
+ button.dll    01\\02\\2023 10:30   1024   C:\\App\\button.dll
+"""
+
+REPORT_2 = """Отчет о компонентах системы:
+DLL Button   1.0.1   1024   C:\\App\\button.dll
+EXE Slider   3.0.0   4096   C:\\App\\slider.exe
+______________________________________________________________________
+Список загруженных библиотек (DLL):
+ button.dll    01\\02\\2023 11:00   1024   C:\\App\\button.dll
+"""
+
+
+@pytest.fixture
+def reports(tmp_path):
+    paths = []
+    for name, content in (("first.txt", REPORT_1), ("second.txt", REPORT_2)):
+        path = tmp_path / name
+        path.write_text(content, encoding=c.ENCODING_FILE)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def store(tmp_path, reports):
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        first, second = reports
+        store.ingest(first, "ws1", datetime(2024, 1, 10))
+        store.ingest(second, "ws1", datetime(2024, 3, 1))
+        store.ingest(first, "ws2", datetime(2024, 2, 1))  # Тот же отчёт, что у ws1
+        yield store
+
+
+def test_ingest_is_idempotent(store, reports):
+    snapshot, added = store.ingest(reports[0], "ws2", datetime(2024, 4, 1))
+
+    assert not added
+    assert (snapshot.id, snapshot.host) == (3, "ws2")
+    assert [snapshot.id for snapshot in store.get_snapshots()] == [1, 2, 3]
+
+
+def test_same_report_for_two_hosts(store, reports):
+    snapshot = store.get_snapshot(3)
+
+    assert snapshot.host == "ws2"
+    assert snapshot.source_hash == store.get_snapshot(1).source_hash
+    assert store.find_snapshot(snapshot.source_hash, "ws2") == snapshot
+    # Записи скопированы из снимка ws1
+    assert store.get_records(3) == store.get_records(1)
+    assert store.find_hosts("1.0.0") == [("ws2", "2024-02-01 00:00:00", "C: Button")]
+
+
+def test_rollback_is_recorded(store, reports):
+    snapshot, added = store.ingest(reports[0], "ws1", datetime(2024, 5, 1))
+
+    assert added
+    assert [entry.state for entry in store.get_history("C: Button", "ws1")] == [
+        VS("1.0.0", 1024),
+        VS("1.0.1", 1024),
+        VS("1.0.0", 1024),
+    ]
+    assert store.find_hosts("1.0.1") == []
+    assert [host for host, _, _ in store.find_hosts("1.0.0")] == ["ws1", "ws2"]
+
+
+@pytest.mark.parametrize("compare_comps, compare_loads", [(True, True), (True, False)])
+def test_diff_matches_merge_diff(store, reports, compare_comps, compare_loads):
+    records1, records2 = (
+        parse_file(report, compare_comps, compare_loads, ParseEngine.MMAP)
+        for report in reports
+    )
+
+    assert list(store.diff(1, 2, compare_comps, compare_loads)) == list(
+        merge_diff(records1, records2)
+    )
+    assert store.get_records(1, compare_comps, compare_loads) == records1
+
+
+def test_history_and_hosts(store):
+    history = store.get_history("C: Button", "ws1")
+    assert [(entry.snapshot.id, entry.state) for entry in history] == [
+        (1, VS("1.0.0", 1024)),
+        (2, VS("1.0.1", 1024)),
+    ]
+    assert [entry.state for entry in store.get_history("Label", "ws1")] == [
+        VS("2.1.3", 2048),
+        None,
+    ]
+
+    assert store.find_hosts("1.0.0") == [("ws2", "2024-02-01 00:00:00", "C: Button")]
+    assert store.find_hosts("1.0.1", "C: Button") == [
+        ("ws1", "2024-03-01 00:00:00", "C: Button")
+    ]
+    assert store.find_hosts("9.9.9") == []
+
+
+def test_delete_snapshot(store):
+    store.delete_snapshot(2)
+
+    assert [snapshot.id for snapshot in store.get_snapshots("ws1")] == [1]
+    with pytest.raises(ValueError):
+        list(store.diff(1, 2))
+
+
+def test_migrates_schema_1(tmp_path, reports):
+    db_path = tmp_path / "old.db"
+    with SnapshotStore(db_path) as store:
+        store.ingest(reports[0], "ws1", datetime(2024, 1, 10))
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(
+            "PRAGMA foreign_keys = OFF;"
+            "ALTER TABLE snapshots RENAME TO snapshots_v2;"
+            "CREATE TABLE snapshots (id INTEGER PRIMARY KEY, host TEXT NOT NULL, "
+            "taken_at TEXT NOT NULL, source_hash BLOB NOT NULL UNIQUE, "
+            "source_path TEXT NOT NULL, parser_version INTEGER NOT NULL);"
+            "INSERT INTO snapshots SELECT * FROM snapshots_v2;"
+            "DROP TABLE snapshots_v2;"
+            "PRAGMA user_version = 1;"
+        )
+    connection.close()
+
+    with SnapshotStore(db_path) as store:
+        snapshot, added = store.ingest(reports[0], "ws2", datetime(2024, 2, 1))
+
+        assert added
+        assert store.get_records(1) == store.get_records(snapshot.id)
+        assert len(store.get_records(1)) == 3
+
+
+def test_rejects_unknown_schema(tmp_path):
+    db_path = tmp_path / "future.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("PRAGMA user_version = 99")
+    connection.close()
+
+    with pytest.raises(ValueError, match="версия базы"):
+        SnapshotStore(db_path)
@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from src.constants import Constant as c
+from src.tunes import DESCRIPTION_TUNES, CheckStateValue, Tunes
+
+
+@pytest.fixture
+def replaces(tmp_path, monkeypatch):
+    """Файл настроек во временном каталоге; список записей файла настроек."""
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    replace = os.replace
+
+    def counting_replace(source, target):
+        calls.append(target)
+        replace(source, target)
+
+    monkeypatch.setattr("src.tunes.os.replace", counting_replace)
+    return calls
+
+
+def read_tunes_file():
+    with open(c.FILE_TUNES) as file:
+        return json.load(file)
+
+
+def test_changes_are_coalesced_until_flush(replaces, monkeypatch):
+    monkeypatch.setattr(c, "TUNES_WRITE_DELAY_MS", 60_000)
+    tunes = Tunes(DESCRIPTION_TUNES)
+
+    for value in (CheckStateValue.CHECKED, CheckStateValue.UNCHECKED) * 3:
+        tunes.put_tune(c.CHECK_BOX_FAST, value.value, write=True)
+    tunes.put_tune(c.CHECK_BOX_LOADS, CheckStateValue.CHECKED.value, write=True)
+    assert replaces == []
+
+    tunes.flush()
+
+    assert len(replaces) == 1
+    assert read_tunes_file()[c.CHECK_BOX_LOADS] == CheckStateValue.CHECKED.value
+    assert [path.name for path in os.scandir()] == [c.FILE_TUNES]
+    # Настройки, совпадающие с файлом, повторно не записываются
+    Tunes(DESCRIPTION_TUNES).put_tune(c.CHECK_BOX_FAST, 0, write=True)
+    assert len(replaces) == 1
+
+
+def test_write_runs_in_background(replaces, monkeypatch):
+    monkeypatch.setattr(c, "TUNES_WRITE_DELAY_MS", 10)
+    tunes = Tunes(DESCRIPTION_TUNES)
+
+    tunes.put_tune(c.SAVER_FOLDER, "results", write=True)
+    for _ in range(200):
+        if replaces:
+            break
+        time.sleep(0.01)
+
+    assert read_tunes_file()[c.SAVER_FOLDER] == "results"
+
+
+def test_write_error_is_shown_and_retried(replaces, monkeypatch, capsys):
+    monkeypatch.delitem(sys.modules, "PyQt6.QtWidgets", raising=False)  # Без окон
+    monkeypatch.setattr(c, "TUNES_WRITE_DELAY_MS", 60_000)
+    monkeypatch.setattr(c, "FILE_TUNES", os.path.join("missing", c.FILE_TUNES))
+    tunes = Tunes(DESCRIPTION_TUNES)
+    tunes.put_tune(c.SAVER_FOLDER, "results", write=True)
+
+    tunes.flush()
+
+    assert c.TITLE_ERROR_WRITE in capsys.readouterr().err
+    os.mkdir("missing")
+    tunes.flush()
+    assert read_tunes_file()[c.SAVER_FOLDER] == "results"
+
+
+def test_tunes_file_without_new_tune(replaces, capsys):
+    with open(c.FILE_TUNES, "w") as file:
+        json.dump({c.CHECK_BOX_FAST: CheckStateValue.CHECKED.value}, file)
+
+    tunes = Tunes(DESCRIPTION_TUNES)
+
+    assert tunes.is_checked(c.CHECK_BOX_FAST)
+    assert not tunes.is_checked(c.ACTION_SAVE_XLSX)
+    assert capsys.readouterr().err == ""
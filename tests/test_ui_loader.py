@@ -0,0 +1,45 @@
+import shutil
+
+import pytest
+from PyQt6.QtWidgets import QMainWindow
+
+import src.functions as f
+from src.constants import Constant as c
+from src.ui_loader import compile_ui, load_compiled_ui, load_ui
+
+
+@pytest.fixture
+def compiled_module(tmp_path, monkeypatch):
+    """Модуль интерфейса, скомпилированный во временный каталог."""
+    compile_ui(module_path=tmp_path / "compiled_ui.py")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(c, "UI_MODULE_NAME", "compiled_ui")
+    monkeypatch.delenv(c.LOAD_UI_ENV, raising=False)
+    return tmp_path
+
+
+def test_compiled_ui_creates_same_widgets(qapp, compiled_module, monkeypatch):
+    assert load_compiled_ui() is not None
+    compiled = QMainWindow()
+    load_ui(compiled)
+
+    monkeypatch.setenv(c.LOAD_UI_ENV, "1")
+    assert load_compiled_ui() is None
+    loaded = QMainWindow()
+    load_ui(loaded)
+
+    assert vars(compiled).keys() == vars(loaded).keys()
+    assert compiled.tblResult.objectName() == "tblResult"
+    assert compiled.windowTitle() == loaded.windowTitle()
+
+
+def test_stale_compiled_ui_is_not_used(compiled_module, monkeypatch):
+    ui_path = compiled_module / c.FILE_UI_NAME
+    shutil.copy(f.get_file_ui_name(), ui_path)
+    monkeypatch.setattr(f, "get_file_ui_name", lambda: ui_path)
+    assert load_compiled_ui() is not None
+
+    with open(ui_path, "a", encoding="utf-8") as ui_file:
+        ui_file.write("\n")
+
+    assert load_compiled_ui() is None
@@ -0,0 +1,128 @@
+import os
+import struct
+from datetime import datetime
+
+import pytest
+
+from src.constants import Constant as c
+from src.verify import (
+    FIXED_FILE_INFO_SIGNATURE,
+    FileVersionCache,
+    get_disk_path,
+    get_report_root,
+    read_file_version,
+    verify_report,
+)
+
+REPORT = """Отчет о компонентах системы:
+DLL G_MD5     9.1.49.0   1 032   C:\\GalaktikaCorp\\GAL91\\EXE\\G_MD5.dll
+DLL G_Menu    9.1.50.0   1 032   C:\\GalaktikaCorp\\GAL91\\EXE\\G_Menu.dll
+RES G_Res     9.1.49.0   1 032   C:\\GalaktikaCorp\\GAL91\\RES\\G_Res.res
+DLL G_Gone    9.1.49.0   1 032   C:\\GalaktikaCorp\\GAL91\\EXE\\G_Gone.dll
+______________________________________________________________________
+Список загруженных библиотек (DLL):
+ kernel32.dll    01\\02\\2023 10:30   100   C:\\Windows\\System32\\kernel32.dll
+"""
+
+
+def make_executable(version: tuple[int, int, int, int], size: int = 1032) -> bytes:
+    fixed_file_info = struct.pack(
+        "<4I",
+        FIXED_FILE_INFO_SIGNATURE,
+        0x00010000,
+        version[0] << 16 | version[1],
+        version[2] << 16 | version[3],
+    )
+    data = b"MZ" + b"\0" * 62 + fixed_file_info
+    return data + b"\0" * (size - len(data))
+
+
+@pytest.fixture
+def installation(tmp_path):
+    install_root = tmp_path / "GAL91"
+    (install_root / "EXE").mkdir(parents=True)
+    (install_root / "RES").mkdir()
+    (install_root / "EXE" / "G_MD5.dll").write_bytes(make_executable((9, 1, 49, 0)))
+    (install_root / "EXE" / "G_Menu.dll").write_bytes(make_executable((9, 1, 51, 0)))
+    (install_root / "RES" / "G_Res.res").write_bytes(b"\0" * 1000)
+    report = tmp_path / "report.txt"
+    report.write_text(REPORT, encoding=c.ENCODING_FILE)
+    return str(report), str(install_root)
+
+
+def test_verify_report(installation):
+    report, install_root = installation
+    progress = []
+
+    result = verify_report(
+        report, install_root, True, True, progress=lambda *args: progress.append(args)
+    )
+
+    assert result.rows == [
+        ["C: G_Gone", "9.1.49.0", "", 1032, ""],
+        ["C: G_Menu", "9.1.50.0", "9.1.51.0", 1032, 1032],
+        # Ресурс без версии: сравнивается только размер
+        ["C: G_Res", "9.1.49.0", "9.1.49.0", 1032, 1000],
+    ]
+    assert len(result.records) == 4
+    assert result.skipped == 1  # Системная библиотека вне каталога установки
+    assert progress[0] == (0, 4)
+    assert progress[-1] == (4, 4)
+
+
+def test_verify_load_dates(tmp_path):
+    module = tmp_path / "GAL91" / "EXE" / "G_Load.dll"
+    module.parent.mkdir(parents=True)
+    module.write_bytes(b"\0" * 100)
+    mtime = datetime(2023, 2, 1, 10, 30).timestamp()
+    os.utime(module, (mtime, mtime))
+    report = tmp_path / "report.txt"
+    report.write_text(
+        "Список загруженных библиотек (DLL):\n"
+        " G_Load.dll  01\\02\\2023 10:30   100   D:\\GAL91\\EXE\\G_Load.dll\n"
+        " G_Old.dll   01\\02\\2023 10:30   100   D:\\GAL91\\EXE\\G_Old.dll\n",
+        encoding=c.ENCODING_FILE,
+    )
+
+    result = verify_report(str(report), str(tmp_path / "GAL91"), False, True)
+
+    assert result.rows == [["L: G_Old.dll", "01\\02\\2023 10:30", "", 100, ""]]
+
+
+def test_file_version_cache(installation, monkeypatch):
+    _, install_root = installation
+    path = os.path.join(install_root, "EXE", "G_MD5.dll")
+    cache = FileVersionCache()
+
+    assert cache.get_version(path, os.stat(path)) == "9.1.49.0"
+    monkeypatch.setattr("src.verify.read_file_version", lambda path: "changed")
+    assert cache.get_version(path, os.stat(path)) == "9.1.49.0"
+
+    os.utime(path, ns=(0, 0))
+    assert cache.get_version(path, os.stat(path)) == "changed"
+
+
+def test_read_file_version_without_resource(tmp_path):
+    empty = tmp_path / "empty.dll"
+    empty.write_bytes(b"")
+    text = tmp_path / "text.dll"
+    text.write_bytes(b"not an executable file")
+
+    assert read_file_version(str(empty)) == ""
+    assert read_file_version(str(text)) == ""
+
+
+def test_disk_paths():
+    report_root = get_report_root(
+        ["C:\\Gal\\EXE\\a.dll", "c:\\gal\\RES\\b.res", "C:\\Gal\\EXE\\c.dll"]
+    )
+
+    assert report_root.lower() == "c:\\gal"
+    assert get_disk_path("C:\\GAL\\EXE\\a.dll", report_root, "root") == os.path.join(
+        "root", "EXE", "a.dll"
+    )
+    assert get_disk_path("C:\\Windows\\a.dll", report_root, "root") is None
+    assert get_disk_path("D:\\Gal\\a.dll", report_root, "root") is None
+    assert get_report_root(["C:\\a.dll", "D:\\b.dll"]) == ""
+    assert get_report_root(["C:\\Gal\\EXE\\a.dll"], "/mnt/gal") == "C:\\Gal"
+    assert get_report_root(["C:\\Gal\\EXE\\a.dll"], "/mnt/x") == "C:\\Gal\\EXE"
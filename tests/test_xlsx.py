@@ -0,0 +1,99 @@
+import os
+import stat
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import src.functions as f
+from src.constants import Constant as c
+from src.export import write_table
+from src.xlsx import get_column_letter, write_xlsx
+
+NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def read_part(file_path, name):
+    with zipfile.ZipFile(file_path) as book:
+        return ET.fromstring(book.read(name))
+
+
+def read_cells(file_path):
+    """Значения ячеек листа по строкам: числа — int, текст — str, пустые — None."""
+    rows = []
+    sheet = read_part(file_path, "xl/worksheets/sheet1.xml")
+    for row in sheet.iterfind("x:sheetData/x:row", NS):
+        cells = []
+        for cell in row.iterfind("x:c", NS):
+            if cell.get("t") == "inlineStr":
+                cells.append(cell.find("x:is/x:t", NS).text)
+            elif (value := cell.find("x:v", NS)) is not None:
+                cells.append(int(value.text))
+            else:
+                cells.append(None)
+        rows.append(cells)
+    return rows
+
+
+def test_write_xlsx_cells_and_sheet_settings(tmp_path):
+    file_path = tmp_path / "result.xlsx"
+    rows = [
+        ["DLL A&B <x>\x01", "1.0", "", 1024, ""],
+        ["EXE Label", "", "2.0", "", 1_234_567],
+    ]
+
+    size = write_table(file_path, iter(rows))
+
+    assert size == file_path.stat().st_size
+    assert read_cells(file_path) == [
+        c.LIST_HEADER_COLUMNS,
+        ["DLL A&B <x>", "1.0", None, 1024, None],
+        ["EXE Label", None, "2.0", None, 1_234_567],
+    ]
+    sheet = read_part(file_path, "xl/worksheets/sheet1.xml")
+    pane = sheet.find("x:sheetViews/x:sheetView/x:pane", NS)
+    assert (pane.get("state"), pane.get("topLeftCell")) == ("frozen", "A2")
+    assert sheet.find("x:autoFilter", NS).get("ref") == "A1:E3"
+    number_cell = sheet.find("x:sheetData/x:row[2]/x:c[4]", NS)
+    styles = read_part(file_path, "xl/styles.xml")
+    number_style = styles.findall("x:cellXfs/x:xf", NS)[int(number_cell.get("s"))]
+    assert number_style.get("numFmtId") == "3"  # #,##0
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_write_xlsx_without_differences(tmp_path):
+    file_path = tmp_path / "result.xlsx"
+
+    write_xlsx(file_path, [], ["Компонент"])
+
+    assert read_cells(file_path) == [["Компонент"], [c.TEXT_SUCCESSFUL_COMPARISON]]
+
+
+def test_write_xlsx_row_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(c, "XLSX_MAX_ROWS", 3)
+    file_path = tmp_path / "result.xlsx"
+
+    with pytest.raises(ValueError, match=c.TEXT_ERROR_XLSX_ROWS):
+        write_xlsx(file_path, ([f"name{index}", "", "", 1, 2] for index in range(3)))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.skipif(os.name == "nt", reason="права файлов POSIX")
+@pytest.mark.parametrize("name", ["result.csv", "result.xlsx"])
+def test_write_table_file_mode(tmp_path, name):
+    file_path = tmp_path / name
+
+    write_table(file_path, [["name", "", "", 1, 2]])
+
+    assert stat.S_IMODE(file_path.stat().st_mode) == 0o666 & ~f.UMASK
+
+
+def test_column_letters():
+    assert [get_column_letter(number) for number in (1, 26, 27, 702, 703)] == [
+        "A",
+        "Z",
+        "AA",
+        "ZZ",
+        "AAA",
+    ]